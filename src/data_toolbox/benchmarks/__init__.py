@@ -0,0 +1,15 @@
+"""Benchmarks.
+
+Repeatable timings of the toolbox's hot paths on a generated corpus:
+
+    python -m data_toolbox.benchmarks --size medium --output benchmark_results/run.json
+    python -m data_toolbox.benchmarks --only "handler/*" --compare benchmark_results/run.json
+
+corpus.py generates the corpus, multi_file_search.py defines the benchmarks and
+runner.py times them and records the timings as JSON.
+
+importtime.py reports what importing the app costs (python -X importtime);
+importtime_main.txt is its report of main.py, the home page:
+
+    python -m data_toolbox.benchmarks.importtime --output data_toolbox/benchmarks/importtime_main.txt
+"""
@@ -0,0 +1,82 @@
+"""Run the benchmarks from the command line, see __init__.py."""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from data_toolbox.benchmarks.corpus import (
+    DEFAULT_HIT_DENSITY,
+    MANIFEST_NAME,
+    SIZES,
+    generate_corpus,
+    load_corpus,
+)
+from data_toolbox.benchmarks.multi_file_search import multi_file_search_benchmarks
+from data_toolbox.benchmarks.runner import (
+    compare_runs,
+    environment,
+    format_result,
+    read_run,
+    run_benchmarks,
+    write_run,
+)
+
+
+def main(argv=None) -> int:
+    """Generate (or reuse) a corpus, run the benchmarks and record the timings."""
+    parser = argparse.ArgumentParser(
+        prog="python -m data_toolbox.benchmarks",
+        description="Time Multi-File Search on a generated corpus.")
+    parser.add_argument(
+        "--size", choices=SIZES, default="small",
+        help="lines / paragraphs / cells per file (default: small)")
+    parser.add_argument("--units", type=int, help="lines / paragraphs / cells per file, overrides --size")
+    parser.add_argument(
+        "--hit-density", type=float, default=DEFAULT_HIT_DENSITY,
+        help=f"share of lines / cells holding the search term (default: {DEFAULT_HIT_DENSITY})")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: 0)")
+    parser.add_argument(
+        "--corpus", type=Path,
+        help="corpus directory, reused if it holds a corpus (default: a temporary directory)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--only", help='glob pattern of the benchmarks to run, e.g. "handler/*"')
+    parser.add_argument("-o", "--output", type=Path, help="write the run as JSON")
+    parser.add_argument("--compare", type=Path, help="compare with an earlier run's JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_directory = args.corpus or Path(temporary_directory)
+        if (corpus_directory / MANIFEST_NAME).exists():
+            settings, corpus_files = load_corpus(corpus_directory)
+        else:
+            units = args.units or SIZES[args.size]
+            corpus_files = generate_corpus(
+                corpus_directory, units=units, hit_density=args.hit_density, seed=args.seed)
+            settings = {"units": units, "hit_density": args.hit_density, "seed": args.seed}
+
+        from data_toolbox.multi_file_search.utils import worker_pool
+
+        try:
+            results = run_benchmarks(
+                multi_file_search_benchmarks(corpus_directory, corpus_files),
+                repeat=args.repeat,
+                only=args.only,
+                on_result=lambda name, timings: print(format_result(name, timings), flush=True),
+            )
+        finally:
+            worker_pool.shutdown_worker_pool()
+
+    run = {
+        **environment(),
+        "corpus": {**settings, "files": {file.format: file.size for file in corpus_files}},
+        "benchmarks": results,
+    }
+    if args.output:
+        write_run(args.output, run)
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        print("\n".join(compare_runs(read_run(args.compare), run)))
+    return 1 if any("error" in timings for timings in results.values()) else 0
+
+
+sys.exit(main())
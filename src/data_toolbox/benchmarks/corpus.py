@@ -0,0 +1,389 @@
+"""Benchmark Corpus.
+
+Generates a synthetic corpus with one file per searchable format. The same
+seed, size and hit density always give the same text, so benchmark runs on
+different days (or machines) search the same content.
+
+Text is drawn from a fixed vocabulary; each line, paragraph or cell holds the
+search term HIT_TERM with probability ``hit_density``. The number of units
+holding it is recorded per file in the corpus manifest (manifest.json).
+
+    files = generate_corpus("/tmp/corpus", units=20_000, hit_density=0.01)
+"""
+from __future__ import annotations
+
+import bz2
+import datetime
+import gzip
+import importlib.util
+import io
+import json
+import random
+import zipfile
+from dataclasses import asdict, dataclass
+from email.message import EmailMessage
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+HIT_TERM = "waldo"
+
+# Lines / paragraphs / cells per file
+SIZES = {
+    "small": 1_000,
+    "medium": 20_000,
+    "large": 200_000,
+}
+
+DEFAULT_HIT_DENSITY = 0.01
+
+MANIFEST_NAME = "manifest.json"
+
+# Columns of the CSV / XLSX / XLS / ODS sheets
+COLUMNS = 5
+# Lines per PDF page and paragraphs per PPTX slide
+LINES_PER_PAGE = 50
+PARAGRAPHS_PER_SLIDE = 10
+# Rows an XLS sheet can hold
+MAX_XLS_ROWS = 65_536
+
+# Stamped on every file that records a date, so reruns give the same content
+FIXED_DATE = datetime.datetime(2024, 1, 1)
+
+VOCABULARY = (
+    "account", "address", "agent", "amount", "archive", "audit", "balance", "bank",
+    "batch", "border", "budget", "cargo", "client", "contract", "courier", "credit",
+    "customs", "delivery", "deposit", "driver", "export", "field", "freight", "harbour",
+    "import", "invoice", "journal", "ledger", "license", "manifest", "market", "meeting",
+    "network", "notice", "office", "order", "origin", "parcel", "payment", "permit",
+    "port", "record", "region", "report", "route", "schedule", "shipment", "signal",
+    "station", "storage", "supplier", "summary", "terminal", "transfer", "travel",
+    "vehicle", "vendor", "warehouse", "wire", "zone",
+)
+
+
+@dataclass(frozen=True)
+class CorpusFile:
+    """One generated file.
+
+    Attributes
+    ----------
+        name (str): file name, relative to the corpus directory
+        format (str): extension, which picks the router handler
+        size (int): bytes on disk
+        units (int): lines, paragraphs or cells of text written
+        hits (int): units holding HIT_TERM
+
+    """
+
+    name: str
+    format: str
+    size: int
+    units: int
+    hits: int
+
+
+class TextSource:
+    """Deterministic sentences, some of them holding HIT_TERM."""
+
+    def __init__(self, seed, hit_density):
+        """Seed the generator; each file format gets its own seed (see for_format)."""
+        self.random = random.Random(seed)
+        self.hit_density = hit_density
+        self.hits = 0
+
+    @classmethod
+    def for_format(cls, seed, hit_density, file_format):
+        """Return a source whose text does not depend on which other formats are generated."""
+        return cls(f"{seed}:{file_format}", hit_density)
+
+    def sentence(self, min_words=6, max_words=14) -> str:
+        """Return a sentence, holding HIT_TERM with probability hit_density."""
+        words = self.random.choices(VOCABULARY, k=self.random.randint(min_words, max_words))
+        if self.random.random() < self.hit_density:
+            words[self.random.randrange(len(words))] = HIT_TERM
+            self.hits += 1
+        return " ".join(words)
+
+    def sentences(self, count) -> list[str]:
+        """Return count sentences."""
+        return [self.sentence() for _ in range(count)]
+
+    def rows(self, cell_count) -> list[list[str]]:
+        """Return rows of COLUMNS short cells, cell_count cells in total."""
+        return [
+            [self.sentence(1, 4) for _ in range(COLUMNS)]
+            for _ in range(max(1, cell_count // COLUMNS))
+        ]
+
+
+def generate_corpus(directory, units=SIZES["small"], hit_density=DEFAULT_HIT_DENSITY,
+                    seed=0, formats=None) -> list[CorpusFile]:
+    """Write one file per format to directory, with its manifest.
+
+    Args:
+    ----
+        directory (str | Path): where to write the corpus (created if needed)
+        units (int): lines, paragraphs or cells per file (see SIZES)
+        hit_density (float): share of units holding HIT_TERM, 0 to 1
+        seed (int): seed of the text generator
+        formats (list): formats to generate (default: every format whose
+        writer's library is installed)
+
+    Returns:
+    -------
+        list: the CorpusFiles written
+
+    """
+    if not 0 <= hit_density <= 1:
+        error = f"hit_density must be between 0 and 1, not {hit_density}"
+        raise ValueError(error)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    formats = formats or available_formats()
+    corpus = []
+    for file_format in formats:
+        source = TextSource.for_format(seed, hit_density, file_format)
+        name = f"corpus.{file_format}"
+        content, written_units = WRITERS[file_format](source, units)
+        (directory / name).write_bytes(content)
+        corpus.append(CorpusFile(name, file_format, len(content), written_units, source.hits))
+    manifest = {
+        "units": units,
+        "hit_density": hit_density,
+        "seed": seed,
+        "hit_term": HIT_TERM,
+        "files": [asdict(corpus_file) for corpus_file in corpus],
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return corpus
+
+def load_corpus(directory) -> tuple[dict, list[CorpusFile]]:
+    """Return the manifest settings and files of a generated corpus."""
+    manifest = json.loads((Path(directory) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    files = [CorpusFile(**corpus_file) for corpus_file in manifest.pop("files")]
+    return manifest, files
+
+def available_formats() -> list[str]:
+    """Return the formats that can be generated with the installed libraries."""
+    return [
+        file_format for file_format in WRITERS
+        if file_format not in WRITER_LIBRARIES
+        or importlib.util.find_spec(WRITER_LIBRARIES[file_format]) is not None
+    ]
+
+
+def write_txt(source, units):
+    """Return plain text, one sentence per line."""
+    return "\n".join(source.sentences(units)).encode("utf-8") + b"\n", units
+
+def write_csv(source, units):
+    """Return a CSV sheet with a header row."""
+    import csv
+
+    rows = source.rows(units)
+    output = io.StringIO(newline="")
+    writer = csv.writer(output)
+    writer.writerow([f"Column {number}" for number in range(1, COLUMNS + 1)])
+    writer.writerows(rows)
+    return output.getvalue().encode("utf-8"), len(rows) * COLUMNS
+
+def write_xlsx(source, units):
+    """Return an XLSX workbook with one sheet."""
+    import openpyxl
+
+    rows = source.rows(units)
+    workbook = openpyxl.Workbook(write_only=True)
+    workbook.properties.created = workbook.properties.modified = FIXED_DATE
+    sheet = workbook.create_sheet("Sheet1")
+    for row in rows:
+        sheet.append(row)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue(), len(rows) * COLUMNS
+
+def write_xls(source, units):
+    """Return an Excel 97-2003 workbook (needs xlwt), capped at MAX_XLS_ROWS rows."""
+    import xlwt
+
+    rows = source.rows(min(units, MAX_XLS_ROWS * COLUMNS))
+    workbook = xlwt.Workbook()
+    sheet = workbook.add_sheet("Sheet1")
+    for row_number, row in enumerate(rows):
+        for column_number, value in enumerate(row):
+            sheet.write(row_number, column_number, value)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue(), len(rows) * COLUMNS
+
+def write_docx(source, units):
+    """Return a Word document, one sentence per paragraph."""
+    import docx
+
+    document = docx.Document()
+    document.core_properties.created = document.core_properties.modified = FIXED_DATE
+    for sentence in source.sentences(units):
+        document.add_paragraph(sentence)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue(), units
+
+def write_pdf(source, units):
+    """Return a PDF with LINES_PER_PAGE lines per page."""
+    import pymupdf
+
+    document = pymupdf.open()
+    lines = source.sentences(units)
+    for first_line in range(0, len(lines), LINES_PER_PAGE):
+        page = document.new_page()
+        page.insert_text((50, 50), "\n".join(lines[first_line:first_line + LINES_PER_PAGE]),
+                         fontsize=9)
+    document.set_metadata({"creationDate": "D:20240101000000", "modDate": "D:20240101000000"})
+    content = document.tobytes(garbage=1, deflate=True, no_new_id=True)
+    document.close()
+    return content, units
+
+def write_pptx(source, units):
+    """Return a PowerPoint deck with PARAGRAPHS_PER_SLIDE paragraphs per slide."""
+    import pptx
+    from pptx.util import Inches
+
+    presentation = pptx.Presentation()
+    presentation.core_properties.created = presentation.core_properties.modified = FIXED_DATE
+    layout = presentation.slide_layouts[6]
+    sentences = source.sentences(units)
+    for first in range(0, len(sentences), PARAGRAPHS_PER_SLIDE):
+        slide = presentation.slides.add_slide(layout)
+        text_frame = slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.5), Inches(9), Inches(6)).text_frame
+        text_frame.text = sentences[first]
+        for sentence in sentences[first + 1:first + PARAGRAPHS_PER_SLIDE]:
+            text_frame.add_paragraph().text = sentence
+    output = io.BytesIO()
+    presentation.save(output)
+    return output.getvalue(), units
+
+def write_odt(source, units):
+    """Return an OpenDocument text, one sentence per paragraph."""
+    body = "".join(f"<text:p>{escape(sentence)}</text:p>" for sentence in source.sentences(units))
+    return _odf_package("application/vnd.oasis.opendocument.text",
+                        f"<office:text>{body}</office:text>"), units
+
+def write_ods(source, units):
+    """Return an OpenDocument spreadsheet with one sheet."""
+    rows = source.rows(units)
+    body = "".join(
+        "<table:table-row>" + "".join(
+            f'<table:table-cell office:value-type="string"><text:p>{escape(value)}</text:p>'
+            "</table:table-cell>" for value in row) + "</table:table-row>"
+        for row in rows)
+    return _odf_package(
+        "application/vnd.oasis.opendocument.spreadsheet",
+        f'<office:spreadsheet><table:table table:name="Sheet1">{body}</table:table>'
+        "</office:spreadsheet>"), len(rows) * COLUMNS
+
+def write_html(source, units):
+    """Return an HTML page, one sentence per paragraph."""
+    body = "\n".join(f"<p>{escape(sentence)}</p>" for sentence in source.sentences(units))
+    return f"<!DOCTYPE html>\n<html><body>\n{body}\n</body></html>\n".encode(), units
+
+def write_json(source, units):
+    """Return a JSON document holding a list of records."""
+    records = [{"id": number, "text": text} for number, text in enumerate(source.sentences(units))]
+    return json.dumps({"records": records}, indent=1).encode("utf-8"), units
+
+def write_jsonl(source, units):
+    """Return JSON Lines, one record per line."""
+    lines = (
+        json.dumps({"id": number, "text": text})
+        for number, text in enumerate(source.sentences(units)))
+    return ("\n".join(lines) + "\n").encode("utf-8"), units
+
+def write_xml(source, units):
+    """Return an XML document holding a list of records."""
+    records = "\n".join(
+        f"<record id={quoteattr(str(number))}><text>{escape(text)}</text></record>"
+        for number, text in enumerate(source.sentences(units)))
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<records>\n{records}\n</records>\n' \
+        .encode("utf-8"), units
+
+def write_eml(source, units):
+    """Return an email with a plain text body, one sentence per line."""
+    message = EmailMessage()
+    message["From"] = "sender@example.com"
+    message["To"] = "recipient@example.com"
+    message["Subject"] = "Benchmark corpus"
+    message["Date"] = "Mon, 01 Jan 2024 00:00:00 +0000"
+    message.set_content("\n".join(source.sentences(units)))
+    return message.as_bytes(), units
+
+def write_gz(source, units):
+    """Return gzip compressed plain text."""
+    content, units = write_txt(source, units)
+    return gzip.compress(content, mtime=0), units
+
+def write_bz2(source, units):
+    """Return bzip2 compressed plain text."""
+    content, units = write_txt(source, units)
+    return bz2.compress(content), units
+
+def write_zip(source, units):
+    """Return a ZIP archive holding a plain text and a CSV file, half the units each."""
+    text, text_units = write_txt(source, units // 2)
+    table, table_units = write_csv(source, units - units // 2)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in (("inner/corpus.txt", text), ("inner/corpus.csv", table)):
+            archive.writestr(zipfile.ZipInfo(name, FIXED_DATE.timetuple()[:6]), content,
+                             compress_type=zipfile.ZIP_DEFLATED)
+    return output.getvalue(), text_units + table_units
+
+def _odf_package(mime_type, body):
+    """Return an OpenDocument package with a content.xml holding body."""
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content'
+        ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+        ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"'
+        ' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"'
+        ' office:version="1.2">'
+        f"<office:body>{body}</office:body></office:document-content>"
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as package:
+        date_time = FIXED_DATE.timetuple()[:6]
+        # The mimetype comes first and uncompressed, so the type can be sniffed
+        package.writestr(zipfile.ZipInfo("mimetype", date_time), mime_type)
+        package.writestr(zipfile.ZipInfo("content.xml", date_time), content,
+                         compress_type=zipfile.ZIP_DEFLATED)
+    return output.getvalue()
+
+
+# format -> function(TextSource, units) returning (file content, units written)
+WRITERS = {
+    "txt": write_txt,
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+    "xls": write_xls,
+    "docx": write_docx,
+    "pdf": write_pdf,
+    "pptx": write_pptx,
+    "odt": write_odt,
+    "ods": write_ods,
+    "html": write_html,
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "xml": write_xml,
+    "eml": write_eml,
+    "gz": write_gz,
+    "bz2": write_bz2,
+    "zip": write_zip,
+}
+
+# format -> library its writer needs
+WRITER_LIBRARIES = {
+    "xlsx": "openpyxl",
+    "xls": "xlwt",
+    "docx": "docx",
+    "pdf": "pymupdf",
+    "pptx": "pptx",
+}
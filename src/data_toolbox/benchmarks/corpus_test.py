@@ -0,0 +1,68 @@
+import pytest
+
+from data_toolbox.benchmarks.corpus import (
+    HIT_TERM,
+    available_formats,
+    generate_corpus,
+    load_corpus,
+)
+from data_toolbox.benchmarks.multi_file_search import SEARCH_OPTIONS
+from data_toolbox.multi_file_search.utils.server_files import search_server_file
+
+
+def test_generate_corpus_is_deterministic(tmp_path):
+    # Act
+    first = generate_corpus(tmp_path / "first", units=200, formats=["txt", "csv", "json"])
+    second = generate_corpus(tmp_path / "second", units=200, formats=["txt", "csv", "json"])
+    # Assert
+    assert first == second
+    for corpus_file in first:
+        assert (tmp_path / "first" / corpus_file.name).read_bytes() == \
+            (tmp_path / "second" / corpus_file.name).read_bytes()
+
+def test_generate_corpus_text_does_not_depend_on_other_formats(tmp_path):
+    # Act
+    generate_corpus(tmp_path / "alone", units=100, formats=["txt"])
+    generate_corpus(tmp_path / "together", units=100, formats=["csv", "txt"])
+    # Assert
+    assert (tmp_path / "alone" / "corpus.txt").read_bytes() == \
+        (tmp_path / "together" / "corpus.txt").read_bytes()
+
+@pytest.mark.parametrize(("hit_density", "expected_hits"), [(0, 0), (1, 300)])
+def test_generate_corpus_places_hits_by_density(tmp_path, hit_density, expected_hits):
+    # Act
+    (corpus_file,) = generate_corpus(tmp_path, units=300, hit_density=hit_density,
+                                     formats=["txt"])
+    # Assert
+    text = (tmp_path / corpus_file.name).read_text()
+    assert corpus_file.hits == expected_hits
+    assert sum(HIT_TERM in line for line in text.splitlines()) == expected_hits
+
+def test_generate_corpus_rejects_densities_outside_0_to_1(tmp_path):
+    # Act / Assert
+    with pytest.raises(ValueError, match="hit_density"):
+        generate_corpus(tmp_path, hit_density=1.5)
+
+def test_load_corpus_reads_the_manifest(tmp_path):
+    # Arrange
+    corpus = generate_corpus(tmp_path, units=50, hit_density=0.5, seed=7, formats=["txt"])
+    # Act
+    settings, corpus_files = load_corpus(tmp_path)
+    # Assert
+    assert corpus_files == corpus
+    assert (settings["units"], settings["hit_density"], settings["seed"]) == (50, 0.5, 7)
+
+def test_every_generated_format_is_searchable(tmp_path):
+    # Arrange
+    corpus = generate_corpus(tmp_path, units=100, hit_density=0.2)
+    # Act
+    results = {
+        corpus_file.format: search_server_file(
+            tmp_path / corpus_file.name, [HIT_TERM], SEARCH_OPTIONS)
+        for corpus_file in corpus
+    }
+    # Assert
+    assert set(results) == set(available_formats())
+    for file_format, file_results in results.items():
+        assert file_results, file_format
+        assert all(result.get("search_terms") == HIT_TERM for result in file_results), file_format
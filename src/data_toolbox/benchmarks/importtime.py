@@ -0,0 +1,139 @@
+"""Import Time Audit.
+
+Measures what importing a module costs, with python -X importtime, so the
+imports on the home page's path (main.py) can be kept cheap:
+
+    python -m data_toolbox.benchmarks.importtime
+    python -m data_toolbox.benchmarks.importtime --output data_toolbox/benchmarks/importtime_main.txt
+
+Run from src, like the app. The report lists the imports that took longest,
+counting what they imported (cumulative) and on their own (self). The report
+of main checked in next to this file is the reference to compare with after
+changing imports.
+"""
+from __future__ import annotations
+
+import argparse
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# src, where the app (and so this audit) runs from
+SOURCE_DIRECTORY = Path(__file__).resolve().parents[2]
+DEFAULT_MODULE = "main"
+DEFAULT_TOP = 30
+REPORT_PATH = Path(__file__).with_name("importtime_main.txt")
+
+_LINE_PREFIX = "import time:"
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """One import measured by python -X importtime.
+
+    Attributes
+    ----------
+        module (str): the imported module, e.g. "pandas.core.frame"
+        self_us (int): microseconds spent in the module itself
+        cumulative_us (int): microseconds including the modules it imported
+        depth (int): 0 for imports of the measured statement, 1 for what they
+        imported, and so on
+
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output) -> list:
+    """Return the ImportTimes of python -X importtime's stderr, in its order.
+
+    Lines that are not importtime lines (warnings, log messages) are skipped.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith(_LINE_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(_LINE_PREFIX):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        imports.append(ImportTime(
+            module=name.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(name.lstrip()) - 1) // 2,
+        ))
+    return imports
+
+def measure_imports(module=DEFAULT_MODULE, cwd=SOURCE_DIRECTORY) -> list:
+    """Import a module in a new interpreter and return its ImportTimes.
+
+    Raises:
+    ------
+        RuntimeError: the module could not be imported
+
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],  # noqa: S603
+        cwd=cwd, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        error = f"import {module} failed:\n{completed.stderr[-2000:]}"
+        raise RuntimeError(error)
+    return parse_importtime(completed.stderr)
+
+def format_report(module, imports, top=DEFAULT_TOP) -> str:
+    """Return a text report of the slowest imports of a module."""
+    total_us = next(
+        (entry.cumulative_us for entry in reversed(imports)
+         if entry.module == module and entry.depth == 0),
+        sum(entry.cumulative_us for entry in imports if entry.depth == 0))
+    lines = [
+        f"python -X importtime -c 'import {module}'",
+        f"Python {platform.python_version()}, {len(imports)} modules imported, "
+        f"{total_us / 1e6:.3f} s in total",
+        "",
+        f"Slowest {top} imports, including what they imported:",
+        f"{'cumulative ms':>14}  {'self ms':>8}  module",
+    ]
+    lines += [
+        f"{entry.cumulative_us / 1e3:14.1f}  {entry.self_us / 1e3:8.1f}  {entry.module}"
+        for entry in sorted(imports, key=lambda entry: entry.cumulative_us, reverse=True)[:top]
+    ]
+    lines += [
+        "",
+        f"Slowest {top} imports on their own:",
+        f"{'self ms':>14}  module",
+    ]
+    lines += [
+        f"{entry.self_us / 1e3:14.1f}  {entry.module}"
+        for entry in sorted(imports, key=lambda entry: entry.self_us, reverse=True)[:top]
+    ]
+    return "\n".join(lines) + "\n"
+
+def main(argv=None) -> int:
+    """Measure the imports of a module and print (or write) the report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m data_toolbox.benchmarks.importtime",
+        description="Report the slowest imports of a module, with python -X importtime.")
+    parser.add_argument(
+        "module", nargs="?", default=DEFAULT_MODULE,
+        help=f"module to import from src (default: {DEFAULT_MODULE})")
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP,
+        help=f"imports listed per table (default: {DEFAULT_TOP})")
+    parser.add_argument("-o", "--output", type=Path, help="write the report to a file")
+    args = parser.parse_args(argv)
+
+    report = format_report(args.module, measure_imports(args.module), top=args.top)
+    if args.output:
+        args.output.write_text(report)
+    print(report, end="")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+from data_toolbox.benchmarks.importtime import (
+    ImportTime,
+    format_report,
+    measure_imports,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       300 |        420 |   json.decoder
+WARNING: not an importtime line
+import time:       200 |        620 | json
+"""
+
+
+def test_parse_importtime_reads_times_and_depths():
+    # Act
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+    # Assert
+    assert imports == [
+        ImportTime("_json", self_us=120, cumulative_us=120, depth=2),
+        ImportTime("json.decoder", self_us=300, cumulative_us=420, depth=1),
+        ImportTime("json", self_us=200, cumulative_us=620, depth=0),
+    ]
+
+def test_format_report_lists_the_slowest_imports_first():
+    # Act
+    report = format_report("json", parse_importtime(IMPORTTIME_OUTPUT), top=2)
+    # Assert
+    assert "3 modules imported, 0.001 s in total" in report
+    cumulative, own = report.split("on their own")
+    assert cumulative.index(" json\n") < cumulative.index(" json.decoder\n")
+    assert "_json" not in cumulative
+    assert own.index(" json.decoder\n") < own.index(" json\n")
+
+def test_measure_imports_runs_a_new_interpreter():
+    # Act
+    imports = measure_imports("email.message")
+    # Assert
+    assert any(entry.module == "email.message" and entry.depth == 0 for entry in imports)
+
+def test_worker_pool_is_imported_without_the_search_utilities():
+    # Act
+    imports = measure_imports("data_toolbox.multi_file_search.utils.worker_pool")
+    # Assert
+    modules = {entry.module for entry in imports}
+    assert "data_toolbox.multi_file_search.utils.worker_pool" in modules
+    assert "data_toolbox.multi_file_search.utils.utils" not in modules
+    assert "chardet" not in modules
@@ -0,0 +1,159 @@
+"""Multi-File Search Benchmarks.
+
+Covers the matching core (match_function, document_search, tabular_search),
+every router handler with a generated corpus file, an end-to-end search of the
+whole corpus through the SearchEngine and the Excel export of search results.
+
+Files are read into memory before timing starts, so disk speed does not count.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from data_toolbox.benchmarks.corpus import HIT_TERM
+from data_toolbox.benchmarks.runner import Benchmark
+
+SEARCH_TERMS = [HIT_TERM]
+SEARCH_OPTIONS = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+# match_function cases: name -> (term, search options)
+MATCH_CASES = {
+    "regular": (HIT_TERM, SEARCH_OPTIONS),
+    "case_sensitive": (HIT_TERM, {**SEARCH_OPTIONS, "case-sensitive": True}),
+    "whole_word": (HIT_TERM, {**SEARCH_OPTIONS, "whole-word": True}),
+    "regex": (rf"\b{HIT_TERM}\w*", {**SEARCH_OPTIONS, "mode": "regex"}),
+}
+
+
+def multi_file_search_benchmarks(corpus_directory, corpus_files) -> list[Benchmark]:
+    """Build the benchmarks for a generated corpus.
+
+    Args:
+    ----
+        corpus_directory (str | Path): the corpus, see corpus.generate_corpus()
+        corpus_files (list): its CorpusFiles
+
+    Returns:
+    -------
+        list: Benchmarks, in the order they should run
+
+    """
+    contents = {
+        corpus_file.format: (corpus_file.name, (Path(corpus_directory) / corpus_file.name)
+                             .read_bytes())
+        for corpus_file in corpus_files
+    }
+    benchmarks = []
+    if "txt" in contents:
+        lines = contents["txt"][1].decode("utf-8").splitlines()
+        benchmarks.extend(match_function_benchmarks(lines))
+        benchmarks.append(document_search_benchmark(lines))
+    if "csv" in contents:
+        benchmarks.append(tabular_search_benchmark(contents["csv"][1]))
+    # Handlers run before the end-to-end search, so the worker pool is started
+    # from this thread rather than from one of the engine's file threads
+    benchmarks.extend(handler_benchmarks(contents))
+    if contents:
+        benchmarks.append(end_to_end_benchmark(list(contents.values())))
+    if "txt" in contents:
+        benchmarks.append(excel_export_benchmark(lines))
+    return benchmarks
+
+def match_function_benchmarks(lines):
+    """Time match_function over every line, for each kind of match."""
+    from data_toolbox.multi_file_search.utils.utils import match_function
+
+    def benchmark(term, search_options):
+        def run():
+            return sum(match_function(line, term, search_options) for line in lines)
+        return run
+
+    return [
+        Benchmark(f"match_function/{case}", benchmark(term, options), len(lines), "lines")
+        for case, (term, options) in MATCH_CASES.items()
+    ]
+
+def document_search_benchmark(lines):
+    """Time document_search over the lines of the text file."""
+    from data_toolbox.multi_file_search.utils.utils import document_search
+
+    def run():
+        return len(document_search("corpus.txt", lines, SEARCH_TERMS, SEARCH_OPTIONS, ""))
+
+    return Benchmark("document_search", run, len(lines), "lines")
+
+def tabular_search_benchmark(csv_content):
+    """Time tabular_search over the CSV sheet, read into a data frame."""
+    import io
+
+    import pandas as pd
+
+    from data_toolbox.multi_file_search.utils.utils import tabular_search
+
+    df = pd.read_csv(io.BytesIO(csv_content), header=None, dtype=str)
+
+    def run():
+        return len(tabular_search("corpus.csv", df, SEARCH_TERMS, SEARCH_OPTIONS, "Sheet1"))
+
+    return Benchmark("tabular_search", run, df.size, "cells")
+
+def handler_benchmarks(contents):
+    """Time each corpus file's router handler, called directly."""
+    from data_toolbox.multi_file_search.engine import NamedBytesIO
+    from data_toolbox.multi_file_search.file_router.registry import handler_for_extension
+
+    def benchmark(handler, name, content):
+        def run():
+            results = handler.search(NamedBytesIO(name, content), SEARCH_TERMS, SEARCH_OPTIONS)
+            return count_matches(results)
+        return run
+
+    benchmarks = []
+    for file_format, (name, content) in contents.items():
+        handler = handler_for_extension(file_format)
+        if handler is not None:
+            benchmarks.append(Benchmark(
+                f"handler/{file_format}", benchmark(handler, name, content), len(content),
+                "bytes"))
+    return benchmarks
+
+def end_to_end_benchmark(files):
+    """Time a search of every corpus file, as the app runs it."""
+    import pandas as pd
+
+    from data_toolbox.multi_file_search.engine import SearchEngine, SearchSpec
+
+    spec = SearchSpec.from_options(SEARCH_TERMS, SEARCH_OPTIONS)
+
+    def run():
+        results = [result.to_dict() for result in SearchEngine().search(files, spec)]
+        # The app shows the results as a data frame
+        pd.DataFrame(results)
+        return count_matches(results)
+
+    return Benchmark("search/end_to_end", run, sum(len(content) for _, content in files), "bytes")
+
+def excel_export_benchmark(lines):
+    """Time the Excel export of a result row per line of the text file."""
+    import pandas as pd
+
+    from data_toolbox.multi_file_search.utils.utils import data_frame_to_excel
+
+    results_df = pd.DataFrame([
+        {
+            "file": "corpus.txt",
+            "location": f" Line {line_number} of {len(lines)}",
+            "search_terms": HIT_TERM,
+            "original_content": line,
+        }
+        for line_number, line in enumerate(lines, start=1)
+    ])
+
+    def run():
+        data_frame_to_excel(results_df)
+
+    return Benchmark("excel_export", run, len(results_df), "rows")
+
+def count_matches(results):
+    """Count the result rows that are matches (not errors or notices)."""
+    return sum(1 for result in results or [] if result.get("search_terms") is not None)
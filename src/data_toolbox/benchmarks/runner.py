@@ -0,0 +1,168 @@
+"""Benchmark Runner.
+
+Times benchmarks and records the timings as JSON, with what is needed to tell
+runs apart later (commit, Python version, CPU count, corpus settings), and
+compares a run with an earlier one.
+"""
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+# Median slowdown reported as a regression by compare_runs()
+REGRESSION_THRESHOLD = 1.10
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """Something to time.
+
+    Attributes
+    ----------
+        name (str): "group/case", e.g. "handler/pdf"
+        function (callable): runs the benchmark once and returns the number of
+        matches found (or None)
+        items (int): work done per run, for the throughput
+        unit (str): what items counts ("lines", "cells", "bytes", "rows")
+
+    """
+
+    name: str
+    function: Callable
+    items: int
+    unit: str
+
+
+def measure(benchmark, repeat=3, warmup=1) -> dict:
+    """Run a benchmark warmup + repeat times and return its timings.
+
+    Warmup runs are not timed; they start the worker pool and import parsers.
+    """
+    for _ in range(warmup):
+        benchmark.function()
+    timings = []
+    matches = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        matches = benchmark.function()
+        timings.append(time.perf_counter() - start_time)
+    median = statistics.median(timings)
+    return {
+        "unit": benchmark.unit,
+        "items": benchmark.items,
+        "matches": matches,
+        "repeat": repeat,
+        "seconds": {
+            "min": round(min(timings), 6),
+            "median": round(median, 6),
+            "mean": round(statistics.mean(timings), 6),
+            "max": round(max(timings), 6),
+        },
+        "items_per_second": round(benchmark.items / median, 1) if median else None,
+    }
+
+def run_benchmarks(benchmarks, repeat=3, warmup=1, only=None, on_result=None) -> dict:
+    """Measure benchmarks, optionally only those whose name matches a glob pattern.
+
+    Args:
+    ----
+        benchmarks (list): Benchmarks to run, in order
+        repeat (int): timed runs per benchmark
+        warmup (int): untimed runs per benchmark
+        only (str): glob pattern of the benchmarks to run ("handler/*")
+        on_result (callable): called with (name, timings) after each benchmark
+
+    Returns:
+    -------
+        dict: timings per benchmark name; failed benchmarks get {"error": ...}
+
+    """
+    results = {}
+    for benchmark in benchmarks:
+        if only and not fnmatch.fnmatch(benchmark.name, only):
+            continue
+        try:
+            results[benchmark.name] = measure(benchmark, repeat=repeat, warmup=warmup)
+        except Exception as e:  # noqa: BLE001
+            results[benchmark.name] = {"error": repr(e)}
+        if on_result is not None:
+            on_result(benchmark.name, results[benchmark.name])
+    return results
+
+def environment() -> dict:
+    """Describe where the benchmarks ran."""
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def git_commit() -> str | None:
+    """Return the commit the code was checked out at, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_run(path, run) -> None:
+    """Write a run (environment, corpus and benchmark timings) as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run, indent=2) + "\n", encoding="utf-8")
+
+def read_run(path) -> dict:
+    """Read a run written by write_run()."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def compare_runs(previous, current, threshold=REGRESSION_THRESHOLD) -> list[str]:
+    """Compare the median timings of two runs.
+
+    Returns
+    -------
+        list: one line per benchmark in both runs, e.g.
+        "handler/pdf  0.412s -> 0.380s  0.92x", with "REGRESSION" appended
+        when the current run is threshold times slower or more; a note comes
+        first when the runs' corpus settings differ
+
+    """
+    lines = []
+    settings = ("units", "hit_density", "seed")
+    if [previous.get("corpus", {}).get(key) for key in settings] != \
+            [current.get("corpus", {}).get(key) for key in settings]:
+        lines.append("Note: the runs searched different corpora")
+    for name, timings in current["benchmarks"].items():
+        earlier = previous.get("benchmarks", {}).get(name)
+        if not earlier or "seconds" not in earlier or "seconds" not in timings:
+            continue
+        before, after = earlier["seconds"]["median"], timings["seconds"]["median"]
+        ratio = after / before if before else float("inf")
+        line = f"{name:<32} {before:9.4f}s -> {after:9.4f}s  {ratio:5.2f}x"
+        if ratio >= threshold:
+            line += "  REGRESSION"
+        lines.append(line)
+    return lines
+
+def format_result(name, timings) -> str:
+    """Return a one line summary of a benchmark's timings."""
+    if "error" in timings:
+        return f"{name:<32} failed: {timings['error']}"
+    return (
+        f"{name:<32} {timings['seconds']['median']:9.4f}s median  "
+        f"{timings['items_per_second'] or 0:>14,.0f} {timings['unit']}/s  "
+        f"matches: {timings['matches']}"
+    )
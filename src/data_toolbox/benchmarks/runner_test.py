@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+
+from data_toolbox.benchmarks.runner import (
+    Benchmark,
+    compare_runs,
+    measure,
+    read_run,
+    run_benchmarks,
+    write_run,
+)
+
+
+def test_measure_times_repeated_runs_after_a_warmup():
+    # Arrange
+    function = Mock(return_value=4)
+    # Act
+    timings = measure(Benchmark("case", function, items=100, unit="lines"), repeat=3)
+    # Assert
+    assert function.call_count == 4
+    assert timings["matches"] == 4
+    assert (timings["items"], timings["unit"], timings["repeat"]) == (100, "lines", 3)
+    assert timings["seconds"]["min"] <= timings["seconds"]["median"] <= timings["seconds"]["max"]
+
+def test_run_benchmarks_filters_by_name_and_records_errors():
+    # Arrange
+    benchmarks = [
+        Benchmark("handler/txt", Mock(return_value=1), 1, "bytes"),
+        Benchmark("handler/pdf", Mock(side_effect=OSError("broken")), 1, "bytes"),
+        Benchmark("excel_export", Mock(), 1, "rows"),
+    ]
+    reported = []
+    # Act
+    results = run_benchmarks(benchmarks, repeat=1, only="handler/*",
+                             on_result=lambda name, _: reported.append(name))
+    # Assert
+    assert reported == ["handler/txt", "handler/pdf"]
+    assert results["handler/txt"]["matches"] == 1
+    assert results["handler/pdf"] == {"error": "OSError('broken')"}
+
+def test_compare_runs_flags_regressions(tmp_path):
+    # Arrange
+    corpus = {"units": 1000, "hit_density": 0.01, "seed": 0}
+    write_run(tmp_path / "runs" / "before.json", {"corpus": corpus, "benchmarks": {
+        "handler/txt": {"seconds": {"median": 1.0}},
+        "handler/pdf": {"seconds": {"median": 1.0}},
+    }})
+    current = {"corpus": corpus, "benchmarks": {
+        "handler/txt": {"seconds": {"median": 0.5}},
+        "handler/pdf": {"seconds": {"median": 1.5}},
+        "handler/xml": {"seconds": {"median": 1.0}},
+    }}
+    # Act
+    lines = compare_runs(read_run(tmp_path / "runs" / "before.json"), current)
+    # Assert
+    assert len(lines) == 2
+    assert lines[0].startswith("handler/txt") and lines[0].endswith("0.50x")
+    assert lines[1].startswith("handler/pdf") and lines[1].endswith("REGRESSION")
+
+def test_compare_runs_notes_different_corpora():
+    # Act
+    lines = compare_runs(
+        {"corpus": {"units": 1000}, "benchmarks": {}},
+        {"corpus": {"units": 20000}, "benchmarks": {}},
+    )
+    # Assert
+    assert lines == ["Note: the runs searched different corpora"]
@@ -1 +1,35 @@
-from .multi_file_search import multi_file_search
+"""Multi-File Search.
+
+Names are imported on first access, so the search engine API
+(``from data_toolbox.multi_file_search import SearchEngine, SearchSpec``) and the
+command line (``python -m data_toolbox.multi_file_search``) can be used without
+importing Streamlit.
+"""
+import importlib
+
+# name -> module defining it
+_EXPORTS = {
+    "multi_file_search": "multi_file_search",
+    "SearchEngine": "engine",
+    "SearchJob": "engine",
+    "SearchResult": "engine",
+    "SearchSpec": "engine",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the Streamlit page and the engine API when they are first accessed."""
+    if name in _EXPORTS:
+        module_name = _EXPORTS[name]
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        # Importing the module multi_file_search binds it here under its name, which
+        # is also the name of the page function it defines; bind every export of
+        # the module over it, so the name is the function, not the module
+        for export, export_module in _EXPORTS.items():
+            if export_module == module_name:
+                globals()[export] = getattr(module, export)
+        return globals()[name]
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
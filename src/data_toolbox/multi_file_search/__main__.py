@@ -0,0 +1,6 @@
+"""Run Multi-File Search from the command line, see cli.py."""
+import sys
+
+from data_toolbox.multi_file_search.cli import main
+
+sys.exit(main())
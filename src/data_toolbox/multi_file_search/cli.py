@@ -0,0 +1,234 @@
+"""Multi-File Search Command Line.
+
+Search files and directories without a browser, e.g. for scheduled sweeps:
+
+    python -m data_toolbox.multi_file_search -e invoice -e "order 66" /data/reports
+    python -m data_toolbox.multi_file_search -E -f patterns.txt --format jsonl "logs/**/*.gz"
+
+Matches are written to stdout (or --output) as each file finishes; files that
+could not be read or were skipped are reported on stderr. Like grep, the exit
+status is 0 if anything matched, 1 if nothing matched and 2 if an error
+occurred.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from data_toolbox.multi_file_search.engine import SearchEngine, SearchSpec
+from data_toolbox.multi_file_search.file_router.registry import supported_extensions
+from data_toolbox.multi_file_search.utils import worker_pool
+from data_toolbox.multi_file_search.utils.utils import (
+    data_frame_to_excel,
+    search_term_file_to_list,
+    strip_list,
+)
+from data_toolbox.utils.files import determine_file_extension
+
+EXIT_MATCH = 0
+EXIT_NO_MATCH = 1
+EXIT_ERROR = 2
+
+OUTPUT_FIELDS = ("file", "location", "search_terms", "original_content")
+OUTPUT_FORMATS = ("tsv", "csv", "jsonl", "xlsx")
+
+
+def main(argv=None) -> int:
+    """Run a search from command line arguments and return the exit status."""
+    parser = build_parser()
+    args = parser.parse_intermixed_args(argv)
+    if args.format == "xlsx" and args.output is None:
+        parser.error("--format xlsx needs --output")
+
+    paths = args.paths
+    try:
+        search_terms = read_search_terms(args)
+    except OSError as e:
+        parser.error(f"could not read search terms: {e}")
+    if not args.terms and not args.terms_file:
+        if not paths:
+            parser.error("no search term given")
+        search_terms, paths = [paths[0]], paths[1:]
+    if not search_terms:
+        parser.error("no search term given")
+    if not paths:
+        parser.error("no file or directory given")
+    if args.regex:
+        for term in search_terms:
+            try:
+                re.compile(term)
+            except re.error as e:
+                parser.error(f"invalid regular expression {term!r}: {e}")
+
+    spec = SearchSpec(
+        terms=tuple(search_terms),
+        mode="regex" if args.regex else "regular",
+        case_sensitive=args.case_sensitive,
+        whole_word=args.whole_word,
+    )
+    engine = SearchEngine(workers=args.workers)
+
+    files, had_error = collect_files(paths)
+    try:
+        output = sys.stdout if args.output is None else open(  # noqa: SIM115
+            args.output, "w" if args.format != "xlsx" else "wb",
+            **({} if args.format == "xlsx" else {"newline": "", "encoding": "utf-8"}))
+    except OSError as e:
+        parser.error(f"could not open output: {e}")
+    try:
+        writer = ResultWriter(output, args.format)
+        for result in engine.search(files, spec, on_progress=lambda *_: writer.flush()):
+            if result.is_match:
+                writer.write(result)
+            else:
+                had_error |= result.is_error
+                print(f"{result.file}: {result.location}", file=sys.stderr)
+        writer.close()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        worker_pool.shutdown_worker_pool()
+
+    if had_error:
+        return EXIT_ERROR
+    return EXIT_MATCH if writer.match_count else EXIT_NO_MATCH
+
+def build_parser():
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m data_toolbox.multi_file_search",
+        description="Search files (DOCX, PDF, PPTX, XLSX, CSV, TXT, archives...) for terms.",
+    )
+    parser.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help="files, directories (searched recursively) or glob patterns; "
+             "without -e / -f the first one is the search term")
+    parser.add_argument(
+        "-e", "--term", dest="terms", action="append", default=[],
+        help="search term (or regex), may be given more than once")
+    parser.add_argument(
+        "-f", "--terms-file",
+        help="file of search terms, one per line (or the first column of an XLSX / XLS)")
+    parser.add_argument(
+        "-E", "--regex", action="store_true", help="search terms are regular expressions")
+    parser.add_argument(
+        "--case-sensitive", action="store_true", help="match upper and lower case exactly")
+    parser.add_argument(
+        "-w", "--whole-word", action="store_true", help="only match whole words")
+    parser.add_argument(
+        "-j", "--workers", type=positive_int,
+        help="worker processes used for matching (default: one per CPU)")
+    parser.add_argument(
+        "--format", choices=OUTPUT_FORMATS, default="tsv", help="output format (default: tsv)")
+    parser.add_argument("-o", "--output", help="write results to a file instead of stdout")
+    return parser
+
+def positive_int(value):
+    """Parse a command line argument that must be a whole number above 0."""
+    number = int(value)
+    if number < 1:
+        error = f"{value} is not a positive number"
+        raise argparse.ArgumentTypeError(error)
+    return number
+
+def read_search_terms(args):
+    """Return the search terms given with -e and read from the -f file."""
+    search_terms = strip_list(args.terms)
+    if args.terms_file:
+        if determine_file_extension(args.terms_file.lower()) in {"xlsx", "xls"}:
+            search_terms += search_term_file_to_list(args.terms_file)
+        else:
+            with open(args.terms_file, encoding="utf-8") as terms_file:
+                search_terms += strip_list(terms_file.read().splitlines())
+    return [term for term in search_terms if term]
+
+def collect_files(paths):
+    """Expand paths, directories and glob patterns to the files to search.
+
+    Directories are walked recursively for supported files; files named
+    explicitly are always searched.
+
+    Returns
+    -------
+        tuple: (list of file paths, whether any path could not be found)
+
+    """
+    files, had_error = [], False
+    for path in paths:
+        matches = sorted(glob.glob(path, recursive=True)) if glob.has_magic(path) else [path]
+        if not matches or not all(os.path.exists(match) for match in matches):
+            print(f"{path}: No such file or directory", file=sys.stderr)
+            had_error = True
+            continue
+        for match in matches:
+            if os.path.isdir(match):
+                files.extend(iter_directory(match))
+            elif not glob.has_magic(path) or is_supported(match):
+                files.append(match)
+    return files, had_error
+
+def iter_directory(directory):
+    """Yield the supported files in a directory tree, in name order."""
+    for root, directories, file_names in os.walk(directory):
+        directories.sort()
+        for file_name in sorted(file_names):
+            if is_supported(file_name):
+                yield os.path.join(root, file_name)
+
+def is_supported(path):
+    """Check if the router has a handler for a file."""
+    return determine_file_extension(Path(path).name.lower()) in supported_extensions()
+
+
+class ResultWriter:
+    """Write matches to a text stream (TSV, CSV, JSON Lines) or collect them for XLSX."""
+
+    def __init__(self, output, output_format):
+        """Start writing, with a header row for CSV and TSV."""
+        self.output = output
+        self.output_format = output_format
+        self.match_count = 0
+        self.rows = []
+        if output_format == "csv":
+            self.csv_writer = csv.writer(output)
+            self.csv_writer.writerow(OUTPUT_FIELDS)
+        elif output_format == "tsv":
+            output.write("\t".join(OUTPUT_FIELDS) + "\n")
+
+    def write(self, result):
+        """Write one match."""
+        self.match_count += 1
+        row = [str(getattr(result, field) or "") for field in OUTPUT_FIELDS]
+        # Locations without a context (" Line 3 of 9") start with a space
+        row[1] = row[1].strip()
+        if self.output_format == "csv":
+            self.csv_writer.writerow(row)
+        elif self.output_format == "tsv":
+            self.output.write("\t".join(tsv_escape(value) for value in row) + "\n")
+        elif self.output_format == "jsonl":
+            self.output.write(json.dumps(dict(zip(OUTPUT_FIELDS, row)), ensure_ascii=False) + "\n")
+        else:
+            self.rows.append(row)
+
+    def flush(self):
+        """Flush the matches written so far (as each file finishes)."""
+        if self.output_format != "xlsx":
+            self.output.flush()
+
+    def close(self):
+        """Write the XLSX workbook, which can only be built once every match is known."""
+        if self.output_format == "xlsx":
+            import pandas as pd
+
+            self.output.write(data_frame_to_excel(
+                pd.DataFrame(self.rows, columns=OUTPUT_FIELDS)).getvalue())
+
+
+def tsv_escape(value):
+    """Keep a value on one TSV line."""
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace(
+        "\r", "\\r")
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from data_toolbox.multi_file_search.cli import EXIT_ERROR, EXIT_MATCH, EXIT_NO_MATCH, main
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "notes.txt").write_text("hello\nwhere is Waldo?\n")
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "app.log").write_text("waldo\tlogged in\n")
+    (tmp_path / "logs" / "image.png").write_bytes(b"waldo")
+    return tmp_path
+
+def test_main_writes_matches_as_tsv(corpus, capsys):
+    # Act
+    status = main(["waldo", str(corpus)])
+    # Assert
+    output = capsys.readouterr().out.splitlines()
+    assert status == EXIT_MATCH
+    assert output[0] == "file\tlocation\tsearch_terms\toriginal_content"
+    assert sorted(output[1:]) == [
+        f"{corpus / 'logs' / 'app.log'}\tLine 1 of 2\twaldo\twaldo\\tlogged in",
+        f"{corpus / 'notes.txt'}\tLine 2 of 3\twaldo\twhere is Waldo?",
+    ]
+
+def test_main_applies_search_options(corpus, capsys):
+    # Act
+    status = main(["-e", "Waldo", "--case-sensitive", "--format", "jsonl",
+                   str(corpus / "**" / "*.log"), str(corpus / "notes.txt")])
+    # Assert
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == EXIT_MATCH
+    assert [row["file"] for row in output] == [str(corpus / "notes.txt")]
+
+def test_main_reads_regex_terms_file(corpus, capsys):
+    # Arrange
+    terms_file = corpus / "terms.txt"
+    terms_file.write_text("wal+do\n\n")
+    # Act
+    status = main(["-E", "-f", str(terms_file), "--format", "csv", str(corpus / "logs")])
+    # Assert
+    output = capsys.readouterr().out.splitlines()
+    assert status == EXIT_MATCH
+    assert output == [
+        "file,location,search_terms,original_content",
+        f"{corpus / 'logs' / 'app.log'},Line 1 of 2,wal+do,waldo\tlogged in",
+    ]
+
+def test_main_returns_no_match_status(corpus, capsys):
+    # Act
+    status = main(["-e", "nobody", "-o", str(corpus / "results.tsv"), str(corpus)])
+    # Assert
+    assert status == EXIT_NO_MATCH
+    assert (corpus / "results.tsv").read_text() == "file\tlocation\tsearch_terms\toriginal_content\n"
+    assert capsys.readouterr().out == ""
+
+def test_main_reports_missing_paths(corpus, capsys):
+    # Act
+    status = main(["waldo", str(corpus / "notes.txt"), str(corpus / "missing.txt")])
+    # Assert
+    captured = capsys.readouterr()
+    assert status == EXIT_ERROR
+    assert "missing.txt: No such file or directory" in captured.err
+    assert "where is Waldo?" in captured.out
+
+def test_main_writes_xlsx(corpus):
+    # Arrange
+    import pandas as pd
+    output_path = corpus / "results.xlsx"
+    # Act
+    status = main(["waldo", "--format", "xlsx", "-o", str(output_path), str(corpus / "notes.txt")])
+    # Assert
+    assert status == EXIT_MATCH
+    assert pd.read_excel(output_path)["location"].tolist() == ["Line 2 of 3"]
+
+def test_main_requires_output_file_for_xlsx(corpus):
+    # Act / Assert
+    with pytest.raises(SystemExit) as exit_info:
+        main(["waldo", "--format", "xlsx", str(corpus)])
+    assert exit_info.value.code == EXIT_ERROR
+
+def test_main_rejects_invalid_regex(corpus, capsys):
+    # Act / Assert
+    with pytest.raises(SystemExit) as exit_info:
+        main(["-E", "-e", "(", str(corpus)])
+    assert exit_info.value.code == EXIT_ERROR
+    captured = capsys.readouterr()
+    assert "invalid regular expression '('" in captured.err
+    assert "Error reading file" not in captured.err
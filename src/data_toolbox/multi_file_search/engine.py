@@ -0,0 +1,345 @@
+"""Search Engine.
+
+The library API of Multi-File Search, free of any user interface: the
+Streamlit page, the command line and tests are all clients of it.
+
+    engine = SearchEngine()
+    spec = SearchSpec(terms=("invoice",), whole_word=True)
+    for result in engine.search(["/data/q3.pdf", upload, ("notes.txt", b"...")], spec):
+        print(result.file, result.location)
+
+Files are searched by a pool of threads (handlers hand the CPU heavy matching to
+the shared worker pool) and each file's results are yielded as soon as it is done.
+Each job records where its time went (job.statistics, see RunStatistics) and
+logs it when it ends, including peak memory (see MemoryTracker), and feeds the
+process's search metrics (see metrics.py); a job can also be profiled (see
+SearchProfile).
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import io
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+from data_toolbox.multi_file_search.file_router.router import router
+from data_toolbox.multi_file_search.utils import memory, metrics, run_statistics, worker_pool
+from data_toolbox.multi_file_search.utils.run_statistics import RunStatistics
+from data_toolbox.multi_file_search.utils.server_files import (
+    ServerPathSearch,
+    search_server_file,
+)
+
+# Files searched at the same time
+MAX_FILE_THREADS = 50
+
+SEARCH_MODES = ("regular", "regex")
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """What to search for, and how.
+
+    Attributes
+    ----------
+        terms (tuple): search terms, or regex patterns
+        mode (str): "regular" or "regex"
+        case_sensitive (bool): match upper and lower case exactly
+        whole_word (bool): only match whole words
+
+    """
+
+    terms: tuple
+    mode: str = "regular"
+    case_sensitive: bool = False
+    whole_word: bool = False
+
+    def __post_init__(self):
+        """Check the mode and store the terms as a tuple."""
+        if self.mode not in SEARCH_MODES:
+            error = f"mode must be one of {SEARCH_MODES}, not {self.mode!r}"
+            raise ValueError(error)
+        object.__setattr__(self, "terms", tuple(self.terms))
+
+    @classmethod
+    def from_options(cls, search_terms, search_options) -> SearchSpec:
+        """Build a spec from search terms and a search options dictionary."""
+        return cls(
+            terms=tuple(search_terms),
+            mode=search_options["mode"],
+            case_sensitive=search_options["case-sensitive"],
+            whole_word=search_options["whole-word"],
+        )
+
+    def options(self) -> dict:
+        """Return the search options dictionary handlers take."""
+        return {
+            "mode": self.mode,
+            "case-sensitive": self.case_sensitive,
+            "whole-word": self.whole_word,
+        }
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """One row of search results: a match, or a file that was not (fully) searched.
+
+    Attributes
+    ----------
+        file (str): file name, path, or "archive.zip/member" name
+        location (str): where in the file ("Sheet1 B4", " Line 3 of 9"), or
+        what happened to it ("Error reading file", "Skipped, ...")
+        search_terms (str | None): the matched terms, comma separated; None
+        for rows that are not matches
+        original_content (str | None): the matching line, cell or paragraph
+
+    """
+
+    file: str
+    location: str
+    search_terms: str | None = None
+    original_content: str | None = None
+
+    @classmethod
+    def from_dict(cls, result) -> SearchResult:
+        """Build a result from a handler's result dictionary."""
+        return cls(
+            file=str(result["file"]),
+            location=result["location"],
+            search_terms=result.get("search_terms"),
+            original_content=result.get("original_content"),
+        )
+
+    @property
+    def is_match(self) -> bool:
+        """Whether the row is a match (rather than an error or a notice)."""
+        return self.search_terms is not None
+
+    @property
+    def is_error(self) -> bool:
+        """Whether the file could not be read."""
+        return self.location == "Error reading file"
+
+    def to_dict(self) -> dict:
+        """Return the result dictionary handlers produce (without empty match fields)."""
+        result = {"file": self.file, "location": self.location}
+        if self.is_match:
+            result["search_terms"] = self.search_terms
+            result["original_content"] = self.original_content
+        return result
+
+
+class NamedBytesIO(io.BytesIO):
+    """File content held in memory, named like an uploaded file."""
+
+    def __init__(self, name, content):
+        """Wrap content under a file name ("report.pdf")."""
+        super().__init__(content)
+        self.name = name
+
+
+class SearchJob:
+    """One search over a set of files, iterated for its results.
+
+    Attributes
+    ----------
+        files_done (int): files searched so far
+        files_total (int | None): files to search, known once a server path
+        has been crawled
+        statistics (RunStatistics): per-stage and per-file timing and what
+        was searched, complete once the job has ended
+        profile (SearchProfile | None): profile collected while the job runs
+        memory_tracker (MemoryTracker): peak memory of the job, and its budget
+
+    """
+
+    def __init__(self, files, spec, on_progress=None, max_threads=MAX_FILE_THREADS,
+                 profile=None, memory_budget=None):
+        """Prepare a search; nothing is read until the job is iterated.
+
+        Args:
+        ----
+            files (list | ServerPathSearch): file-like objects with a ``name``
+            (e.g. uploads), paths of files on disk, (name, bytes) pairs, or a
+            directory on the server to crawl
+            spec (SearchSpec): what to search for
+            on_progress (callable): called with (files done, files in total)
+            after each file
+            max_threads (int): most files searched at the same time
+            profile (SearchProfile): profile the file threads and their worker
+            tasks into this profile (default: no profiling)
+            memory_budget (int): bytes the search may use before it degrades
+            to streaming paths (default: no budget), see memory.py
+
+        """
+        self.files = files
+        self.spec = spec
+        self.on_progress = on_progress
+        self.max_threads = max_threads
+        self.files_done = 0
+        self.files_total = None if isinstance(files, ServerPathSearch) else len(files)
+        self.statistics = RunStatistics()
+        self.profile = profile
+        self.memory_tracker = memory.MemoryTracker(budget=memory_budget)
+        self.__cancel_event = threading.Event()
+        self.__executor = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self.__cancel_event.is_set()
+
+    def __iter__(self):
+        """Run the search, yielding SearchResults as each file finishes.
+
+        Results for files skipped by a server path crawl come first. The
+        job's statistics are logged and added to the search metrics when it
+        ends; a job abandoned by its consumer counts as cancelled.
+
+        Raises
+        ------
+            PermissionError: if a server path is outside the allowed roots
+
+        """
+        metrics.search_started()
+        if self.profile is not None:
+            self.profile.start()
+        self.memory_tracker.start()
+        outcome = metrics.FAILED
+        try:
+            yield from self.__search()
+            outcome = metrics.CANCELLED if self.cancelled else metrics.FINISHED
+        except GeneratorExit:
+            outcome = metrics.CANCELLED
+            raise
+        finally:
+            self.memory_tracker.stop()
+            if self.profile is not None:
+                self.profile.stop()
+            self.statistics.memory = self.memory_tracker.summary()
+            self.statistics.finish()
+            self.statistics.log()
+            metrics.record_search(self.statistics, outcome)
+
+    def __search(self):
+        """Search the files, yielding SearchResults as each file finishes."""
+        files = self.files
+        if isinstance(files, ServerPathSearch):
+            with self.statistics.stage("crawl"):
+                files, skipped_results = files.crawl()
+            self.files_total = len(files)
+            for result in skipped_results:
+                yield SearchResult.from_dict(result)
+        if not files or self.cancelled:
+            return
+        search_terms, search_options = list(self.spec.terms), self.spec.options()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads)
+        self.__executor = executor
+        search_started = time.perf_counter()
+        try:
+            # Futures are queued as they finish; unlike as_completed() this also
+            # wakes up for futures cancelled by cancel()
+            finished = queue.SimpleQueue()
+            file_statistics = {}
+            for file in files:
+                statistics = run_statistics.file_statistics_for(file_name(file), file)
+                future = executor.submit(
+                    measured_search_file, statistics, file, search_terms, search_options,
+                    self.memory_tracker, self.profile)
+                file_statistics[future] = statistics
+                future.add_done_callback(finished.put)
+            for _ in files:
+                future = finished.get()
+                if self.cancelled:
+                    return
+                statistics = file_statistics.pop(future)
+                try:
+                    file_results = future.result()
+                except Exception:  # noqa: BLE001
+                    # One file failing (e.g. its worker was killed) must not end the search
+                    file_results = [{"file": statistics.name, "location": "Error reading file"}]
+                statistics.results = len(file_results or [])
+                statistics.error = any(
+                    result["location"] == "Error reading file" for result in file_results or [])
+                self.statistics.files.append(statistics)
+                self.files_done += 1
+                if self.on_progress is not None:
+                    self.on_progress(self.files_done, self.files_total)
+                for result in file_results or []:
+                    if self.cancelled:
+                        return
+                    yield SearchResult.from_dict(result)
+        finally:
+            self.statistics.add_stage("search", time.perf_counter() - search_started)
+            # Files not started yet are dropped when the job is cancelled or abandoned
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def cancel(self) -> None:
+        """Stop the search: files not yet started are skipped and no more results are yielded.
+
+        Files already being searched run to completion in the background.
+        """
+        self.__cancel_event.set()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SearchEngine:
+    """Runs searches; a thin factory for SearchJobs sharing one configuration."""
+
+    def __init__(self, max_threads=MAX_FILE_THREADS, workers=None, memory_budget=None):
+        """Configure the engine.
+
+        Args:
+        ----
+            max_threads (int): most files searched at the same time per search
+            workers (int): worker processes for matching (default: one per CPU).
+            The worker pool is shared by the whole process, so this resizes it
+            for every engine.
+            memory_budget (int): bytes a search may use before it degrades to
+            streaming paths (default: MFS_MEMORY_BUDGET_MIB, if set)
+
+        """
+        self.max_threads = max_threads
+        self.memory_budget = (
+            memory_budget if memory_budget is not None else memory.budget_from_environment())
+        if workers is not None and workers != worker_pool.worker_count():
+            worker_pool.set_worker_count(workers)
+
+    def submit(self, files, spec, on_progress=None, profile=None) -> SearchJob:
+        """Create a search job, to be iterated for its results (see SearchJob)."""
+        return SearchJob(files, spec, on_progress=on_progress, max_threads=self.max_threads,
+                         profile=profile, memory_budget=self.memory_budget)
+
+    def search(self, files, spec, on_progress=None, profile=None):
+        """Search files, yielding SearchResults as each file finishes (see SearchJob)."""
+        return iter(self.submit(files, spec, on_progress=on_progress, profile=profile))
+
+
+def file_name(file) -> str:
+    """Return the name results give a file (see SearchJob for the kinds of file)."""
+    if isinstance(file, (str, os.PathLike)):
+        return str(file)
+    if isinstance(file, tuple):
+        return file[0]
+    return file.name
+
+def measured_search_file(file_statistics, file, search_terms, search_options,
+                         memory_tracker=None, profile=None):
+    """Search one file, recording its timing and memory in file_statistics (see RunStatistics)."""
+    with nullcontext() if memory_tracker is None else memory_tracker.track_file(file_statistics), \
+            run_statistics.measure_file(file_statistics), \
+            nullcontext() if profile is None else profile.profile_thread():
+        return search_file(file, search_terms, search_options)
+
+def search_file(file, search_terms, search_options):
+    """Search one file, opening it from disk if it is given by path."""
+    if isinstance(file, (str, os.PathLike)):
+        return search_server_file(file, search_terms, search_options)
+    if isinstance(file, tuple):
+        file = NamedBytesIO(*file)
+    return router(file, search_terms, search_options)
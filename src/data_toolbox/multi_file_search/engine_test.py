@@ -0,0 +1,155 @@
+import io
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from data_toolbox.multi_file_search.engine import SearchEngine, SearchResult, SearchSpec
+from data_toolbox.multi_file_search.utils.server_files import ServerPathSearch
+
+# Base path for mocking functions called in the engine
+base_path = "data_toolbox.multi_file_search.engine"
+
+
+def test_search_engine_searches_uploads_paths_and_bytes(tmp_path):
+    # Arrange
+    upload = io.BytesIO(b"waldo upload\n")
+    upload.name = "upload.txt"
+    path = tmp_path / "disk.txt"
+    path.write_text("Waldo on disk\n")
+    progress = []
+    # Act
+    results = list(SearchEngine().search(
+        [upload, path, ("memory.txt", b"no match\nwaldo in memory\n")],
+        SearchSpec(terms=["waldo"]),
+        on_progress=lambda count, total: progress.append((count, total)),
+    ))
+    # Assert
+    assert sorted((result.original_content, result.location) for result in results) == [
+        ("Waldo on disk", " Line 1 of 2"),
+        ("waldo in memory", " Line 2 of 3"),
+        ("waldo upload", " Line 1 of 2"),
+    ]
+    assert all(result.is_match for result in results)
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+def test_search_spec_maps_to_search_options():
+    # Arrange
+    search_options = {"mode": "regex", "case-sensitive": True, "whole-word": False}
+    # Act
+    spec = SearchSpec.from_options(["wal+do"], search_options)
+    # Assert
+    assert spec == SearchSpec(terms=("wal+do",), mode="regex", case_sensitive=True)
+    assert spec.options() == search_options
+
+def test_search_spec_rejects_unknown_modes():
+    # Act / Assert
+    with pytest.raises(ValueError, match="mode"):
+        SearchSpec(terms=("waldo",), mode="fuzzy")
+
+@pytest.mark.parametrize(("result", "is_match", "is_error"), [
+    ({"file": "a.txt", "location": " Line 1 of 1", "search_terms": "x",
+      "original_content": "x"}, True, False),
+    ({"file": "a.txt", "location": "Error reading file"}, False, True),
+    ({"file": "a.zip/b.pdf", "location": "Skipped, larger than 512MiB"}, False, False),
+])
+def test_search_result_round_trips_result_dictionaries(result, is_match, is_error):
+    # Act
+    search_result = SearchResult.from_dict(result)
+    # Assert
+    assert (search_result.is_match, search_result.is_error) == (is_match, is_error)
+    assert search_result.to_dict() == result
+
+@patch(f"{base_path}.router")
+def test_search_job_cancel_stops_the_search(mock_router):
+    # Arrange: the first file finishes straight away, the second one waits
+    release = threading.Event()
+
+    def search_file(file, *_):
+        if file.name != "0.txt":
+            release.wait(5)
+        return [{"file": file.name, "location": "Error reading file"}]
+
+    mock_router.side_effect = search_file
+    files = [(f"{number}.txt", b"") for number in range(10)]
+    job = SearchEngine(max_threads=1).submit(files, SearchSpec(terms=("waldo",)))
+    results = iter(job)
+    first_result = next(results)
+    # Act
+    job.cancel()
+    release.set()
+    # Assert
+    assert first_result.file == "0.txt"
+    assert list(results) == []
+    assert job.cancelled
+    # Only the file that may have been running when the job was cancelled was searched
+    assert mock_router.call_count <= 2
+
+@patch(f"{base_path}.router")
+def test_search_engine_without_files_searches_nothing(mock_router):
+    # Act
+    results = list(SearchEngine().search([], SearchSpec(terms=("waldo",))))
+    # Assert
+    assert results == []
+    mock_router.assert_not_called()
+
+def test_search_engine_refuses_server_paths_outside_roots(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.delenv("MFS_SERVER_PATHS", raising=False)
+    # Act / Assert
+    with pytest.raises(PermissionError):
+        list(SearchEngine().search(ServerPathSearch(str(tmp_path)), SearchSpec(terms=("x",))))
+
+def test_engine_imports_without_streamlit():
+    # Act
+    loaded = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; from data_toolbox.multi_file_search import SearchEngine; "
+         "print('streamlit' in sys.modules)"],
+        capture_output=True, text=True, check=True,
+    )
+    # Assert
+    assert loaded.stdout.strip() == "False"
+
+@patch(f"{base_path}.router")
+def test_search_job_reports_files_whose_handler_raised(mock_router):
+    # Arrange
+    def search_file(file, *_):
+        if file.name == "broken.pdf":
+            error = "worker died"
+            raise RuntimeError(error)
+        return [{"file": file.name, "location": " Line 1 of 1", "search_terms": "waldo",
+                 "original_content": "waldo"}]
+
+    mock_router.side_effect = search_file
+    files = [("broken.pdf", b""), ("fine.txt", b"")]
+    # Act
+    results = list(SearchEngine().search(files, SearchSpec(terms=("waldo",))))
+    # Assert
+    assert sorted((result.file, result.location) for result in results) == [
+        ("broken.pdf", "Error reading file"),
+        ("fine.txt", " Line 1 of 1"),
+    ]
+
+def test_search_job_records_run_statistics(caplog):
+    # Arrange
+    job = SearchEngine().submit(
+        [("notes.txt", b"waldo\nno match\n"), ("table.csv", b"a,waldo\nb,c\n")],
+        SearchSpec(terms=["waldo"]),
+    )
+    # Act
+    with caplog.at_level("INFO", logger="Toolbox"):
+        results = list(job)
+    # Assert
+    statistics = {file.name: file for file in job.statistics.files}
+    assert set(statistics) == {"notes.txt", "table.csv"}
+    assert statistics["notes.txt"].bytes == 15
+    assert statistics["notes.txt"].counts == {"lines": 3}
+    assert statistics["notes.txt"].results == 1
+    assert {"sniff", "detect_encoding", "matching", "parsing"} <= set(statistics["notes.txt"].stages)
+    assert statistics["table.csv"].file_type == "csv"
+    assert job.statistics.summary()["results"] == len(results)
+    assert job.statistics.seconds >= job.statistics.stages["search"] > 0
+    assert "Multi-File Search run statistics" in caplog.text
@@ -1,7 +1,37 @@
-from data_toolbox.multi_file_search.file_router.csv import search_csv
-from data_toolbox.multi_file_search.file_router.docx import search_docx
-from data_toolbox.multi_file_search.file_router.pdf import search_pdf
-from data_toolbox.multi_file_search.file_router.pptx import search_pptx
-from data_toolbox.multi_file_search.file_router.txt import search_txt
-from data_toolbox.multi_file_search.file_router.xls import search_xls
-from data_toolbox.multi_file_search.file_router.xlsx import search_xlsx
+"""File Router.
+
+Handlers are imported on first use (see registry.py), so importing this
+package does not import any parser library.
+"""
+import importlib
+
+# search function name -> handler module
+_HANDLER_MODULES = {
+    "search_archive": "archive",
+    "search_compressed": "compressed",
+    "search_csv": "csv",
+    "search_docx": "docx",
+    "search_eml": "eml",
+    "search_html": "html",
+    "search_json": "json",
+    "search_jsonl": "json",
+    "search_ods": "odf",
+    "search_odt": "odf",
+    "search_pdf": "pdf",
+    "search_pptx": "pptx",
+    "search_txt": "txt",
+    "search_xls": "xls",
+    "search_xlsx": "xlsx",
+    "search_xml": "xml",
+}
+
+__all__ = list(_HANDLER_MODULES)
+
+
+def __getattr__(name):
+    """Import handler functions when they are first accessed."""
+    if name in _HANDLER_MODULES:
+        module = importlib.import_module(f"{__name__}.{_HANDLER_MODULES[name]}")
+        return getattr(module, name)
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
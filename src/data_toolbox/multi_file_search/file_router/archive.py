@@ -0,0 +1,237 @@
+"""Archive File Handler.
+
+ZIP and tar (optionally gzip / bzip2 / xz compressed) uploads are searched
+member by member. Each supported member is read out of the archive into memory,
+named "archive.zip/inner/path.pdf" and passed to the router like an uploaded
+file; nothing is extracted to disk.
+
+Members are read in archive order (so compressed tar streams are only read
+once) while previously read members are searched by a small thread pool.
+Guards against zip bombs limit the size and compression ratio of members,
+the total size and member count of an archive and how deeply archives nest.
+"""
+import concurrent.futures
+import io
+import tarfile
+import threading
+import zipfile
+from collections import deque
+
+from data_toolbox.multi_file_search.file_router.registry import supported_extensions
+from data_toolbox.multi_file_search.file_router.router import router
+from data_toolbox.multi_file_search.file_router.sniff import ZIP_SIGNATURES
+from data_toolbox.multi_file_search.utils import memory, worker_pool
+from data_toolbox.utils.files import determine_file_extension
+
+MiB = 1024 * 1024
+
+# Largest member that is read into memory
+MAX_MEMBER_SIZE = 512 * MiB
+# Largest total of member sizes read out of one archive (including nested archives)
+MAX_TOTAL_SIZE = 2048 * MiB
+# Highest uncompressed / compressed size of a ZIP member larger than 1MiB
+MAX_COMPRESSION_RATIO = 100
+# Most members searched in one archive
+MAX_MEMBERS = 10_000
+# Most archives nested inside each other ("a.zip/b.zip" is a depth of 2)
+MAX_NESTING_DEPTH = 3
+
+READ_CHUNK_SIZE = MiB
+
+
+class ArchiveMember(io.BytesIO):
+    """The content of an archive member, named like an uploaded file."""
+
+    def __init__(self, name, depth, budget):
+        """Create an empty member, to be written to and rewound.
+
+        Args:
+        ----
+            name (str): "archive.zip/inner/path.pdf"
+            depth (int): how many archives the member is inside of
+            budget (ArchiveBudget): size budget shared with the outermost archive
+
+        """
+        super().__init__()
+        self.name = name
+        self.archive_depth = depth
+        self.archive_budget = budget
+
+
+class ArchiveBudget:
+    """Bytes that may still be read out of an archive and the archives inside it."""
+
+    def __init__(self, remaining=MAX_TOTAL_SIZE):
+        """Start with the full budget."""
+        self.remaining = remaining
+        # Nested archives are read by different threads
+        self.__lock = threading.Lock()
+
+    def take(self, size):
+        """Take size bytes from the budget, returning False if there is not enough left."""
+        with self.__lock:
+            if size > self.remaining:
+                return False
+            self.remaining -= size
+            return True
+
+
+class ArchiveLimitError(Exception):
+    """Raised when a member breaks one of the archive guards."""
+
+
+def search_archive(file, search_terms, search_options):
+    """Search the supported members of a ZIP or tar archive for Search Terms.
+
+    Args:
+    ----
+        file (file): a ZIP or tar file uploaded through streamlit's UI, or a
+        member of another archive
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by "archive.zip/inner/path" file names
+
+    """
+    if isinstance(file, ArchiveMember):
+        depth, budget = file.archive_depth + 1, file.archive_budget
+    else:
+        depth, budget = 1, ArchiveBudget()
+    if depth > MAX_NESTING_DEPTH:
+        return [skipped_result(file.name, f"archives nested more than {MAX_NESTING_DEPTH} deep")]
+
+    try:
+        if archive_format(file) == "zip":
+            members = iter_zip_members(file, depth, budget)
+        else:
+            members = iter_tar_members(file, depth, budget)
+        return search_members(members, search_terms, search_options)
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def archive_format(file):
+    """Tell a ZIP from a (possibly compressed) tar archive by its content, not its name.
+
+    Returns:
+    -------
+        str: "zip" or "tar", with the file rewound
+
+    """
+    file.seek(0)
+    is_zip = file.read(len(ZIP_SIGNATURES[0])).startswith(ZIP_SIGNATURES)
+    file.seek(0)
+    # ZIP files may start with other data (e.g. self-extracting archives)
+    if not is_zip and not tarfile.is_tarfile(file):
+        file.seek(0)
+        is_zip = zipfile.is_zipfile(file)
+    file.seek(0)
+    return "zip" if is_zip else "tar"
+
+def search_members(members, search_terms, search_options):
+    """Route members to their handlers in parallel, keeping results in member order.
+
+    At most two members per worker are held in memory at once, and only one
+    while the search is over its memory budget (see memory.should_stream).
+    """
+    results = []
+    max_pending = 2 * worker_pool.worker_count()
+    pending = deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=worker_pool.worker_count()) as executor:
+        for member in members:
+            if isinstance(member, dict):
+                pending.append(_completed(member))
+            else:
+                pending.append(executor.submit(router, member, search_terms, search_options))
+            while len(pending) >= max_pending or (pending and memory.should_stream()):
+                results.extend(pending.popleft().result())
+        while pending:
+            results.extend(pending.popleft().result())
+    return results
+
+def iter_zip_members(file, depth, budget):
+    """Yield an ArchiveMember (or a skipped result) per supported ZIP member."""
+    with zipfile.ZipFile(file) as zip_archive:
+        member_infos = [
+            info for info in zip_archive.infolist()
+            if not info.is_dir() and is_supported(info.filename)
+        ]
+        for count, info in enumerate(member_infos):
+            name = f"{file.name}/{info.filename}"
+            if count == MAX_MEMBERS:
+                yield skipped_result(file.name, f"more than {MAX_MEMBERS} members")
+                return
+            ratio = info.file_size / max(info.compress_size, 1)
+            if info.file_size > MiB and ratio > MAX_COMPRESSION_RATIO:
+                yield skipped_result(name, f"compression ratio above {MAX_COMPRESSION_RATIO}")
+                continue
+            yield _read_member(
+                lambda info=info: zip_archive.open(info), info.file_size, name, depth, budget)
+
+def iter_tar_members(file, depth, budget):
+    """Yield an ArchiveMember (or a skipped result) per supported tar member.
+
+    The archive is read as a stream, decompressing it only once.
+    """
+    with tarfile.open(fileobj=file, mode="r|*") as tar_archive:
+        count = 0
+        for info in tar_archive:
+            if not info.isfile() or not is_supported(info.name):
+                continue
+            if count == MAX_MEMBERS:
+                yield skipped_result(file.name, f"more than {MAX_MEMBERS} members")
+                return
+            count += 1
+            name = f"{file.name}/{info.name.lstrip('/')}"
+            yield _read_member(
+                lambda info=info: tar_archive.extractfile(info), info.size, name, depth, budget)
+
+def is_supported(member_name):
+    """Check if the router has a handler for a member."""
+    file_name = member_name.rsplit("/", 1)[-1].lower()
+    return determine_file_extension(file_name) in supported_extensions()
+
+def skipped_result(name, reason):
+    """Build the result reported for a member or archive that is not searched."""
+    return {
+        "file": name,
+        "location": f"Skipped, {reason}",
+    }
+
+def _read_member(open_member, declared_size, name, depth, budget):
+    """Read a member into an ArchiveMember, enforcing the size guards.
+
+    Declared sizes can lie, so the limits are checked again while reading.
+    """
+    try:
+        if declared_size > MAX_MEMBER_SIZE:
+            raise ArchiveLimitError(f"larger than {MAX_MEMBER_SIZE // MiB}MiB")
+        if not budget.take(declared_size):
+            raise ArchiveLimitError(f"archive larger than {MAX_TOTAL_SIZE // MiB}MiB")
+        content = ArchiveMember(name, depth, budget)
+        with open_member() as member_file:
+            while chunk := member_file.read(READ_CHUNK_SIZE):
+                content.write(chunk)
+                if content.tell() > declared_size and not budget.take(len(chunk)):
+                    raise ArchiveLimitError(f"archive larger than {MAX_TOTAL_SIZE // MiB}MiB")
+                if content.tell() > MAX_MEMBER_SIZE:
+                    raise ArchiveLimitError(f"larger than {MAX_MEMBER_SIZE // MiB}MiB")
+    except ArchiveLimitError as e:
+        return skipped_result(name, str(e))
+    except Exception:  # noqa: BLE001
+        return {
+            "file": name,
+            "location": "Error reading file",
+        }
+    content.seek(0)
+    return content
+
+def _completed(result):
+    """Wrap a result in a finished future so it keeps its place in the results."""
+    future = concurrent.futures.Future()
+    future.set_result([result])
+    return future
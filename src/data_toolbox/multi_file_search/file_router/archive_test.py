@@ -0,0 +1,122 @@
+import io
+import tarfile
+import zipfile
+from unittest.mock import MagicMock, patch
+
+from data_toolbox.multi_file_search.file_router import archive
+from data_toolbox.multi_file_search.file_router.archive import search_archive
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.archive"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+def make_zip(name, members):
+    """Build an in-memory ZIP from {member name: bytes}."""
+    zip_file = io.BytesIO()
+    with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED) as zip_archive:
+        for member_name, content in members.items():
+            zip_archive.writestr(member_name, content)
+    zip_file.name = name
+    return zip_file
+
+def test_search_archive_exception_handling():
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.zip"
+    file.seek.side_effect = Exception("Error reading file")
+    # Act
+    result = search_archive(file, [], {})
+    # Assert
+    expected_result = [{
+        "file": "test_file.zip",
+        "location": "Error reading file"
+    }]
+    assert result == expected_result
+
+def test_search_archive_routes_zip_members_in_order():
+    # Arrange
+    nested = make_zip("nested.zip", {"deep/notes.txt": b"waldo is nested"}).getvalue()
+    file = make_zip("evidence.zip", {
+        "a/first.txt": b"nothing\nwaldo here",
+        "a/image.png": b"waldo in an unsupported file",
+        "b/table.csv": b"name\nwaldo",
+        "b/nested.zip": nested,
+    })
+    # Act
+    result = search_archive(file, ["waldo"], search_options)
+    # Assert
+    assert [(r["file"], r["original_content"]) for r in result] == [
+        ("evidence.zip/a/first.txt", "waldo here"),
+        ("evidence.zip/b/table.csv", "waldo"),
+        ("evidence.zip/b/nested.zip/deep/notes.txt", "waldo is nested"),
+    ]
+
+def test_search_archive_streams_tar_gz_members():
+    # Arrange
+    file = io.BytesIO()
+    with tarfile.open(fileobj=file, mode="w:gz") as tar_archive:
+        content = b"found waldo"
+        info = tarfile.TarInfo("logs/app.txt")
+        info.size = len(content)
+        tar_archive.addfile(info, io.BytesIO(content))
+    file.name = "bundle.tar.gz"
+    # Act
+    result = search_archive(file, ["waldo"], search_options)
+    # Assert
+    assert [(r["file"], r["location"]) for r in result] == [
+        ("bundle.tar.gz/logs/app.txt", " Line 1 of 1"),
+    ]
+
+def test_search_archive_reads_the_format_from_the_content():
+    # Arrange
+    tar_named_zip = io.BytesIO()
+    with tarfile.open(fileobj=tar_named_zip, mode="w") as tar_archive:
+        content = b"found waldo"
+        info = tarfile.TarInfo("app.txt")
+        info.size = len(content)
+        tar_archive.addfile(info, io.BytesIO(content))
+    tar_named_zip.name = "bundle.zip"
+    zip_named_tar = make_zip("bundle.tar", {"app.txt": b"found waldo"})
+    # Act
+    results = [search_archive(file, ["waldo"], search_options)
+               for file in (tar_named_zip, zip_named_tar)]
+    # Assert
+    assert [[(r["file"], r["location"]) for r in result] for result in results] == [
+        [("bundle.zip/app.txt", " Line 1 of 1")],
+        [("bundle.tar/app.txt", " Line 1 of 1")],
+    ]
+
+def test_search_archive_skips_zip_bombs():
+    # Arrange
+    file = make_zip("bomb.zip", {"bomb.txt": b"0" * (2 * archive.MiB)})
+    # Act
+    result = search_archive(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": "bomb.zip/bomb.txt",
+        "location": f"Skipped, compression ratio above {archive.MAX_COMPRESSION_RATIO}",
+    }]
+
+@patch(f"{base_path}.MAX_MEMBER_SIZE", 4)
+def test_search_archive_skips_large_members():
+    # Arrange
+    file = make_zip("large.zip", {"large.txt": b"waldo waldo"})
+    # Act
+    result = search_archive(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{"file": "large.zip/large.txt", "location": "Skipped, larger than 0MiB"}]
+
+@patch(f"{base_path}.MAX_NESTING_DEPTH", 1)
+def test_search_archive_limits_nesting():
+    # Arrange
+    nested = make_zip("inner.zip", {"notes.txt": b"waldo"}).getvalue()
+    file = make_zip("outer.zip", {"inner.zip": nested})
+    # Act
+    result = search_archive(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": "outer.zip/inner.zip",
+        "location": "Skipped, archives nested more than 1 deep",
+    }]
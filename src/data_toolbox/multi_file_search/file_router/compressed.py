@@ -0,0 +1,112 @@
+"""Compressed File Handler.
+
+Single gzip, bzip2 and xz compressed files, typically rotated logs
+("app.log.3.gz"), are decompressed as a stream straight into the line-by-line
+text search, so line numbers are those of the decompressed file and only one
+chunk of it is held in memory at a time. Compressed tar files without a
+".tar" in their name are searched like archives.
+"""
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+
+from data_toolbox.multi_file_search.file_router.archive import search_archive, skipped_result
+from data_toolbox.multi_file_search.file_router.sniff import (
+    BZIP2_SIGNATURE,
+    GZIP_SIGNATURE,
+    TEXT_EXTENSIONS,
+    XZ_SIGNATURE,
+    sniff_file_type,
+)
+from data_toolbox.multi_file_search.utils.utils import (
+    STREAM_CHUNK_SIZE,
+    detect_encoding,
+    iter_decoded_lines,
+    stream_document_search,
+)
+from data_toolbox.utils.files import determine_file_extension
+
+# Extension -> function opening a decompressed stream over a binary file
+DECOMPRESSORS = {
+    "gz": lambda file: gzip.GzipFile(fileobj=file, mode="rb"),
+    "bz2": bz2.BZ2File,
+    "xz": lzma.LZMAFile,
+}
+# Signature at the start of a compressed file -> DECOMPRESSORS key
+COMPRESSION_SIGNATURES = (
+    (GZIP_SIGNATURE, "gz"),
+    (BZIP2_SIGNATURE, "bz2"),
+    (XZ_SIGNATURE, "xz"),
+)
+
+
+def search_compressed(file, search_terms, search_options):
+    """Search a gzip / bzip2 / xz compressed text file for Search Terms.
+
+    Args:
+    ----
+        file (file): a compressed file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by line of the decompressed file
+
+    """
+    try:
+        decompress = DECOMPRESSORS[compression_format(file)]
+        with decompress(file) as stream:
+            # The type and encoding are told from the first chunk, rather than
+            # decompressing the whole file an extra time
+            sample = stream.read(STREAM_CHUNK_SIZE)
+            if not sample:
+                return []
+            file_type = sniff_file_type(io.BytesIO(sample))
+            if file_type == "tar":
+                return search_archive(file, search_terms, search_options)
+            if file_type not in TEXT_EXTENSIONS:
+                return [skipped_result(file.name, "the compressed content is not text")]
+            encoding = sample_encoding(sample)
+            stream.seek(0)
+            return stream_document_search(
+                file_name=file.name,
+                lines=iter_decoded_lines(stream, encoding, errors="replace"),
+                search_terms=search_terms,
+                search_options=search_options,
+                location_context="",
+            )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def compression_format(file):
+    """Return the DECOMPRESSORS key of a file, from its signature or else its extension.
+
+    Rotated logs are often renamed by hand, so the content is trusted over the
+    name. The file is rewound.
+    """
+    file.seek(0)
+    start = file.read(max(len(signature) for signature, _ in COMPRESSION_SIGNATURES))
+    file.seek(0)
+    for signature, compression in COMPRESSION_SIGNATURES:
+        if start.startswith(signature):
+            return compression
+    return determine_file_extension(file.name.lower())
+
+def sample_encoding(sample):
+    """Detect the encoding of a file from its first chunk.
+
+    Samples that are valid UTF-8 (which chardet tends to misreport when only a
+    few characters are not ASCII, as in most logs) are decoded as UTF-8.
+    """
+    try:
+        # The sample may end part way through a character
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+    except UnicodeDecodeError:
+        return detect_encoding(io.BytesIO(sample)) or "utf-8"
+    return "utf-8"
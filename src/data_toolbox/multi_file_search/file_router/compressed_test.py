@@ -0,0 +1,102 @@
+import bz2
+import gzip
+import io
+import lzma
+import tarfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from data_toolbox.multi_file_search.file_router.compressed import search_compressed
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.compressed"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+def make_file(content, name):
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+@patch(f"{base_path}.sniff_file_type")
+def test_search_compressed_exception_handling(mock_sniff_file_type):
+    # Arrange
+    file = make_file(gzip.compress(b"text"), "test_file.log.gz")
+    # Act
+    mock_sniff_file_type.side_effect = Exception("Error reading file")
+    result = search_compressed(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.log.gz",
+        "location": "Error reading file",
+    }]
+
+@pytest.mark.parametrize(("compress", "extension"), [
+    (gzip.compress, "gz"),
+    (bz2.compress, "bz2"),
+    (lzma.compress, "xz"),
+])
+def test_search_compressed_keeps_line_numbers(compress, extension):
+    # Arrange
+    log = "".join(f"12:00:{i:02} INFO request {i}\n" for i in range(40))
+    log += "12:01:00 ERROR café waldo\n"
+    file = make_file(compress(log.encode("utf-8")), f"app.log.1.{extension}")
+    # Act
+    result = search_compressed(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": f"app.log.1.{extension}",
+        "location": " Line 41 of 42",
+        "search_terms": "waldo",
+        "original_content": "12:01:00 ERROR café waldo",
+    }]
+
+@pytest.mark.parametrize(("compress", "name"), [
+    (bz2.compress, "app.log.gz"),
+    (lzma.compress, "app.log.bz2"),
+    (gzip.compress, "app.log.xz"),
+])
+def test_search_compressed_trusts_the_content_over_the_extension(compress, name):
+    # Arrange
+    file = make_file(compress(b"12:00:00 INFO start\n12:01:00 ERROR waldo\n"), name)
+    # Act
+    result = search_compressed(file, ["waldo"], search_options)
+    # Assert
+    assert [(r["file"], r["location"]) for r in result] == [(name, " Line 2 of 3")]
+
+def test_search_compressed_rewinds_the_stream_after_sampling():
+    # Arrange
+    file = make_file(gzip.compress(b"waldo\n" * 100), "test_file.log.gz")
+    # Act
+    with patch(f"{base_path}.STREAM_CHUNK_SIZE", 16), \
+            patch(f"{base_path}.stream_document_search") as mock_search:
+        mock_search.side_effect = lambda **kwargs: list(kwargs["lines"])
+        lines = search_compressed(file, ["waldo"], search_options)
+    # Assert
+    assert lines == ["waldo"] * 100 + [""]
+
+def test_search_compressed_searches_tar_files_as_archives():
+    # Arrange
+    tar_file = io.BytesIO()
+    with tarfile.open(fileobj=tar_file, mode="w:xz") as tar_archive:
+        info = tarfile.TarInfo("logs/app.log")
+        info.size = 6
+        tar_archive.addfile(info, io.BytesIO(b"waldo\n"))
+    file = make_file(tar_file.getvalue(), "logs.xz")
+    # Act
+    result = search_compressed(file, ["waldo"], search_options)
+    # Assert
+    assert [row["file"] for row in result] == ["logs.xz/logs/app.log"]
+
+def test_search_compressed_skips_binary_content():
+    # Arrange
+    file = make_file(gzip.compress(b"%PDF-1.7\n" + bytes(range(256))), "report.gz")
+    # Act
+    result = search_compressed(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": "report.gz",
+        "location": "Skipped, the compressed content is not text",
+    }]
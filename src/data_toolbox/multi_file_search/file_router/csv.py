@@ -1,15 +1,24 @@
 """CSV File Handler.""" # noqa: A005
 import pandas as pd
 
+from data_toolbox.multi_file_search.utils import memory
+from data_toolbox.multi_file_search.utils.byte_search import may_contain_matches
 from data_toolbox.multi_file_search.utils.utils import (
     detect_encoding,
     tabular_search,
 )
 
+# Rows parsed at a time when the search is over its memory budget
+ROWS_PER_CHUNK = 50_000
+
 
 def search_csv(file, search_terms, search_options):
     """Search CSV for Search Terms.
 
+    When the search is over its memory budget the file is parsed and searched
+    ROWS_PER_CHUNK rows at a time; pandas then infers column types per chunk,
+    so a number may read "1" in one chunk and "1.0" in another.
+
     Args:
     ----
         file (file): a CSV file uploaded through streamlit's UI
@@ -24,19 +33,29 @@ def search_csv(file, search_terms, search_options):
     try:
         # Determine the file encoding:
         encoding = detect_encoding(file)
-        # Read the file:
-        csv_df = pd.read_csv(file, encoding=encoding, index_col=None, header=None)
+        # Skip parsing when the raw bytes cannot contain a hit:
+        if not may_contain_matches(file, encoding, search_terms, search_options):
+            return []
+        # Read the file (in chunks, whose row index carries on, when memory is short):
+        if memory.should_stream():
+            csv_dfs = pd.read_csv(file, encoding=encoding, index_col=None, header=None,
+                                  chunksize=ROWS_PER_CHUNK)
+        else:
+            csv_dfs = [pd.read_csv(file, encoding=encoding, index_col=None, header=None)]
+        results = []
+        for csv_df in csv_dfs:
+            results.extend(tabular_search(
+                file_name=file.name,
+                df=csv_df,
+                search_terms=search_terms,
+                search_options=search_options,
+                sheet_name="",
+            ))
     except Exception:  # noqa: BLE001
         return [{
             "file": file.name,
             "location": "Error reading file",
         }]
 
-    return tabular_search(
-            file_name=file.name,
-            df=csv_df,
-            search_terms=search_terms,
-            search_options=search_options,
-            sheet_name="",
-        )
+    return results
 
@@ -1,14 +1,39 @@
-"""DOCX File Handler."""
-import docx2txt
+"""DOCX File Handler.
 
-from data_toolbox.multi_file_search.utils.utils import (
-    document_search,
-)
+The document is searched straight from its XML parts rather than being
+converted to one big string. Parts are stream-parsed with iterparse and every
+paragraph is handed to the worker pool as soon as it is complete, after which
+its XML is discarded, so memory stays flat however long the document is.
+"""
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from data_toolbox.multi_file_search.utils.utils import stream_record_search
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+# Paragraphs per worker task, paragraphs are much longer than lines of text
+PARAGRAPHS_PER_TASK = 2_000
+
+_PART_NUMBER = re.compile(r"(\d+)\.xml$")
+
+# Elements whose finished children can be discarded
+_CONTAINER_TAGS = {
+    W + "body", W + "hdr", W + "ftr", W + "footnotes", W + "endnotes", W + "comments",
+}
+_NOTE_TAGS = {W + "footnote", W + "endnote", W + "comment"}
+_WHITESPACE_TAGS = {W + "tab": "\t", W + "br": " ", W + "cr": " "}
 
 
 def search_docx(file, search_terms, search_options):
     """Search DOCX for Search Terms.
 
+    The body, headers, footers, footnotes, endnotes and comments are searched
+    paragraph by paragraph. Hits are located by section and paragraph, table
+    cell, or the header / footer / note / comment they are in.
+
     Args:
     ----
         file (file): a DOCX file uploaded through streamlit's UI
@@ -21,21 +46,180 @@ def search_docx(file, search_terms, search_options):
 
     """
     try:
-        # Read document
-        document_string = docx2txt.process(file)
-        # Create a list from the document content:
-        document_list = document_string.split("\n")
+        file.seek(0)
+        with zipfile.ZipFile(file) as docx_archive:
+            return stream_record_search(
+                file_name=file.name,
+                records=iter_docx_paragraphs(docx_archive),
+                search_terms=search_terms,
+                search_options=search_options,
+                records_per_task=PARAGRAPHS_PER_TASK,
+            )
     except Exception:  # noqa: BLE001
         return [{
             "file": file.name,
             "location": "Error reading file",
         }]
 
-    # use generic document search function
-    return document_search(
-        file_name=file.name,
-        line_list=document_list,
-        search_terms=search_terms,
-        search_options=search_options,
-        location_context="",
+def iter_docx_paragraphs(docx_archive):
+    """Yield ((location_context, location), text) per non-empty paragraph of a DOCX."""
+    part_names = set(docx_archive.namelist())
+    yield from _iter_part(docx_archive, "word/document.xml", _body_location)
+    for kind in ("header", "footer"):
+        for part_name in _numbered_parts(part_names, kind):
+            number = _PART_NUMBER.search(part_name).group(1)
+            yield from _iter_part(
+                docx_archive, part_name, _container_location(f"{kind.title()} {number}"))
+    notes = (
+        ("word/footnotes.xml", W + "footnote", "Footnote"),
+        ("word/endnotes.xml", W + "endnote", "Endnote"),
+        ("word/comments.xml", W + "comment", "Comment"),
     )
+    for part_name, tag, label in notes:
+        if part_name in part_names:
+            yield from _iter_part(docx_archive, part_name, _note_location(tag, label))
+
+def _numbered_parts(part_names, kind):
+    """Return word/header1.xml, word/header2.xml... in numeric order."""
+    pattern = re.compile(rf"word/{kind}\d+\.xml$")
+    return sorted(
+        (name for name in part_names if pattern.match(name)),
+        key=lambda name: int(_PART_NUMBER.search(name).group(1)),
+    )
+
+def _iter_part(docx_archive, part_name, location_of):
+    """Stream-parse one XML part, yielding ((context, location), text) per paragraph.
+
+    ``location_of(state, element_stack)`` locates the paragraph being closed.
+    """
+    state = _PartState()
+    element_stack = []
+    # Depth inside mc:Fallback, which repeats text boxes for older readers
+    fallback_depth = 0
+    with docx_archive.open(part_name) as part:
+        for event, element in iterparse(part, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                element_stack.append(element)
+                if tag == MC + "Fallback":
+                    fallback_depth += 1
+                elif not fallback_depth:
+                    parent = element_stack[-2].tag if len(element_stack) > 1 else None
+                    state.start(tag, parent)
+                continue
+
+            element_stack.pop()
+            if tag == MC + "Fallback":
+                fallback_depth -= 1
+            elif fallback_depth:
+                continue
+            elif tag == W + "t":
+                state.add_text(element.text)
+            elif tag == W + "p":
+                text = state.end_paragraph()
+                if text.strip():
+                    yield location_of(state, element_stack), text
+                state.finish_paragraph()
+                element.clear()
+            elif tag == W + "tbl":
+                state.end_table()
+            # Drop finished content so the tree never grows
+            if element_stack and element_stack[-1].tag in _CONTAINER_TAGS:
+                element_stack[-1].clear()
+
+
+class _PartState:
+    """Counters and text buffers tracking where a parser is within a part."""
+
+    def __init__(self):
+        """Start at the first section of an empty part."""
+        self.section = 1
+        self.section_ended = False
+        self.paragraph = 0
+        self.table = 0
+        # One [row, cell] per open (possibly nested) table
+        self.tables = []
+        # One list of text pieces per open paragraph (text boxes nest them)
+        self.paragraphs = []
+
+    def start(self, tag, parent):
+        """Track the start of an element."""
+        if tag == W + "p":
+            self.paragraphs.append([])
+        elif tag in _NOTE_TAGS:
+            # Number paragraphs and tables from 1 in every note / comment
+            self.paragraph = self.table = 0
+        elif tag == W + "tbl":
+            if not self.tables:
+                self.table += 1
+            self.tables.append([0, 0])
+        elif tag == W + "tr" and self.tables:
+            self.tables[-1] = [self.tables[-1][0] + 1, 0]
+        elif tag == W + "tc" and self.tables:
+            self.tables[-1][1] += 1
+        elif tag in _WHITESPACE_TAGS and parent == W + "r" and self.paragraphs:
+            self.paragraphs[-1].append(_WHITESPACE_TAGS[tag])
+        elif tag == W + "sectPr" and self.paragraphs:
+            # A section break is stored in the last paragraph of its section
+            self.section_ended = True
+
+    def add_text(self, text):
+        """Add the content of a w:t element to the open paragraph."""
+        if text and self.paragraphs:
+            self.paragraphs[-1].append(text)
+
+    def end_paragraph(self):
+        """Close the open paragraph and return its text."""
+        text = "".join(self.paragraphs.pop()) if self.paragraphs else ""
+        if not self.tables and not self.paragraphs:
+            self.paragraph += 1
+        return text
+
+    def finish_paragraph(self):
+        """Move on to the next section once the paragraph holding a break is done."""
+        if self.section_ended and not self.paragraphs:
+            self.section += 1
+            self.section_ended = False
+
+    def end_table(self):
+        """Close the innermost open table."""
+        if self.tables:
+            self.tables.pop()
+
+    def location(self):
+        """Describe the open table cell or the last paragraph outside tables."""
+        if not self.tables:
+            # A text box is part of the paragraph still open around it
+            location = f"Paragraph {self.paragraph + bool(self.paragraphs)}"
+        else:
+            location = f"Table {self.table}" + "".join(
+                f"{', Nested table,' if depth else ','} Row {row}, Cell {cell}"
+                for depth, (row, cell) in enumerate(self.tables)
+            )
+        return f"{location}, Text box" if self.paragraphs else location
+
+
+def _body_location(state, element_stack):
+    """Locate a body paragraph by section and paragraph / table cell."""
+    del element_stack
+    return f"Section {state.section},", state.location()
+
+def _container_location(label):
+    """Locate paragraphs of a header or footer part."""
+    def location_of(state, element_stack):
+        del element_stack
+        return f"{label},", state.location()
+    return location_of
+
+def _note_location(tag, label):
+    """Locate paragraphs of footnotes, endnotes or comments by their id / author."""
+    def location_of(state, element_stack):
+        note = next((element for element in element_stack if element.tag == tag), None)
+        if note is None:
+            return f"{label},", state.location()
+        context = f"{label} {note.get(W + 'id', '')}".rstrip()
+        author = note.get(W + "author")
+        if author:
+            context = f"{context} by {author}"
+        return f"{context},", state.location()
+    return location_of
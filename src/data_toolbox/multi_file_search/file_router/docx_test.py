@@ -1,18 +1,38 @@
+import io
+import zipfile
 from unittest.mock import MagicMock, patch
 from data_toolbox.multi_file_search.file_router.docx import search_docx
 
 # Base path for mocking functions called in router
 base_path = "data_toolbox.multi_file_search.file_router.docx"
 
-@patch(f"{base_path}.docx2txt.process")
-def test_search_docx_exception_handling(mock_process_file):
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+W_NAMESPACE = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def make_docx(parts):
+    """Build an in-memory DOCX from {part name: XML body} (namespace added)."""
+    docx_file = io.BytesIO()
+    with zipfile.ZipFile(docx_file, "w") as docx_archive:
+        for part_name, (root, content) in parts.items():
+            docx_archive.writestr(part_name, f"<w:{root} {W_NAMESPACE}>{content}</w:{root}>")
+    docx_file.name = "test_file.docx"
+    return docx_file
+
+def paragraph(text, section_break=False):
+    section = "<w:pPr><w:sectPr/></w:pPr>" if section_break else ""
+    return f"<w:p>{section}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+@patch(f"{base_path}.zipfile.ZipFile")
+def test_search_docx_exception_handling(mock_zip_file):
     # Arrange
     file = MagicMock()
     file.name = "test_file.docx"
     search_terms = []
     search_options = {}
     # Act
-    mock_process_file.side_effect = Exception("Error reading file")
+    mock_zip_file.side_effect = Exception("Error reading file")
     result = search_docx(file, search_terms, search_options)
     # Assert
     expected_result = [{
@@ -21,22 +41,34 @@ def test_search_docx_exception_handling(mock_process_file):
     }]
     assert result == expected_result
 
-@patch(f"{base_path}.docx2txt.process")
-@patch(f"{base_path}.document_search")
-def test_search_docx_calls_document_search(mock_document_search, mock_process):
+def test_search_docx_reports_structural_locations():
     # Arrange
-    file = MagicMock()
-    file.name = "test_file.docx"
-    search_terms = ['term1', 'term2']
-    search_options = {"aardvark":"llama"}
-    mock_process.return_value  = "Mock document contents for test."
+    table = (
+        "<w:tbl><w:tr><w:tc>" + paragraph("no") + "</w:tc></w:tr>"
+        "<w:tr><w:tc>" + paragraph("no") + "</w:tc><w:tc>" + paragraph("cell waldo") +
+        "</w:tc></w:tr></w:tbl>"
+    )
+    body = (
+        paragraph("first waldo") + paragraph("ends section", section_break=True) + table +
+        "<w:p><w:r><w:t>split</w:t><w:tab/><w:t>wal</w:t></w:r><w:r><w:t>do</w:t></w:r></w:p>"
+    )
+    file = make_docx({
+        "word/document.xml": ("document", f"<w:body>{body}<w:sectPr/></w:body>"),
+        "word/header1.xml": ("hdr", paragraph("header waldo")),
+        "word/footnotes.xml": (
+            "footnotes", '<w:footnote w:id="1">' + paragraph("note waldo") + "</w:footnote>"),
+        "word/comments.xml": (
+            "comments",
+            '<w:comment w:id="0" w:author="Ann">' + paragraph("comment waldo") + "</w:comment>"),
+    })
     # Act
-    search_docx(file, search_terms, search_options)
+    result = search_docx(file, ["waldo"], search_options)
     # Assert
-    mock_document_search.assert_called_with(
-        file_name="test_file.docx",
-        line_list=["Mock document contents for test."],
-        search_terms=search_terms,
-        search_options=search_options,
-        location_context="",
-    )
+    assert [(r["location"], r["original_content"]) for r in result] == [
+        ("Section 1, Paragraph 1", "first waldo"),
+        ("Section 2, Table 1, Row 2, Cell 2", "cell waldo"),
+        ("Section 2, Paragraph 3", "split\twaldo"),
+        ("Header 1, Paragraph 1", "header waldo"),
+        ("Footnote 1, Paragraph 1", "note waldo"),
+        ("Comment 0 by Ann, Paragraph 1", "comment waldo"),
+    ]
@@ -0,0 +1,82 @@
+"""EML File Handler.
+
+Messages are parsed with the standard library's feed parser, fed a chunk at a
+time. Headers, the names of attachments and the text of every text/plain and
+text/html part are searched; results are located by header name or by body
+part and line ("Part 2 (text/plain), Line 14").
+"""
+from email import policy
+from email.parser import BytesFeedParser
+
+from data_toolbox.multi_file_search.file_router.html import iter_html_blocks
+from data_toolbox.multi_file_search.utils.utils import (
+    STREAM_CHUNK_SIZE,
+    stream_record_search,
+)
+
+# Header lines / body lines per worker task
+LINES_PER_TASK = 5_000
+
+
+def search_eml(file, search_terms, search_options):
+    """Search EML for Search Terms.
+
+    Args:
+    ----
+        file (file): an EML file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by header or body part
+
+    """
+    try:
+        file.seek(0)
+        parser = BytesFeedParser(policy=policy.default)
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+        message = parser.close()
+        return stream_record_search(
+            file_name=file.name,
+            records=iter_message_text(message),
+            search_terms=search_terms,
+            search_options=search_options,
+            records_per_task=LINES_PER_TASK,
+        )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def iter_message_text(message):
+    """Yield ((location_context, location), text) per header and line of body text."""
+    for name, value in message.items():
+        yield ("Header", name), str(value)
+    parts = (part for part in message.walk() if not part.is_multipart())
+    for part_number, part in enumerate(parts, start=1):
+        content_type = part.get_content_type()
+        part_context = f"Part {part_number} ({content_type}),"
+        file_name = part.get_filename()
+        if file_name:
+            yield (part_context, "Attachment name"), file_name
+        if part.get_content_maintype() != "text":
+            continue
+        text = part_text(part)
+        if content_type == "text/html":
+            for (context, location), block in iter_html_blocks([text]):
+                yield (f"{part_context} {context}".rstrip(), location), block
+            continue
+        for line_number, line in enumerate(text.split("\n"), start=1):
+            if line.strip():
+                yield (part_context, f"Line {line_number}"), line.rstrip("\r")
+
+def part_text(part):
+    """Decode a text part, falling back to UTF-8 when its charset is unknown."""
+    try:
+        return part.get_content()
+    except LookupError:
+        payload = part.get_payload(decode=True) or b""
+        return payload.decode("utf-8", errors="replace")
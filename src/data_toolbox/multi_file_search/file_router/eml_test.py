@@ -0,0 +1,47 @@
+import io
+from email.message import EmailMessage
+from unittest.mock import MagicMock, patch
+from data_toolbox.multi_file_search.file_router.eml import search_eml
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.eml"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+@patch(f"{base_path}.BytesFeedParser")
+def test_search_eml_exception_handling(mock_parser):
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.eml"
+    # Act
+    mock_parser.side_effect = Exception("Error reading file")
+    result = search_eml(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.eml",
+        "location": "Error reading file",
+    }]
+
+def test_search_eml_locates_headers_and_body_parts():
+    # Arrange
+    message = EmailMessage()
+    message["From"] = "ann@example.com"
+    message["To"] = "waldo@example.com"
+    message["Subject"] = "Finding Waldo"
+    message.set_content("Hello,\n\nhave you seen waldo?\n")
+    message.add_alternative("<p>Hello,</p><table><tr><td>waldo</td></tr></table>", subtype="html")
+    message.add_attachment(b"\x00\x01", maintype="application", subtype="octet-stream",
+                           filename="waldo.bin")
+    file = io.BytesIO(message.as_bytes())
+    file.name = "test_file.eml"
+    # Act
+    result = search_eml(file, ["waldo"], search_options)
+    # Assert
+    assert [(row["location"], row["original_content"]) for row in result] == [
+        ("Header To", "waldo@example.com"),
+        ("Header Subject", "Finding Waldo"),
+        ("Part 1 (text/plain), Line 3", "have you seen waldo?"),
+        ("Part 2 (text/html), Table 1, Row 1, Cell 1", "waldo"),
+        ("Part 3 (application/octet-stream), Attachment name", "waldo.bin"),
+    ]
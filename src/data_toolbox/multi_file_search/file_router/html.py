@@ -0,0 +1,156 @@
+"""HTML File Handler.
+
+Pages are decoded and fed to the standard library's HTMLParser a chunk at a
+time. Text is collected into blocks (paragraphs, headings, list items, table
+cells...) that are searched as soon as they are complete, so neither the markup
+nor the text of the whole page is ever held in memory. Scripts and styles are
+not searched.
+"""
+import codecs
+from html.parser import HTMLParser
+
+from data_toolbox.multi_file_search.utils.utils import (
+    STREAM_CHUNK_SIZE,
+    detect_encoding,
+    stream_record_search,
+)
+
+# Blocks per worker task
+BLOCKS_PER_TASK = 2_000
+
+# Tags whose start and end separate blocks of text
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "details", "dialog",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "legend", "li", "main", "nav", "ol", "p",
+    "pre", "section", "summary", "title", "ul",
+}
+# Tags whose content is not text
+SKIPPED_TAGS = {"script", "style", "template"}
+
+
+def search_html(file, search_terms, search_options):
+    """Search HTML for Search Terms.
+
+    Args:
+    ----
+        file (file): an HTML file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by paragraph or table cell
+
+    """
+    try:
+        encoding = detect_encoding(file) or "utf-8"
+        return stream_record_search(
+            file_name=file.name,
+            records=iter_html_blocks(iter_decoded_chunks(file, encoding)),
+            search_terms=search_terms,
+            search_options=search_options,
+            records_per_task=BLOCKS_PER_TASK,
+        )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def iter_decoded_chunks(file, encoding, chunk_size=STREAM_CHUNK_SIZE):
+    """Decode a binary file incrementally, yielding chunks of text."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while raw := file.read(chunk_size):
+        yield decoder.decode(raw)
+    yield decoder.decode(b"", final=True)
+
+def iter_html_blocks(chunks):
+    """Yield ((location_context, location), text) per non-empty block of HTML.
+
+    Args:
+    ----
+        chunks (iterable): the page's markup, as pieces of text
+
+    """
+    parser = _BlockParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.records
+        parser.records.clear()
+    parser.close()
+    yield from parser.records
+
+
+class _BlockParser(HTMLParser):
+    """Collect the text of HTML blocks into records as the markup is fed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = []
+        self.text = []
+        self.paragraph_number = 0
+        self.table_count = 0
+        # One [table number, row, cell] per open (possibly nested) table
+        self.tables = []
+        self.skip_depth = 0
+        self.pre_depth = 0
+
+    def handle_starttag(self, tag, attrs):  # noqa: ARG002
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "br":
+            self.text.append("\n")
+        elif tag == "table":
+            self.flush()
+            self.table_count += 1
+            self.tables.append([self.table_count, 0, 0])
+        elif tag == "tr" and self.tables:
+            self.flush()
+            self.tables[-1][1] += 1
+            self.tables[-1][2] = 0
+        elif tag in {"td", "th"} and self.tables:
+            self.flush()
+            self.tables[-1][2] += 1
+        elif tag in BLOCK_TAGS:
+            self.flush()
+            if tag == "pre":
+                self.pre_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag == "table" and self.tables:
+            self.flush()
+            self.tables.pop()
+        elif tag in BLOCK_TAGS or tag in {"tr", "td", "th"}:
+            self.flush()
+            if tag == "pre":
+                self.pre_depth = max(self.pre_depth - 1, 0)
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        # Outside <pre> line breaks in the markup are only spaces
+        self.text.append(data if self.pre_depth else data.replace("\n", " "))
+
+    def close(self):
+        super().close()
+        self.flush()
+
+    def flush(self):
+        """End the current block, recording it if it holds any text."""
+        text = "".join(self.text)
+        self.text = []
+        if not self.pre_depth:
+            text = "\n".join(" ".join(line.split()) for line in text.split("\n"))
+        text = text.strip()
+        if not text:
+            return
+        if self.tables:
+            table_number, row, cell = self.tables[-1]
+            location = (f"Table {table_number},", f"Row {row}, Cell {cell}")
+        else:
+            self.paragraph_number += 1
+            location = ("", f"Paragraph {self.paragraph_number}")
+        self.records.append((location, text))
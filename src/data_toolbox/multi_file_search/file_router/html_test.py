@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+from data_toolbox.multi_file_search.file_router.html import iter_html_blocks, search_html
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.html"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+@patch(f"{base_path}.detect_encoding")
+def test_search_html_exception_handling(mock_detect_encoding):
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.html"
+    # Act
+    mock_detect_encoding.side_effect = Exception("Error reading file")
+    result = search_html(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.html",
+        "location": "Error reading file",
+    }]
+
+def test_iter_html_blocks_splits_markup_fed_in_pieces():
+    # Arrange
+    page = (
+        "<html><head><title>Report</title><style>p {color: red}</style></head><body>"
+        "<h1>Quarterly\n   results</h1><script>var waldo = 1;</script>"
+        "<p>First line<br>second &amp; last</p>"
+        "<table><tr><th>Name</th><th>Notes</th></tr>"
+        "<tr><td>Ann</td><td><p>one</p><p>two</p></td></tr></table>"
+        "<pre>  keep\n  spacing</pre>"
+        "</body></html>"
+    )
+    # Act, feeding the page a few characters at a time
+    blocks = list(iter_html_blocks(page[i:i + 7] for i in range(0, len(page), 7)))
+    # Assert
+    assert blocks == [
+        (("", "Paragraph 1"), "Report"),
+        (("", "Paragraph 2"), "Quarterly results"),
+        (("", "Paragraph 3"), "First line\nsecond & last"),
+        (("Table 1,", "Row 1, Cell 1"), "Name"),
+        (("Table 1,", "Row 1, Cell 2"), "Notes"),
+        (("Table 1,", "Row 2, Cell 1"), "Ann"),
+        (("Table 1,", "Row 2, Cell 2"), "one"),
+        (("Table 1,", "Row 2, Cell 2"), "two"),
+        (("", "Paragraph 4"), "keep\n  spacing"),
+    ]
+
+def test_search_html_does_not_search_scripts(tmp_path):
+    # Arrange
+    path = tmp_path / "page.html"
+    path.write_text("<p>Where's Waldo?</p><script>findWaldo()</script>", encoding="utf-8")
+    # Act
+    with path.open("rb") as file:
+        result = search_html(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": str(path),
+        "location": " Paragraph 1",
+        "search_terms": "waldo",
+        "original_content": "Where's Waldo?",
+    }]
@@ -0,0 +1,156 @@
+"""JSON / JSON Lines File Handler.
+
+JSON documents are read with ijson's incremental parser, so dumps far larger
+than memory can be searched: each key and scalar value is searched on its own
+and located by its path ("$.users[3].name"). JSON Lines files are read line by
+line and each line is parsed on its own.
+"""
+import json
+
+import ijson
+
+from data_toolbox.multi_file_search.utils.utils import (
+    detect_encoding,
+    iter_decoded_lines,
+    stream_record_search,
+)
+
+# Keys / values per worker task
+VALUES_PER_TASK = 5_000
+
+_SCALAR_EVENTS = {"null", "boolean", "integer", "double", "number", "string"}
+
+
+def search_json(file, search_terms, search_options):
+    """Search JSON for Search Terms.
+
+    Args:
+    ----
+        file (file): a JSON file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by the path of the key or value
+
+    """
+    try:
+        file.seek(0)
+        return stream_record_search(
+            file_name=file.name,
+            records=iter_json_values(file),
+            search_terms=search_terms,
+            search_options=search_options,
+            records_per_task=VALUES_PER_TASK,
+        )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def search_jsonl(file, search_terms, search_options):
+    """Search JSON Lines for Search Terms.
+
+    Lines that are not valid JSON are searched as text.
+
+    Args:
+    ----
+        file (file): a JSONL / NDJSON file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by line and path
+
+    """
+    try:
+        encoding = detect_encoding(file) or "utf-8"
+        return stream_record_search(
+            file_name=file.name,
+            records=iter_jsonl_values(iter_decoded_lines(file, encoding)),
+            search_terms=search_terms,
+            search_options=search_options,
+            records_per_task=VALUES_PER_TASK,
+        )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def iter_json_values(file):
+    """Yield ((kind, path), text) per key and scalar value of a JSON document.
+
+    kind is "Key" or "Path" (for values).
+    """
+    # One [is_array, key or index] per open object / array
+    stack = []
+    for _, event, value in ijson.parse(file):
+        if event == "map_key":
+            stack[-1][1] = value
+            yield ("Key", json_path(stack)), value
+            continue
+        if event in {"end_map", "end_array"}:
+            stack.pop()
+            continue
+        # A value (scalar or container) is the next item of an enclosing array
+        if stack and stack[-1][0]:
+            stack[-1][1] += 1
+        if event == "start_map":
+            stack.append([False, None])
+        elif event == "start_array":
+            stack.append([True, -1])
+        elif event in _SCALAR_EVENTS:
+            yield ("Path", json_path(stack)), scalar_text(value)
+
+def iter_jsonl_values(lines):
+    """Yield ((kind, path), text) per key and scalar value of each JSON Lines line."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            document = json.loads(line)
+        except ValueError:
+            yield (f"Line {line_number},", "Invalid JSON"), line
+            continue
+        for (kind, path), text in iter_object_values(document, []):
+            yield (f"Line {line_number}, {kind}", path), text
+
+def iter_object_values(document, stack):
+    """Yield ((kind, path), text) per key and scalar value of a parsed document."""
+    if isinstance(document, dict):
+        stack.append([False, None])
+        for key, value in document.items():
+            stack[-1][1] = key
+            yield ("Key", json_path(stack)), key
+            yield from iter_object_values(value, stack)
+        stack.pop()
+    elif isinstance(document, list):
+        stack.append([True, 0])
+        for index, value in enumerate(document):
+            stack[-1][1] = index
+            yield from iter_object_values(value, stack)
+        stack.pop()
+    else:
+        yield ("Path", json_path(stack)), scalar_text(document)
+
+def json_path(stack):
+    """Format a path stack as a JSONPath ("$.users[3].name", '$["first name"]')."""
+    path = ["$"]
+    for is_array, key in stack:
+        if is_array:
+            path.append(f"[{key}]")
+        elif key.isidentifier():
+            path.append(f".{key}")
+        else:
+            path.append(f"[{json.dumps(key, ensure_ascii=False)}]")
+    return "".join(path)
+
+def scalar_text(value):
+    """Return a scalar as it is written in JSON (null, true, 1.50)."""
+    if value is None or isinstance(value, bool):
+        return json.dumps(value)
+    return str(value)
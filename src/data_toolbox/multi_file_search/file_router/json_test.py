@@ -0,0 +1,72 @@
+import io
+from unittest.mock import MagicMock, patch
+from data_toolbox.multi_file_search.file_router.json import search_json, search_jsonl
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.json"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+def make_file(content, name):
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+@patch(f"{base_path}.ijson.parse")
+def test_search_json_exception_handling(mock_parse):
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.json"
+    # Act
+    mock_parse.side_effect = Exception("Error reading file")
+    result = search_json(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.json",
+        "location": "Error reading file",
+    }]
+
+def test_search_json_locates_keys_and_values_by_path():
+    # Arrange
+    file = make_file(
+        b'{"users": [{"name": "ann"}, {"name": "waldo", "tags": [[1], ["waldo"]]}],'
+        b' "waldo key": null, "found": true, "price": 1.50}',
+        "test_file.json",
+    )
+    # Act
+    result = search_json(file, ["waldo", "true", "1.50"], search_options)
+    # Assert
+    assert [(row["location"], row["original_content"]) for row in result] == [
+        ("Path $.users[1].name", "waldo"),
+        ("Path $.users[1].tags[1][0]", "waldo"),
+        ('Key $["waldo key"]', "waldo key"),
+        ("Path $.found", "true"),
+        ("Path $.price", "1.50"),
+    ]
+
+def test_search_json_reports_invalid_documents():
+    # Arrange
+    file = make_file(b'{"name": "waldo", ', "test_file.json")
+    # Act
+    result = search_json(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": "test_file.json",
+        "location": "Error reading file",
+    }]
+
+def test_search_jsonl_locates_values_by_line_and_path():
+    # Arrange
+    file = make_file(
+        b'{"name": "ann"}\n\n{"name": "waldo", "waldo": 1}\nnot json, waldo\n',
+        "test_file.jsonl",
+    )
+    # Act
+    result = search_jsonl(file, ["waldo"], search_options)
+    # Assert
+    assert [(row["location"], row["original_content"]) for row in result] == [
+        ("Line 3, Path $.name", "waldo"),
+        ("Line 3, Key $.waldo", "waldo"),
+        ("Line 4, Invalid JSON", "not json, waldo"),
+    ]
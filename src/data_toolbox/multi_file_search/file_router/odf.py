@@ -0,0 +1,171 @@
+"""OpenDocument (ODT / ODS) File Handler.
+
+Documents are searched straight from their content.xml part, which is
+stream-parsed with iterparse like DOCX files: paragraphs and cells are handed
+to the worker pool as soon as they are complete and their XML is discarded.
+"""
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from data_toolbox.multi_file_search.utils.utils import (
+    get_excel_column_letter,
+    stream_record_search,
+)
+
+TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+
+# Paragraphs / cells per worker task
+RECORDS_PER_TASK = 2_000
+
+_PARAGRAPH_TAGS = {TEXT + "p", TEXT + "h"}
+_CELL_TAGS = {TABLE + "table-cell", TABLE + "covered-table-cell"}
+
+
+def search_odt(file, search_terms, search_options):
+    """Search ODT for Search Terms.
+
+    Paragraphs, headings, table cells and notes are searched one at a time.
+
+    Args:
+    ----
+        file (file): an ODT file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results
+
+    """
+    return _search_content(file, search_terms, search_options, iter_odt_paragraphs)
+
+def search_ods(file, search_terms, search_options):
+    """Search ODS for Search Terms.
+
+    Cells are located like XLSX cells, by sheet name and A1 reference.
+
+    Args:
+    ----
+        file (file): an ODS file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results
+
+    """
+    return _search_content(file, search_terms, search_options, iter_ods_cells)
+
+def _search_content(file, search_terms, search_options, iter_records):
+    """Stream records out of an OpenDocument's content.xml and search them."""
+    try:
+        file.seek(0)
+        with zipfile.ZipFile(file) as odf_archive, odf_archive.open("content.xml") as content:
+            return stream_record_search(
+                file_name=file.name,
+                records=iter_records(content),
+                search_terms=search_terms,
+                search_options=search_options,
+                records_per_task=RECORDS_PER_TASK,
+            )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def iter_odt_paragraphs(content):
+    """Yield ((location_context, location), text) per non-empty ODT paragraph."""
+    paragraph_number = 0
+    # One [table name, row, column] per open (possibly nested) table
+    tables = []
+    note_depth = 0
+    for event, element in iterparse(content, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == TABLE + "table":
+                tables.append([element.get(TABLE + "name", ""), 0, 0])
+            elif tag == TABLE + "table-row" and tables:
+                tables[-1][1] += 1
+                tables[-1][2] = 0
+            elif tag in _CELL_TAGS and tables:
+                tables[-1][2] += 1
+            elif tag == TEXT + "note":
+                note_depth += 1
+            continue
+
+        if tag == TABLE + "table":
+            tables.pop()
+            element.clear()
+        elif tag == TEXT + "note":
+            note_depth -= 1
+        elif tag in _PARAGRAPH_TAGS:
+            text = odf_text(element)
+            if not tables and not note_depth:
+                paragraph_number += 1
+            if text.strip():
+                if tables:
+                    table_name, row, column = tables[-1]
+                    context, location = f"Table {table_name},", f"Row {row}, Cell {column}"
+                else:
+                    # A note ends before the paragraph it is anchored in
+                    context = ""
+                    location = f"Paragraph {paragraph_number + bool(note_depth)}"
+                if note_depth:
+                    context = f"Note, {context}".rstrip()
+                yield (context, location), text
+            if not note_depth:
+                element.clear()
+
+def iter_ods_cells(content):
+    """Yield ((sheet name, A1 reference), text) per non-empty ODS cell."""
+    sheet_name = ""
+    row_number = 0
+    column_number = 0
+    for event, element in iterparse(content, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == TABLE + "table":
+                sheet_name = element.get(TABLE + "name", "")
+                row_number = 0
+            elif tag == TABLE + "table-row":
+                column_number = 0
+            continue
+
+        if tag in _CELL_TAGS:
+            repeat = int(element.get(TABLE + "number-columns-repeated", "1"))
+            text = "\n".join(
+                odf_text(paragraph) for paragraph in element.iter(TEXT + "p"))
+            if not text:
+                text = element.get(OFFICE + "value") or ""
+            if text.strip():
+                # Repeated cells with content are rare, report the first one
+                location = f"{get_excel_column_letter(column_number)}{row_number + 1}"
+                yield (sheet_name, location), text
+            column_number += repeat
+            element.clear()
+        elif tag == TABLE + "table-row":
+            row_number += int(element.get(TABLE + "number-rows-repeated", "1"))
+            element.clear()
+
+def odf_text(element):
+    """Return the text of a paragraph, expanding spaces, tabs and line breaks.
+
+    Notes inside the paragraph are left out, they are searched on their own.
+    """
+    pieces = [element.text or ""]
+    for child in element:
+        tag = child.tag
+        if tag == TEXT + "s":
+            pieces.append(" " * int(child.get(TEXT + "c", "1")))
+        elif tag == TEXT + "tab":
+            pieces.append("\t")
+        elif tag == TEXT + "line-break":
+            pieces.append("\n")
+        elif tag != TEXT + "note":
+            pieces.append(odf_text(child))
+        pieces.append(child.tail or "")
+    return "".join(pieces)
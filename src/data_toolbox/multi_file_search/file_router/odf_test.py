@@ -0,0 +1,97 @@
+import io
+import zipfile
+from unittest.mock import MagicMock, patch
+from data_toolbox.multi_file_search.file_router.odf import search_ods, search_odt
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.odf"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+NAMESPACES = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"'
+)
+
+
+def make_odf(body, name):
+    """Build an in-memory OpenDocument whose content.xml holds body."""
+    odf_file = io.BytesIO()
+    with zipfile.ZipFile(odf_file, "w") as odf_archive:
+        odf_archive.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+        odf_archive.writestr(
+            "content.xml",
+            f"<office:document-content {NAMESPACES}><office:body>{body}</office:body>"
+            "</office:document-content>",
+        )
+    odf_file.name = name
+    return odf_file
+
+@patch(f"{base_path}.zipfile.ZipFile")
+def test_search_odt_exception_handling(mock_zip_file):
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.odt"
+    # Act
+    mock_zip_file.side_effect = Exception("Error reading file")
+    result = search_odt(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.odt",
+        "location": "Error reading file",
+    }]
+
+def test_search_odt_locates_paragraphs_tables_and_notes():
+    # Arrange
+    file = make_odf(
+        "<office:text>"
+        "<text:h>waldo<text:s text:c='2'/>heading</text:h>"
+        "<text:p>no match</text:p>"
+        "<text:p>where is<text:tab/>waldo"
+        "<text:note><text:note-body><text:p>waldo note</text:p></text:note-body></text:note>"
+        "</text:p>"
+        "<table:table table:name='Prices'>"
+        "<table:table-row><table:table-cell><text:p>x</text:p></table:table-cell></table:table-row>"
+        "<table:table-row><table:table-cell/>"
+        "<table:table-cell><text:p>waldo cell</text:p></table:table-cell></table:table-row>"
+        "</table:table>"
+        "</office:text>",
+        "test_file.odt",
+    )
+    # Act
+    result = search_odt(file, ["waldo"], search_options)
+    # Assert
+    assert [(row["location"], row["original_content"]) for row in result] == [
+        (" Paragraph 1", "waldo  heading"),
+        ("Note, Paragraph 3", "waldo note"),
+        (" Paragraph 3", "where is\twaldo"),
+        ("Table Prices, Row 2, Cell 2", "waldo cell"),
+    ]
+
+def test_search_ods_locates_cells_by_sheet_and_reference():
+    # Arrange
+    file = make_odf(
+        "<office:spreadsheet>"
+        "<table:table table:name='Sheet1'>"
+        "<table:table-row table:number-rows-repeated='2'><table:table-cell/></table:table-row>"
+        "<table:table-row>"
+        "<table:table-cell table:number-columns-repeated='3'/>"
+        "<table:table-cell office:value-type='string'><text:p>waldo</text:p></table:table-cell>"
+        "</table:table-row>"
+        "</table:table>"
+        "<table:table table:name='Totals'>"
+        "<table:table-row>"
+        "<table:table-cell office:value-type='float' office:value='42'/>"
+        "</table:table-row>"
+        "</table:table>"
+        "</office:spreadsheet>",
+        "test_file.ods",
+    )
+    # Act
+    result = search_ods(file, ["waldo", "42"], search_options)
+    # Assert
+    assert [(row["location"], row["search_terms"]) for row in result] == [
+        ("Sheet1 D3", "waldo"),
+        ("Totals A1", "42"),
+    ]
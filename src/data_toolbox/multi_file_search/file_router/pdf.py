@@ -1,14 +1,26 @@
 """PDF File Handler."""
-import pypdf
+from contextlib import ExitStack
 
+from data_toolbox.multi_file_search.utils import run_statistics, worker_pool
 from data_toolbox.multi_file_search.utils.utils import (
-    document_search,
+    build_result,
+    local_file_path,
+    match_function,
 )
+from data_toolbox.utils.string_utils.pdf_backends import PdfDocument
+
+# Upper bound on the pages one worker task extracts before reporting back
+MAX_PAGES_PER_TASK = 50
 
 
 def search_pdf(file, search_terms, search_options):
     """Search PDF for Search Terms.
 
+    Pages are split into ranges which are extracted and searched in parallel
+    by the shared worker pool. Each task opens the document once and only
+    returns its hits, so page text is never collected in this process.
+    Text is extracted with PyMuPDF, falling back to pypdf (see PdfDocument).
+
     Args:
     ----
         file (file): a PDF file uploaded through streamlit's UI
@@ -22,27 +34,77 @@ def search_pdf(file, search_terms, search_options):
     """
     results = []
 
-    # Read the file
-    try:
-        pdf_reader = pypdf.PdfReader(file)
-    except Exception:  # noqa: BLE001
-        return [{
-            "file": file.name,
-            "location": "Error reading file",
-        }]
-
-    # Search each page in the PDF
-    for page in range(len(pdf_reader.pages)):
-        # read page content
-        page_content = pdf_reader.pages[page].extract_text()
-        # Create a list from the page content
-        lines = page_content.split("\n")
-        # use generic document search function (treat each page as a document)
-        results.extend(document_search(
-            file_name=file.name,
-            line_list=lines,
-            search_terms=search_terms,
-            search_options=search_options,
-            location_context=f"Page {page + 1},",
-        ))
+    with ExitStack() as stack:
+        # Read the file
+        try:
+            pdf_path = stack.enter_context(local_file_path(file))
+            with PdfDocument(pdf_path) as pdf_document:
+                page_count = pdf_document.page_count
+            run_statistics.count("pages", page_count)
+        except Exception:  # noqa: BLE001
+            return [{
+                "file": file.name,
+                "location": "Error reading file",
+            }]
+
+        # Search ranges of pages in parallel
+        futures = [
+            worker_pool.submit(
+                search_pdf_pages,
+                pdf_path, first_page, last_page, file.name, search_terms, search_options,
+            )
+            for first_page, last_page in page_ranges(page_count)
+        ]
+        try:
+            # Pages are extracted by the workers too, so this is not matching alone
+            with run_statistics.stage("matching"):
+                for future in futures:
+                    results.extend(worker_pool.result(future))
+        except Exception:  # noqa: BLE001
+            return [{
+                "file": file.name,
+                "location": "Error reading file",
+            }]
+    return results
+
+def page_ranges(page_count):
+    """Split page indices into (first, last) ranges, roughly one per worker."""
+    return worker_pool.task_ranges(page_count, MAX_PAGES_PER_TASK)
+
+def search_pdf_pages(pdf_path, first_page, last_page, file_name, search_terms, search_options):
+    """Extract and search pages [first_page, last_page) of a PDF (worker task).
+
+    Each page is searched as soon as it is extracted and then discarded.
+    """
+    results = []
+    with PdfDocument(pdf_path) as pdf_document:
+        for page in range(first_page, last_page):
+            try:
+                page_content = pdf_document.page_text(page)
+            except Exception:  # noqa: BLE001
+                results.append({
+                    "file": file_name,
+                    "location": f"Page {page + 1}, Error reading page",
+                })
+                continue
+            results.extend(_search_page(
+                page_content, page, file_name, search_terms, search_options))
+    return results
+
+def _search_page(page_content, page, file_name, search_terms, search_options):
+    """Search the lines of one page's text."""
+    results = []
+    lines = page_content.split("\n")
+    for line_number, line in enumerate(lines, start=1):
+        matched_terms_in_line = [
+            term for term in search_terms if match_function(line, term, search_options)
+        ]
+        if matched_terms_in_line:
+            results.append(build_result(
+                file_name=file_name,
+                location_context=f"Page {page + 1},",
+                location=f"Line {line_number} of {len(lines)}",
+                search_terms=matched_terms_in_line,
+                original_content=line,
+            ))
     return results
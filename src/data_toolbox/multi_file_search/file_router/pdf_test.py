@@ -1,10 +1,17 @@
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
 from unittest.mock import MagicMock, patch
-from data_toolbox.multi_file_search.file_router.pdf import search_pdf
+from data_toolbox.multi_file_search.file_router.pdf import (
+    MAX_PAGES_PER_TASK,
+    page_ranges,
+    search_pdf,
+)
 
 # Base path for mocking functions called in router
 base_path = "data_toolbox.multi_file_search.file_router.pdf"
 
-@patch(f"{base_path}.pypdf.PdfReader")
+@patch(f"{base_path}.PdfDocument")
 def test_search_pdf_exception_handling(mock_process_file):
     # Arrange
     file = MagicMock()
@@ -20,3 +27,39 @@ def test_search_pdf_exception_handling(mock_process_file):
         "location": "Error reading file"
     }]
     assert result == expected_result
+
+@patch(f"{base_path}.worker_pool.worker_count", return_value=4)
+def test_page_ranges_cover_every_page_once(mock_worker_count):
+    for page_count in (0, 1, 3, 4, 9, 1000):
+        ranges = page_ranges(page_count)
+        pages = [page for first, last in ranges for page in range(first, last)]
+        assert pages == list(range(page_count))
+        assert all(last - first <= MAX_PAGES_PER_TASK for first, last in ranges)
+
+def test_search_pdf_finds_terms_on_pages():
+    # Arrange
+    with Path("data_toolbox/utils/string_utils/test_data/test.pdf").open("rb") as pdf_file:
+        file = BytesIO(pdf_file.read())
+    file.name = "test.pdf"
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    # Act
+    result = search_pdf(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": "test.pdf",
+        "location": "Page 1, Line 2 of 2",
+        "search_terms": "waldo",
+        "original_content": "Waldo Was Here. ",
+    }]
+
+@patch(f"{base_path}.worker_pool.result", side_effect=BrokenProcessPool("worker died"))
+def test_search_pdf_reports_a_broken_worker_pool_as_an_error(mock_result):
+    # Arrange
+    with Path("data_toolbox/utils/string_utils/test_data/test.pdf").open("rb") as pdf_file:
+        file = BytesIO(pdf_file.read())
+    file.name = "test.pdf"
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    # Act
+    result = search_pdf(file, ["waldo"], search_options)
+    # Assert
+    assert result == [{"file": "test.pdf", "location": "Error reading file"}]
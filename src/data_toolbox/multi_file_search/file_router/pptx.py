@@ -1,15 +1,45 @@
-"""PPTX File Handler."""
-from pptx import Presentation
+"""PPTX File Handler.
 
-from data_toolbox.multi_file_search.utils import (
+Slides are read straight from their XML parts with lxml instead of building a
+python-pptx object model. Ranges of slides are searched in parallel by the
+shared worker pool; each task opens the archive once and returns only its hits.
+"""
+import posixpath
+import zipfile
+from contextlib import ExitStack
+
+from lxml import etree
+
+from data_toolbox.multi_file_search.utils import run_statistics, worker_pool
+from data_toolbox.multi_file_search.utils.utils import (
     build_result,
+    local_file_path,
     match_function,
 )
 
+# Upper bound on the slides one worker task searches before reporting back
+MAX_SLIDES_PER_TASK = 50
+
+NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+NOTES_SLIDE_RELATIONSHIP = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+)
+
+_A = "{%s}" % NAMESPACES["a"]  # noqa: UP031
+_P = "{%s}" % NAMESPACES["p"]  # noqa: UP031
+
 
 def search_pptx(file, search_terms, search_options):
     """Search PPTX for Search Terms.
 
+    The text of every shape is searched, including shapes inside groups, the
+    cells of tables and the speaker notes of each slide.
+
     Args:
     ----
         file (file): a PPTX file uploaded through streamlit's UI
@@ -23,39 +53,161 @@ def search_pptx(file, search_terms, search_options):
     """
     results = []
 
-    # Read the file
-    try:
-        ppt_reader = Presentation(file)
-    except Exception:  # noqa: BLE001
-        return [{
-            "file": file.name,
-            "location": "Error reading file",
-        }]
-
-    # Search each slide:
-    for slide_number, slide in enumerate(ppt_reader.slides):
-        slide_content = []
-        # extract text from slide:
-        for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                slide_content.append(shape.text)  # noqa: PERF401 (ignored for readability)
-
-        for line in slide_content:
-            matched_terms_in_line = []
-            # check each search term:
-            for term in search_terms:
-                if match_function(line, term, search_options):
-                    matched_terms_in_line.append(term)  # noqa: PERF401 (ignored for readability)
-            # if one or more search term was found...
-            if len(matched_terms_in_line):
-                # ...add to the results
-                results.append(
-                    build_result(
-                        file_name=file.name,
-                        location=f"Slide {slide_number + 1}",
-                        search_terms=matched_terms_in_line,
-                        original_content=line,
-                        location_context="",
-                    ),
-                )
+    with ExitStack() as stack:
+        # Read the file
+        try:
+            pptx_path = stack.enter_context(local_file_path(file))
+            with zipfile.ZipFile(pptx_path) as pptx_archive:
+                slide_parts = slide_part_names(pptx_archive)
+            run_statistics.count("slides", len(slide_parts))
+        except Exception:  # noqa: BLE001
+            return [{
+                "file": file.name,
+                "location": "Error reading file",
+            }]
+
+        # Search ranges of slides in parallel
+        futures = [
+            worker_pool.submit(
+                search_pptx_slides,
+                pptx_path, first_slide, slide_parts[first_slide:last_slide],
+                file.name, search_terms, search_options,
+            )
+            for first_slide, last_slide in worker_pool.task_ranges(
+                len(slide_parts), MAX_SLIDES_PER_TASK)
+        ]
+        try:
+            # Slides are parsed by the workers too, so this is not matching alone
+            with run_statistics.stage("matching"):
+                for future in futures:
+                    results.extend(worker_pool.result(future))
+        except Exception:  # noqa: BLE001
+            return [{
+                "file": file.name,
+                "location": "Error reading file",
+            }]
+    return results
+
+def slide_part_names(pptx_archive):
+    """Return the part names of the slides in presentation order."""
+    presentation = etree.fromstring(pptx_archive.read("ppt/presentation.xml"))
+    targets = _relationship_targets(pptx_archive, "ppt/presentation.xml")
+    return [
+        targets[slide_id.get(f"{{{NAMESPACES['r']}}}id")]
+        for slide_id in presentation.iterfind("p:sldIdLst/p:sldId", NAMESPACES)
+    ]
+
+def search_pptx_slides(pptx_path, first_slide, slide_parts, file_name, search_terms,
+                       search_options):
+    """Search the given slide parts of a PPTX (worker task).
+
+    ``first_slide`` is the 0-based index of the first part in the presentation.
+    """
+    results = []
+    with zipfile.ZipFile(pptx_path) as pptx_archive:
+        for slide_number, slide_part in enumerate(slide_parts, start=first_slide + 1):
+            try:
+                slide_text = list(iter_slide_text(pptx_archive, slide_part))
+            except Exception:  # noqa: BLE001
+                results.append({
+                    "file": file_name,
+                    "location": f"Slide {slide_number}, Error reading slide",
+                })
+                continue
+            for location, text in slide_text:
+                matched_terms_in_text = [
+                    term for term in search_terms if match_function(text, term, search_options)
+                ]
+                if matched_terms_in_text:
+                    results.append(build_result(
+                        file_name=file_name,
+                        location_context=f"Slide {slide_number},",
+                        location=location,
+                        search_terms=matched_terms_in_text,
+                        original_content=text,
+                    ))
     return results
+
+def iter_slide_text(pptx_archive, slide_part):
+    """Yield (location, text) for the shapes, table cells and notes of a slide."""
+    slide = etree.fromstring(pptx_archive.read(slide_part))
+    for shape_tree in slide.iterfind("p:cSld/p:spTree", NAMESPACES):
+        yield from _iter_shape_tree(shape_tree)
+
+    notes_part = next((
+        target for target, relationship_type
+        in _relationships(pptx_archive, slide_part)
+        if relationship_type == NOTES_SLIDE_RELATIONSHIP
+    ), None)
+    if notes_part is None:
+        return
+    notes = etree.fromstring(pptx_archive.read(notes_part))
+    for shape in notes.iterfind("p:cSld/p:spTree/p:sp", NAMESPACES):
+        if shape.find("p:nvSpPr/p:nvPr/p:ph[@type='body']", NAMESPACES) is not None:
+            text = _text_body_text(shape.find("p:txBody", NAMESPACES))
+            if text.strip():
+                yield "Notes", text
+
+def _iter_shape_tree(shape_tree, group_names=()):
+    """Yield (location, text) for the shapes of a shape tree or group."""
+    for shape in shape_tree:
+        names = (*group_names, _shape_name(shape))
+        if shape.tag == _P + "grpSp":
+            yield from _iter_shape_tree(shape, names)
+        elif shape.tag == _P + "sp":
+            text = _text_body_text(shape.find("p:txBody", NAMESPACES))
+            if text.strip():
+                yield " > ".join(names), text
+        elif shape.tag == _P + "graphicFrame":
+            for row_number, row in enumerate(shape.iterfind(".//a:tbl/a:tr", NAMESPACES), 1):
+                for cell_number, cell in enumerate(row.iterfind("a:tc", NAMESPACES), 1):
+                    text = _text_body_text(cell.find("a:txBody", NAMESPACES))
+                    if text.strip():
+                        location = f"{' > '.join(names)}, Row {row_number}, Cell {cell_number}"
+                        yield location, text
+
+def _shape_name(shape):
+    """Return the name given to a shape in PowerPoint's selection pane."""
+    properties = shape.find("*/p:cNvPr", NAMESPACES)
+    return properties.get("name", "") if properties is not None else ""
+
+def _text_body_text(text_body):
+    """Join the paragraphs of a text body (p:txBody / a:txBody) with newlines."""
+    if text_body is None:
+        return ""
+    paragraphs = []
+    for paragraph in text_body.iterfind("a:p", NAMESPACES):
+        pieces = []
+        for element in paragraph.iter(_A + "t", _A + "br"):
+            pieces.append("\n" if element.tag == _A + "br" else element.text or "")
+        paragraphs.append("".join(pieces))
+    return "\n".join(paragraphs)
+
+def _relationships(pptx_archive, part_name):
+    """Return (target part name, relationship type) for a part's relationships."""
+    directory, file_name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", f"{file_name}.rels")
+    if rels_name not in pptx_archive.NameToInfo:
+        return []
+    relationships = etree.fromstring(pptx_archive.read(rels_name))
+    return [
+        (_resolve_target(directory, relationship.get("Target")), relationship.get("Type"))
+        for relationship in relationships.iterfind("rel:Relationship", NAMESPACES)
+        if relationship.get("TargetMode") != "External"
+    ]
+
+def _relationship_targets(pptx_archive, part_name):
+    """Map relationship ids of a part to the part names they point to."""
+    directory, file_name = posixpath.split(part_name)
+    relationships = etree.fromstring(
+        pptx_archive.read(posixpath.join(directory, "_rels", f"{file_name}.rels")))
+    return {
+        relationship.get("Id"): _resolve_target(directory, relationship.get("Target"))
+        for relationship in relationships.iterfind("rel:Relationship", NAMESPACES)
+    }
+
+def _resolve_target(directory, target):
+    """Resolve a relationship target relative to the directory of its source part."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(directory, target))
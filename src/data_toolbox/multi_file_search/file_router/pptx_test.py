@@ -1,10 +1,15 @@
+import io
 from unittest.mock import MagicMock, patch
+
+from pptx import Presentation
+from pptx.util import Inches
+
 from data_toolbox.multi_file_search.file_router.pptx import search_pptx
 
 # Base path for mocking functions called in router
 base_path = "data_toolbox.multi_file_search.file_router.pptx"
 
-@patch(f"{base_path}.Presentation")
+@patch(f"{base_path}.zipfile.ZipFile")
 def test_search_pptx_exception_handling(mock_process_file):
     # Arrange
     file = MagicMock()
@@ -20,3 +25,29 @@ def test_search_pptx_exception_handling(mock_process_file):
         "location": "Error reading file"
     }]
     assert result == expected_result
+
+def test_search_pptx_searches_groups_tables_and_notes():
+    # Arrange
+    presentation = Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    slide.shapes.title.text = "Title without a match"
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1)).text = "grouped waldo"
+    table = slide.shapes.add_table(2, 2, Inches(1), Inches(3), Inches(4), Inches(1)).table
+    table.cell(1, 0).text = "table waldo"
+    slide.notes_slide.notes_text_frame.text = "notes waldo"
+    second_slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    second_slide.shapes.title.text = "Second\nwaldo"
+    file = io.BytesIO()
+    presentation.save(file)
+    file.name = "test_file.pptx"
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    # Act
+    result = search_pptx(file, ["waldo"], search_options)
+    # Assert
+    assert [(r["location"], r["original_content"]) for r in result] == [
+        ("Slide 1, Group 2 > TextBox 3", "grouped waldo"),
+        ("Slide 1, Table 4, Row 2, Cell 1", "table waldo"),
+        ("Slide 1, Notes", "notes waldo"),
+        ("Slide 2, Title 1", "Second\nwaldo"),
+    ]
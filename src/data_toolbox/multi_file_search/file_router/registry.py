@@ -0,0 +1,228 @@
+"""Handler Registry.
+
+Maps file extensions and MIME types to the functions that search them.
+
+Handlers are registered by the dotted path of their search function, so a
+handler's module (and the parser libraries it imports, e.g. pandas or lxml) is
+only imported the first time a file of its type is searched.
+
+To support a new file type, write a handler module with a
+``search_<type>(file, search_terms, search_options)`` function and register it:
+    register(Handler(
+        name="Rich Text",
+        extensions=("rtf",),
+        mime_types=("application/rtf",),
+        function="data_toolbox.multi_file_search.file_router.rtf:search_rtf",
+    ))
+"""
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+
+from data_toolbox.utils.files import determine_file_extension
+
+ROUTER_PACKAGE = "data_toolbox.multi_file_search.file_router"
+
+
+@dataclass(frozen=True)
+class Handler:
+    """A search function and the file types it handles.
+
+    Attributes
+    ----------
+        name (str): display name of the file type
+        extensions (tuple): lower case extensions, without the dot ("tar.gz")
+        mime_types (tuple): MIME types, e.g. those reported by the browser
+        function (str): "package.module:function" path of the search function
+        supports_streaming (bool): the file is read incrementally rather than
+        loaded whole before searching
+        supports_parallel_pages (bool): parts of one file (pages, slides,
+        chunks of lines, members) are searched in parallel
+
+    """
+
+    name: str
+    extensions: tuple
+    mime_types: tuple
+    function: str
+    supports_streaming: bool = False
+    supports_parallel_pages: bool = False
+
+    def load(self):
+        """Import the handler's module and return its search function."""
+        module_name, function_name = self.function.split(":")
+        return getattr(importlib.import_module(module_name), function_name)
+
+    def search(self, file, search_terms, search_options):
+        """Search a file with the handler's search function."""
+        return self.load()(file, search_terms, search_options)
+
+
+HANDLERS = [
+    Handler(
+        name="CSV",
+        extensions=("csv",),
+        mime_types=("text/csv",),
+        function=f"{ROUTER_PACKAGE}.csv:search_csv",
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Excel 97-2003",
+        extensions=("xls",),
+        mime_types=("application/vnd.ms-excel",),
+        function=f"{ROUTER_PACKAGE}.xls:search_xls",
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Excel",
+        extensions=("xlsx",),
+        mime_types=("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
+        function=f"{ROUTER_PACKAGE}.xlsx:search_xlsx",
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Word",
+        extensions=("docx",),
+        mime_types=("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+        function=f"{ROUTER_PACKAGE}.docx:search_docx",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="PDF",
+        extensions=("pdf",),
+        mime_types=("application/pdf",),
+        function=f"{ROUTER_PACKAGE}.pdf:search_pdf",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="PowerPoint",
+        extensions=("pptx",),
+        mime_types=(
+            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        ),
+        function=f"{ROUTER_PACKAGE}.pptx:search_pptx",
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Text",
+        extensions=("txt", "log"),
+        mime_types=("text/plain",),
+        function=f"{ROUTER_PACKAGE}.txt:search_txt",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="OpenDocument Text",
+        extensions=("odt",),
+        mime_types=("application/vnd.oasis.opendocument.text",),
+        function=f"{ROUTER_PACKAGE}.odf:search_odt",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="OpenDocument Spreadsheet",
+        extensions=("ods",),
+        mime_types=("application/vnd.oasis.opendocument.spreadsheet",),
+        function=f"{ROUTER_PACKAGE}.odf:search_ods",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="HTML",
+        extensions=("html", "htm"),
+        mime_types=("text/html", "application/xhtml+xml"),
+        function=f"{ROUTER_PACKAGE}.html:search_html",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="JSON",
+        extensions=("json",),
+        mime_types=("application/json",),
+        function=f"{ROUTER_PACKAGE}.json:search_json",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="JSON Lines",
+        extensions=("jsonl", "ndjson"),
+        mime_types=("application/jsonl", "application/x-ndjson", "application/x-jsonlines"),
+        function=f"{ROUTER_PACKAGE}.json:search_jsonl",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="XML",
+        extensions=("xml",),
+        mime_types=("application/xml", "text/xml"),
+        function=f"{ROUTER_PACKAGE}.xml:search_xml",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Email",
+        extensions=("eml",),
+        mime_types=("message/rfc822",),
+        function=f"{ROUTER_PACKAGE}.eml:search_eml",
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Compressed Text",
+        extensions=("gz", "bz2", "xz"),
+        mime_types=("application/gzip", "application/x-gzip", "application/x-bzip2",
+                    "application/x-xz"),
+        function=f"{ROUTER_PACKAGE}.compressed:search_compressed",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+    Handler(
+        name="Archive",
+        extensions=("zip", "tar", "tar.gz", "tgz"),
+        mime_types=(
+            "application/zip",
+            "application/x-zip-compressed",
+            "application/x-tar",
+            "application/x-gtar",
+            "application/x-compressed-tar",
+        ),
+        function=f"{ROUTER_PACKAGE}.archive:search_archive",
+        supports_streaming=True,
+        supports_parallel_pages=True,
+    ),
+]
+
+
+def register(handler: Handler) -> None:
+    """Add a handler, taking precedence over earlier handlers for the same types."""
+    HANDLERS.insert(0, handler)
+
+def handler_for_extension(extension: str) -> Handler | None:
+    """Return the handler for a lower case extension ("pdf", "tar.gz")."""
+    return next((handler for handler in HANDLERS if extension in handler.extensions), None)
+
+def handler_for_mime_type(mime_type: str) -> Handler | None:
+    """Return the handler for a MIME type ("application/pdf")."""
+    mime_type = (mime_type or "").split(";")[0].strip().lower()
+    return next((handler for handler in HANDLERS if mime_type in handler.mime_types), None)
+
+def handler_for_file(file) -> Handler | None:
+    """Return the handler for a file, by its extension or else its MIME type."""
+    handler = handler_for_extension(determine_file_extension(file.name.lower()))
+    mime_type = getattr(file, "type", None)
+    if handler is None and isinstance(mime_type, str):
+        handler = handler_for_mime_type(mime_type)
+    return handler
+
+def supported_extensions() -> set:
+    """Return every extension a handler is registered for."""
+    return {extension for handler in HANDLERS for extension in handler.extensions}
+
+def uploader_types() -> list:
+    """Return the extensions for st.file_uploader's ``type`` argument.
+
+    Streamlit only compares the last suffix, so "tar.gz" is accepted as "gz".
+    """
+    return sorted({extension.split(".")[-1] for extension in supported_extensions()})
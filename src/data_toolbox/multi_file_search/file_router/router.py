@@ -1,22 +1,32 @@
 """File Router."""
-from data_toolbox.multi_file_search.file_router import (
-    search_csv,
-    search_docx,
-    search_pdf,
-    search_pptx,
-    search_txt,
-    search_xls,
-    search_xlsx,
+from data_toolbox.multi_file_search.file_router.registry import (
+    handler_for_extension,
+    handler_for_file,
 )
+from data_toolbox.multi_file_search.file_router.sniff import (
+    TEXT_EXTENSIONS,
+    is_consistent,
+    mismatch_result,
+    sniff_file_type,
+)
+from data_toolbox.multi_file_search.utils import run_statistics
+from data_toolbox.utils.files import determine_file_extension
 
 
 def get_extension(file) -> str:
-    """Return a file's extension."""
-    return file.name.split(".")[-1].lower()
+    """Return a file's extension ("tar.gz" for gzip compressed tar files)."""
+    return determine_file_extension(file.name.lower())
 
 def router(file, search_terms, search_options):
     """Router for files.
 
+    The handler is looked up in the handler registry (see registry.py) by the
+    file's extension, or its MIME type when the extension is unknown. When the
+    file's content shows it is of another type (see sniff.py), it is searched
+    as that type instead and a result recording the mismatch is added. The
+    compressed file and archive handlers also tell gzip / bzip2 / xz and ZIP /
+    tar apart by content, so they do not go back to the misleading name.
+
     Args:
     ----
         file (file): a file uploaded through streamlit's UI
@@ -25,22 +35,21 @@ def router(file, search_terms, search_options):
 
     Returns:
     -------
-        list: search results
+        list: search results, empty for file types without a handler
 
     """
-    match get_extension(file):
-        case "csv":
-            search_results = search_csv(file, search_terms, search_options)
-        case "xls":
-            search_results = search_xls(file, search_terms, search_options)
-        case "xlsx":
-            search_results = search_xlsx(file, search_terms, search_options)
-        case "docx":
-            search_results = search_docx(file, search_terms, search_options)
-        case "pdf":
-            search_results = search_pdf(file, search_terms, search_options)
-        case "pptx":
-            search_results = search_pptx(file, search_terms, search_options)
-        case "txt":
-            search_results = search_txt(file, search_terms, search_options)
-    return search_results
+    results = []
+    handler = handler_for_file(file)
+    extension = get_extension(file)
+    with run_statistics.stage("sniff"):
+        file_type = sniff_file_type(file)
+    if not is_consistent(extension, file_type):
+        content_handler = handler_for_extension(file_type)
+        if content_handler is None and file_type in TEXT_EXTENSIONS:
+            content_handler = handler_for_extension("txt")
+        if content_handler is not None:
+            results.append(mismatch_result(file.name, extension, file_type))
+            handler = content_handler
+    if handler is None:
+        return results
+    return results + handler.search(file, search_terms, search_options)
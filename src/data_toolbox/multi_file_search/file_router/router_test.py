@@ -1,14 +1,23 @@
+import bz2
+import gzip
+import io
+import tarfile
 from unittest.mock import patch
+
+import pytest
+
+from data_toolbox.multi_file_search.file_router.registry import uploader_types
 from data_toolbox.multi_file_search.file_router.router import router
 
-# Base path for mocking functions called in router
-base_path = "data_toolbox.multi_file_search.file_router.router"
+# Base path for mocking the handlers called by the router
+base_path = "data_toolbox.multi_file_search.file_router"
 
 class mock_file:
-    def __init__(self, name):
+    def __init__(self, name, type=None):
         self.name = name
+        self.type = type
 
-@patch(f'{base_path}.search_csv')
+@patch(f'{base_path}.csv.search_csv')
 def test_router_csv_called(mock_search_csv):
     file = mock_file("test.csv")
     search_terms = ['term1', 'term2']
@@ -16,7 +25,7 @@ def test_router_csv_called(mock_search_csv):
     router(file, search_terms, search_options)
     mock_search_csv.assert_called_once()
 
-@patch(f'{base_path}.search_xls')
+@patch(f'{base_path}.xls.search_xls')
 def test_router_xls_called(mock_search_xls):
     file = mock_file("test.xls")
     search_terms = ['term1', 'term2']
@@ -24,7 +33,7 @@ def test_router_xls_called(mock_search_xls):
     router(file, search_terms, search_options)
     mock_search_xls.assert_called_once()
 
-@patch(f'{base_path}.search_xlsx')
+@patch(f'{base_path}.xlsx.search_xlsx')
 def test_router_xlsx_called(mock_search_xlsx):
     file = mock_file("test.xlsx")
     search_terms = ['term1', 'term2']
@@ -32,7 +41,7 @@ def test_router_xlsx_called(mock_search_xlsx):
     router(file, search_terms, search_options)
     mock_search_xlsx.assert_called_once()
 
-@patch(f'{base_path}.search_docx')
+@patch(f'{base_path}.docx.search_docx')
 def test_router_docx_called(mock_search_docx):
     file = mock_file("test.docx")
     search_terms = ['term1', 'term2']
@@ -40,7 +49,7 @@ def test_router_docx_called(mock_search_docx):
     router(file, search_terms, search_options)
     mock_search_docx.assert_called_once()
 
-@patch(f'{base_path}.search_pdf')
+@patch(f'{base_path}.pdf.search_pdf')
 def test_router_pdf_called(mock_search_pdf):
     file = mock_file("test.pdf")
     search_terms = ['term1', 'term2']
@@ -48,7 +57,7 @@ def test_router_pdf_called(mock_search_pdf):
     router(file, search_terms, search_options)
     mock_search_pdf.assert_called_once()
 
-@patch(f'{base_path}.search_pptx')
+@patch(f'{base_path}.pptx.search_pptx')
 def test_router_pptx_called(mock_search_pptx):
     file = mock_file("test.pptx")
     search_terms = ['term1', 'term2']
@@ -56,10 +65,112 @@ def test_router_pptx_called(mock_search_pptx):
     router(file, search_terms, search_options)
     mock_search_pptx.assert_called_once()
 
-@patch(f'{base_path}.search_txt')
+@patch(f'{base_path}.txt.search_txt')
 def test_router_txt_called(mock_search_txt):
     file = mock_file("test.txt")
     search_terms = ['term1', 'term2']
     search_options = {'case_sensitive': True}
     router(file, search_terms, search_options)
     mock_search_txt.assert_called_once()
+
+@patch(f'{base_path}.archive.search_archive')
+def test_router_tar_gz_called(mock_search_archive):
+    file = mock_file("test.tar.gz")
+    search_terms = ['term1', 'term2']
+    search_options = {'case_sensitive': True}
+    router(file, search_terms, search_options)
+    mock_search_archive.assert_called_once()
+
+@patch(f'{base_path}.txt.search_txt')
+def test_router_log_called(mock_search_txt):
+    file = mock_file("app.log")
+    search_terms = ['term1', 'term2']
+    search_options = {'case_sensitive': True}
+    router(file, search_terms, search_options)
+    mock_search_txt.assert_called_once()
+
+@patch(f'{base_path}.compressed.search_compressed')
+def test_router_gz_called(mock_search_compressed):
+    file = mock_file("app.log.2.gz")
+    search_terms = ['term1', 'term2']
+    search_options = {'case_sensitive': True}
+    router(file, search_terms, search_options)
+    mock_search_compressed.assert_called_once()
+
+def test_router_unsupported_extension_returns_no_results():
+    file = mock_file("test.png")
+    search_terms = ['term1', 'term2']
+    search_options = {'case_sensitive': True}
+    assert router(file, search_terms, search_options) == []
+
+@patch(f'{base_path}.pdf.search_pdf')
+def test_router_uses_mime_type_without_extension(mock_search_pdf):
+    file = mock_file("download", type="application/pdf")
+    search_terms = ['term1', 'term2']
+    search_options = {'case_sensitive': True}
+    router(file, search_terms, search_options)
+    mock_search_pdf.assert_called_once()
+
+def test_uploader_types_come_from_registry():
+    assert uploader_types() == [
+        "bz2", "csv", "docx", "eml", "gz", "htm", "html", "json", "jsonl", "log", "ndjson",
+        "ods", "odt", "pdf", "pptx", "tar", "tgz", "txt", "xls", "xlsx", "xml", "xz", "zip",
+    ]
+
+def test_router_searches_mislabelled_files_by_content():
+    file = io.BytesIO(b"<html><body><table><tr><td>waldo</td></tr></table></body></html>")
+    file.name = "report.xls"
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    result = router(file, ["waldo"], search_options)
+    assert result == [
+        {
+            "file": "report.xls",
+            "location": "Named .xls but the content is HTML, searched as HTML",
+        },
+        {
+            "file": "report.xls",
+            "location": "Table 1, Row 1, Cell 1",
+            "search_terms": "waldo",
+            "original_content": "waldo",
+        },
+    ]
+
+def test_router_searches_text_mentioning_a_pdf_header_as_text():
+    file = io.BytesIO(b"fixed parsing of %PDF-1.7 headers\nneedle here\n")
+    file.name = "notes.txt"
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    result = router(file, ["needle"], search_options)
+    assert result == [{
+        "file": "notes.txt",
+        "location": " Line 2 of 3",
+        "search_terms": "needle",
+        "original_content": "needle here",
+    }]
+
+def make_tar(content):
+    """Build an uncompressed tar holding one app.txt member."""
+    tar_file = io.BytesIO()
+    with tarfile.open(fileobj=tar_file, mode="w") as tar_archive:
+        info = tarfile.TarInfo("app.txt")
+        info.size = len(content)
+        tar_archive.addfile(info, io.BytesIO(content))
+    return tar_file.getvalue()
+
+@pytest.mark.parametrize(("content", "name", "mismatch", "location"), [
+    (gzip.compress(b"start\nwaldo\n"), "app.log",
+     "Named .log but the content is GZ, searched as GZ", " Line 2 of 3"),
+    (bz2.compress(b"start\nwaldo\n"), "app.log.gz",
+     "Named .gz but the content is BZ2, searched as BZ2", " Line 2 of 3"),
+    (make_tar(b"waldo"), "bundle.zip",
+     "Named .zip but the content is TAR, searched as TAR", " Line 1 of 1"),
+])
+def test_router_searches_mislabelled_compressed_files_and_archives(
+        content, name, mismatch, location):
+    file = io.BytesIO(content)
+    file.name = name
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    result = router(file, ["waldo"], search_options)
+    assert [(r["file"], r["location"]) for r in result] == [
+        (name, mismatch),
+        (f"{name}/app.txt" if name == "bundle.zip" else name, location),
+    ]
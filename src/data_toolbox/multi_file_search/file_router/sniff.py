@@ -0,0 +1,182 @@
+"""Content Sniffing.
+
+Identify a file's real type from its first few KB, so that mislabelled files
+(an exported ".xls" report that is really HTML or CSV, a PDF saved as ".txt")
+are routed to the right handler before any expensive parse.
+
+Types are named by the extension of the handler that should search them.
+"""
+import csv
+import zipfile
+
+# Bytes read from the start of a file to identify it
+SNIFF_SIZE = 8192
+
+PDF_SIGNATURE = b"%PDF-"
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+GZIP_SIGNATURE = b"\x1f\x8b"
+BZIP2_SIGNATURE = b"BZh"
+XZ_SIGNATURE = b"\xfd7zXZ\x00"
+TAR_SIGNATURE = b"ustar"
+TAR_SIGNATURE_OFFSET = 257
+BOMS = (
+    (b"\xef\xbb\xbf", "utf-8"),
+    (b"\xff\xfe\x00\x00", "utf-32-le"),
+    (b"\x00\x00\xfe\xff", "utf-32-be"),
+    (b"\xff\xfe", "utf-16-le"),
+    (b"\xfe\xff", "utf-16-be"),
+)
+
+# Part names identifying the Office Open XML type of a ZIP file
+OOXML_PARTS = {
+    "word/document.xml": "docx",
+    "ppt/presentation.xml": "pptx",
+    "xl/workbook.xml": "xlsx",
+}
+MAX_MIME_TYPE_SIZE = 128
+# Content of the "mimetype" member identifying the type of an OpenDocument file
+ODF_MIME_TYPES = {
+    b"application/vnd.oasis.opendocument.text": "odt",
+    b"application/vnd.oasis.opendocument.spreadsheet": "ods",
+}
+
+# Extensions holding text, any of which may be searched by a text handler
+TEXT_EXTENSIONS = {
+    "txt", "csv", "log", "html", "htm", "xml", "json", "jsonl", "ndjson", "eml",
+}
+
+# Sniffed type -> extensions that are consistent with it
+COMPATIBLE_EXTENSIONS = {
+    "pdf": {"pdf"},
+    "docx": {"docx"},
+    "pptx": {"pptx"},
+    "xlsx": {"xlsx"},
+    "odt": {"odt"},
+    "ods": {"ods"},
+    "zip": {"zip"},
+    # OLE2 holds legacy Office files, and encrypted Office Open XML files
+    "xls": {"xls", "doc", "ppt", "msg", "docx", "pptx", "xlsx"},
+    "gz": {"gz", "tar.gz", "tgz"},
+    "bz2": {"bz2"},
+    "xz": {"xz"},
+    "tar": {"tar"},
+    "html": TEXT_EXTENSIONS,
+    "xml": TEXT_EXTENSIONS,
+    "csv": TEXT_EXTENSIONS,
+    "txt": TEXT_EXTENSIONS,
+}
+
+# Share of control characters above which content is treated as binary
+MAX_CONTROL_CHARACTER_SHARE = 0.01
+
+
+def sniff_file_type(file):
+    """Identify a file's type from its content.
+
+    Args:
+    ----
+        file (file): a seekable binary file, rewound afterwards
+
+    Returns:
+    -------
+        str | None: the extension of the type ("pdf", "docx", "csv"...), or
+        None when the content is empty, unreadable or not recognised
+
+    """
+    try:
+        file.seek(0)
+        sample = file.read(SNIFF_SIZE)
+        if not isinstance(sample, bytes) or not sample:
+            return None
+        if sample.startswith(ZIP_SIGNATURES):
+            return _sniff_zip(file)
+        return _sniff_sample(sample)
+    except Exception:  # noqa: BLE001
+        return None
+    finally:
+        try:
+            file.seek(0)
+        except Exception:  # noqa: BLE001, S110
+            pass
+
+def is_consistent(extension, file_type):
+    """Check if a file's extension agrees with its sniffed type."""
+    return file_type is None or extension in COMPATIBLE_EXTENSIONS.get(file_type, {file_type})
+
+def mismatch_result(file_name, extension, file_type):
+    """Build the result recording that a file was searched by its content's type."""
+    return {
+        "file": file_name,
+        "location": (
+            f"Named .{extension} but the content is {file_type.upper()}, "
+            f"searched as {file_type.upper()}"
+        ),
+    }
+
+def _sniff_sample(sample):
+    """Identify a type from the first bytes of a (non-ZIP) file."""
+    # Readers accept a PDF header anywhere in the first 1KB; in text only at the start
+    position = sample.find(PDF_SIGNATURE, 0, 1024)
+    if position != -1 and (not sample[:position].strip() or _decode_text(sample) is None):
+        return "pdf"
+    if sample.startswith(OLE2_SIGNATURE):
+        return "xls"
+    if sample.startswith(GZIP_SIGNATURE):
+        return "gz"
+    if sample.startswith(BZIP2_SIGNATURE) and sample[3:4].isdigit():
+        return "bz2"
+    if sample.startswith(XZ_SIGNATURE):
+        return "xz"
+    tar_signature_end = TAR_SIGNATURE_OFFSET + len(TAR_SIGNATURE)
+    if sample[TAR_SIGNATURE_OFFSET:tar_signature_end] == TAR_SIGNATURE:
+        return "tar"
+    text = _decode_text(sample)
+    if text is None:
+        return None
+    return _sniff_text(text)
+
+def _sniff_zip(file):
+    """Identify a ZIP file as an Office Open XML / OpenDocument file or a plain archive."""
+    file.seek(0)
+    with zipfile.ZipFile(file) as zip_file:
+        names = set(zip_file.namelist())
+        if "mimetype" in names:
+            with zip_file.open("mimetype") as mime_type_file:
+                mime_type = mime_type_file.read(MAX_MIME_TYPE_SIZE).strip()
+            if mime_type in ODF_MIME_TYPES:
+                return ODF_MIME_TYPES[mime_type]
+    return next((file_type for part, file_type in OOXML_PARTS.items() if part in names), "zip")
+
+def _decode_text(sample):
+    """Decode a sample that looks like text, or return None for binary content."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return sample[len(bom):].decode(encoding, errors="ignore")
+    if b"\x00" in sample:
+        return None
+    # The sample may end part way through a multi-byte character
+    text = sample.decode("utf-8", errors="ignore")
+    control_characters = sum(
+        1 for char in text if ord(char) < 32 and char not in "\t\n\r\f\v\x1b")  # noqa: PLR2004
+    if control_characters > MAX_CONTROL_CHARACTER_SHARE * max(len(text), 1):
+        return None
+    return text
+
+def _sniff_text(text):
+    """Tell HTML, XML and CSV apart from other text."""
+    start = text.lstrip()[:1024].lower()
+    if start.startswith(("<!doctype html", "<html")) or "<table" in start:
+        return "html"
+    if start.startswith("<?xml"):
+        return "xml"
+    # The last line may be cut off, CSV needs two complete rows with the same columns
+    rows = text.splitlines()[:21][:-1]
+    if len(rows) < 2:  # noqa: PLR2004
+        return "txt"
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(rows), delimiters=",;\t|")
+    except csv.Error:
+        return "txt"
+    columns = {len(row) for row in csv.reader(rows, dialect)}
+    return "csv" if len(columns) == 1 and columns.pop() > 1 else "txt"
@@ -0,0 +1,83 @@
+import io
+import zipfile
+
+import pytest
+
+from data_toolbox.multi_file_search.file_router.sniff import is_consistent, sniff_file_type
+
+
+def make_zip(part_names):
+    zip_file = io.BytesIO()
+    with zipfile.ZipFile(zip_file, "w") as zip_archive:
+        for part_name in part_names:
+            zip_archive.writestr(part_name, "<xml/>")
+    return zip_file
+
+@pytest.mark.parametrize(("content", "expected_type"), [
+    (b"%PDF-1.7\n...", "pdf"),
+    (b"\r\n %PDF-1.4\n...", "pdf"),
+    (b"\x00\x01junk%PDF-1.4\n%\xe2\xe3\xcf\xd3\n", "pdf"),
+    (b"fixed parsing of %PDF-1.7 headers\nneedle here\n", "txt"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(504), "xls"),
+    (b"\x1f\x8b\x08\x00", "gz"),
+    (b"BZh91AY&SY", "bz2"),
+    (b"\xfd7zXZ\x00\x00", "xz"),
+    (bytes(257) + b"ustar\x0000", "tar"),
+    (b"<!DOCTYPE html><html><body><table>", "html"),
+    (b"  <html><body>", "html"),
+    (b"<?xml version='1.0'?><root/>", "xml"),
+    (b"name,age\nann,3\nbob,4\n", "csv"),
+    (b"\xef\xbb\xbfname;age\nann;3\nbob;4\n", "csv"),
+    ("plain text, nothing else\nsecond line".encode("utf-16"), "txt"),
+    (b"caf\xe9 au lait\n", "txt"),
+    (b"\x00\x01\x02\x03binary", None),
+    (b"", None),
+])
+def test_sniff_file_type(content, expected_type):
+    # Act
+    file_type = sniff_file_type(io.BytesIO(content))
+    # Assert
+    assert file_type == expected_type
+
+@pytest.mark.parametrize(("part_names", "expected_type"), [
+    (["[Content_Types].xml", "word/document.xml"], "docx"),
+    (["[Content_Types].xml", "ppt/presentation.xml"], "pptx"),
+    (["[Content_Types].xml", "xl/workbook.xml"], "xlsx"),
+    (["notes.txt"], "zip"),
+])
+def test_sniff_file_type_looks_inside_zip_files(part_names, expected_type):
+    # Arrange
+    file = make_zip(part_names)
+    # Act
+    file_type = sniff_file_type(file)
+    # Assert
+    assert file_type == expected_type
+    assert file.tell() == 0
+
+@pytest.mark.parametrize(("mime_type", "expected_type"), [
+    (b"application/vnd.oasis.opendocument.text", "odt"),
+    (b"application/vnd.oasis.opendocument.spreadsheet", "ods"),
+    (b"application/vnd.oasis.opendocument.presentation", "zip"),
+])
+def test_sniff_file_type_reads_opendocument_mime_type(mime_type, expected_type):
+    # Arrange
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, "w") as zip_archive:
+        zip_archive.writestr("mimetype", mime_type)
+        zip_archive.writestr("content.xml", "<xml/>")
+    # Act
+    file_type = sniff_file_type(file)
+    # Assert
+    assert file_type == expected_type
+
+@pytest.mark.parametrize(("extension", "file_type", "expected"), [
+    ("xls", "html", False),
+    ("txt", "pdf", False),
+    ("csv", "txt", True),
+    ("txt", "csv", True),
+    ("docx", "xls", True),
+    ("tar.gz", "gz", True),
+    ("pdf", None, True),
+])
+def test_is_consistent(extension, file_type, expected):
+    assert is_consistent(extension, file_type) == expected
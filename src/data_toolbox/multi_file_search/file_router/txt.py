@@ -1,8 +1,11 @@
 """TXT File Handler."""
 
 from data_toolbox.multi_file_search.utils import (
+    byte_document_search,
     detect_encoding,
-    document_search,
+    iter_decoded_lines,
+    stream_document_search,
+    supports_byte_search,
 )
 
 
@@ -23,22 +26,28 @@ def search_txt(file, search_terms, search_options):
     try:
         # Determine the file encoding:
         encoding = detect_encoding(file)
-        # Read the file:
-        txt_reader = file.getvalue().decode(encoding)
-        # Create a list from the document content:
-        line_list = txt_reader.split("\n")
+        # ASCII / UTF-8 files are searched on their raw bytes:
+        if supports_byte_search(encoding, search_terms, search_options):
+            return byte_document_search(
+                file_name=file.name,
+                file=file,
+                encoding=encoding,
+                search_terms=search_terms,
+                search_options=search_options,
+                location_context="",
+            )
+        # Otherwise decode and search the file line by line as it is read:
+        return stream_document_search(
+            file_name=file.name,
+            lines=iter_decoded_lines(file, encoding),
+            search_terms=search_terms,
+            search_options=search_options,
+            location_context="",
+        )
     except Exception:  # noqa: BLE001
         return [{
             "file": file.name,
             "location": "Error reading file",
         }]
 
-    return document_search(
-        file_name=file.name,
-        line_list=line_list,
-        search_terms=search_terms,
-        search_options=search_options,
-        location_context="",
-    )
-
 
@@ -1,3 +1,4 @@
+from io import BytesIO
 from unittest.mock import MagicMock, patch
 from data_toolbox.multi_file_search.file_router.txt import search_txt
 
@@ -19,3 +20,15 @@ def test_search_txt_exception_handling():
         "location": "Error reading file"
     }]
     assert result == expected_result
+
+def test_search_txt_streams_lines():
+    # Arrange
+    file = BytesIO("alpha\nbeta gamma\r\ngamma\n".encode("utf-8"))
+    file.name = "test_file.txt"
+    search_terms = ["gamma"]
+    search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+    # Act
+    result = search_txt(file, search_terms, search_options)
+    # Assert
+    assert [r["location"] for r in result] == [" Line 2 of 4", " Line 3 of 4"]
+    assert result[0]["original_content"] == "beta gamma\r"
@@ -0,0 +1,100 @@
+"""XML File Handler.
+
+Documents are stream-parsed with lxml's iterparse. The text and attributes of
+each element are searched on their own and located by an XPath with an index
+on every step ("/catalog[1]/book[3]/title[1]", ".../book[3]/@id"). Finished
+elements are removed from the tree as parsing goes on, so memory use depends on
+how deeply the document nests rather than on its size.
+"""
+from lxml import etree
+
+from data_toolbox.multi_file_search.utils.utils import stream_record_search
+
+# Elements / attributes per worker task
+NODES_PER_TASK = 5_000
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def search_xml(file, search_terms, search_options):
+    """Search XML for Search Terms.
+
+    Args:
+    ----
+        file (file): an XML file uploaded through streamlit's UI
+        search_terms (list): Keywords to search the file for
+        search_options (dictionary): configuration for search
+
+    Returns:
+    -------
+        list: search results, located by XPath
+
+    """
+    try:
+        file.seek(0)
+        return stream_record_search(
+            file_name=file.name,
+            records=iter_xml_nodes(file),
+            search_terms=search_terms,
+            search_options=search_options,
+            records_per_task=NODES_PER_TASK,
+        )
+    except Exception:  # noqa: BLE001
+        return [{
+            "file": file.name,
+            "location": "Error reading file",
+        }]
+
+def iter_xml_nodes(file):
+    """Yield (("XPath", path), text) per element text and attribute value.
+
+    An element's text includes the text between its children (mixed content),
+    but not the text of the children themselves.
+    """
+    # One [path, {child name: count}, [text between children]] per open element
+    stack = []
+    context = etree.iterparse(
+        file, events=("start", "end"), resolve_entities=False, no_network=True)
+    for event, element in context:
+        if event == "start":
+            previous = element.getprevious()
+            if previous is not None:
+                # Keep the text after finished siblings, then drop them
+                parent = element.getparent()
+                while parent[0] is not element:
+                    stack[-1][2].append(parent[0].tail or "")
+                    del parent[0]
+            name = element_name(element)
+            if stack:
+                counts = stack[-1][1]
+                counts[name] = counts.get(name, 0) + 1
+                path = f"{stack[-1][0]}/{name}[{counts[name]}]"
+            else:
+                path = f"/{name}[1]"
+            stack.append([path, {}, []])
+            for attribute, value in element.attrib.items():
+                if value.strip():
+                    yield ("XPath", f"{path}/@{attribute_name(attribute, element)}"), value
+            continue
+
+        path, _, texts = stack.pop()
+        text = "".join([element.text or "", *texts, *(child.tail or "" for child in element)])
+        if text.strip():
+            yield ("XPath", path), text.strip()
+        element.clear(keep_tail=True)
+
+def element_name(element):
+    """Return an element's name with its namespace prefix, if any ("dc:title")."""
+    local_name = element.tag.rpartition("}")[2]
+    return f"{element.prefix}:{local_name}" if element.prefix else local_name
+
+def attribute_name(attribute, element):
+    """Return an attribute's name with its namespace prefix, if any ("xml:lang")."""
+    if not attribute.startswith("{"):
+        return attribute
+    namespace, _, local_name = attribute[1:].partition("}")
+    if namespace == XML_NAMESPACE:
+        return f"xml:{local_name}"
+    prefix = next(
+        (prefix for prefix, uri in element.nsmap.items() if prefix and uri == namespace), None)
+    return f"{prefix}:{local_name}" if prefix else local_name
@@ -0,0 +1,71 @@
+import io
+from unittest.mock import MagicMock, patch
+from data_toolbox.multi_file_search.file_router.xml import iter_xml_nodes, search_xml
+
+# Base path for mocking functions called in router
+base_path = "data_toolbox.multi_file_search.file_router.xml"
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+def make_file(content, name="test_file.xml"):
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+@patch(f"{base_path}.etree.iterparse")
+def test_search_xml_exception_handling(mock_iterparse):
+    # Arrange
+    file = MagicMock()
+    file.name = "test_file.xml"
+    # Act
+    mock_iterparse.side_effect = Exception("Error reading file")
+    result = search_xml(file, [], {})
+    # Assert
+    assert result == [{
+        "file": "test_file.xml",
+        "location": "Error reading file",
+    }]
+
+def test_search_xml_locates_text_and_attributes_by_xpath():
+    # Arrange
+    file = make_file(
+        b"<?xml version='1.0'?>"
+        b"<catalog xmlns:dc='http://purl.org/dc/elements/1.1/'>"
+        b"<book id='1'><dc:title>Ann</dc:title></book>"
+        b"<!-- waldo in a comment -->"
+        b"<book id='waldo'><dc:title>Where is Waldo</dc:title><note>see <b>also</b> waldo</note></book>"
+        b"</catalog>"
+    )
+    # Act
+    result = search_xml(file, ["waldo"], search_options)
+    # Assert
+    assert [(row["location"], row["original_content"]) for row in result] == [
+        ("XPath /catalog[1]/book[2]/@id", "waldo"),
+        ("XPath /catalog[1]/book[2]/dc:title[1]", "Where is Waldo"),
+        ("XPath /catalog[1]/book[2]/note[1]", "see  waldo"),
+    ]
+
+def test_iter_xml_nodes_drops_finished_elements():
+    # Arrange
+    items = b"".join(b"<item>%d</item>" % number for number in range(1000))
+    file = make_file(b"<root>" + items + b"</root>")
+    nodes = iter_xml_nodes(file)
+    # Act
+    for (_, path), _ in nodes:
+        if path == "/root[1]/item[1000]":
+            break
+    # Assert: only the element just parsed is still in the tree
+    root = nodes.gi_frame.f_locals["element"].getparent()
+    assert len(root) == 1
+
+def test_search_xml_does_not_expand_external_entities(tmp_path):
+    # Arrange
+    secret = tmp_path / "secret.txt"
+    secret.write_text("waldo")
+    file = make_file(
+        b'<!DOCTYPE r [<!ENTITY e SYSTEM "' + secret.as_uri().encode() + b'">]><r>&e;</r>')
+    # Act
+    result = search_xml(file, ["waldo"], search_options)
+    # Assert
+    assert all("waldo" not in row.get("original_content", "") for row in result)
@@ -1,69 +1,201 @@
 """..."""
+import logging
 import time
-import concurrent.futures
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 from data_toolbox import components
+from data_toolbox.utils import streamlit_analytics
+from data_toolbox.utils.files import human_readable_size_of
 
-from .file_router.router import router
+from .engine import SearchEngine, SearchSpec
+from .service.client import SearchServiceClient, SearchServiceError, service_url
 from .user_interface.basic_search import basic_search
 from .user_interface.components import step_component
 from .user_interface.regex_search import regex_search
 from .user_interface.search_term_file import search_term_file_search
+from .utils import metrics, worker_pool
+from .utils.profiling import SearchProfile
+from .utils.run_statistics import RunStatistics
 from .utils.utils import data_frame_to_excel
 
+log = logging.getLogger("Toolbox")
 
-def search(files, search_terms, search_mode):
-    start_time = time.time()
+# Query parameter holding the search service job of a search whose results
+# have not been shown yet
+JOB_QUERY_PARAMETER = "search_job"
+
+
+def search(files, search_terms, search_mode, profile=None):
     """Search Interface with Threading Support.
 
     Core Functionality for the application.
-    Calls logic that processes and searches the uploaded files using threading.
+    Calls logic that processes and searches the uploaded files using threading,
+    or hands the search to the search service when MFS_SEARCH_SERVICE_URL is set.
+    Profiled searches always run in this process.
 
     Args:
     ----
-        files (list): User uploaded files
+        files (list | ServerPathSearch): User uploaded files, or a directory on the server
         search_terms (list): User entered or uploaded search terms (or regex patterns)
         search_mode (dictionary): Configurations for search
+        profile (SearchProfile): profile the search into this profile (admins only)
 
     """
-    results = []
     progress_bar = st.progress(0, text=None)
-    
-    # Using ThreadPoolExecutor to handle threading with max 50 workers
-    with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-        # Submit all files for processing
-        futures = [executor.submit(router, file, search_terms, search_mode) for file in files]
-        
-        # Process results as they complete
-        count = 0
-        for future in concurrent.futures.as_completed(futures):
-            search_results = future.result()
-            if search_results:
-                results.extend(search_results)
-            count += 1
-            progress_bar.progress(count / len(files))
-    
-    # Display Search Results
-    results_df = pd.DataFrame(results)
+    spec = SearchSpec.from_options(search_terms, search_mode)
+    on_progress = lambda count, total: progress_bar.progress(count / total)  # noqa: E731
+    try:
+        if service_url() and profile is None:
+            client = SearchServiceClient(service_url(), user=session_user())
+            job_id = client.submit(files, spec)
+            # Kept in the URL until the results are shown, so reloading the page
+            # picks the search up again
+            st.query_params[JOB_QUERY_PARAMETER] = job_id
+            results = [
+                result.to_dict() for result in client.iter_results(job_id, on_progress=on_progress)]
+            statistics = RunStatistics.from_dict(client.status(job_id)["statistics"] or {})
+            del st.query_params[JOB_QUERY_PARAMETER]
+        else:
+            job = SearchEngine().submit(files, spec, on_progress=on_progress, profile=profile)
+            results = [result.to_dict() for result in job]
+            statistics = job.statistics
+    except (PermissionError, SearchServiceError) as e:
+        progress_bar.empty()
+        st.error(str(e))
+        return
+
+    display_results(results, statistics)
+    if profile is not None:
+        display_profile(profile)
+
+    time.sleep(1)  # give the user the satisfaction of seeing a completed progress bar
+    progress_bar.empty()  # clear the progress bar
+
+
+def resume_search(job_id):
+    """Show the results of a search service job started before the page was reloaded."""
+    client = SearchServiceClient(service_url(), user=session_user())
+    with st.spinner("Collecting the results of your last search..."):
+        try:
+            results = [result.to_dict() for result in client.iter_results(job_id)]
+            statistics = RunStatistics.from_dict(client.status(job_id)["statistics"] or {})
+        except SearchServiceError as e:
+            st.error(f"Could not collect the results of your last search ({e})")
+            del st.query_params[JOB_QUERY_PARAMETER]
+            return
+    # Shown once: later reruns of the page must not fetch the job again
+    del st.query_params[JOB_QUERY_PARAMETER]
+    display_results(results, statistics)
+
+
+def display_results(results, statistics):
+    """Show search results with a button to download them as an XLSX workbook.
+
+    The time taken to build the results table and the workbook is added to the
+    run statistics, which are shown below the results.
+    """
+    with statistics.stage("results_table"):
+        results_df = pd.DataFrame(results)
     st.write(results_df)
     step_component("5. Download Search Results")
-    
+
     # Create an excel file using the data frame
-    output_xlsx_file = data_frame_to_excel(results_df)
-    
+    with statistics.stage("excel_export"):
+        output_xlsx_file = data_frame_to_excel(results_df)
+    log.info("Multi-File Search results table %.3fs, Excel export %.3fs",
+             statistics.stages["results_table"], statistics.stages["excel_export"])
+    for stage in ("results_table", "excel_export"):
+        metrics.record_stage(stage, statistics.stages[stage])
+
     # Display Download Button
     st.download_button(
         label=":floppy_disk: Download Results",
         data=output_xlsx_file,
         type="primary",
         file_name="Multi_File_Search_Results.xlsx")
-    
-    print("--- %s seconds ---" % (time.time() - start_time))
-    
-    time.sleep(1)  # give the user the satisfaction of seeing a completed progress bar
-    progress_bar.empty()  # clear the progress bar
+
+    display_run_statistics(statistics)
+    streamlit_analytics.track_search_memory(statistics.summary()["memory"])
+
+
+def display_run_statistics(statistics):
+    """Show where the time of a search went, per stage and per file."""
+    with st.expander("Run statistics"):
+        summary = statistics.summary()
+        columns = st.columns(4)
+        columns[0].metric("Files", summary["files"])
+        columns[1].metric("Searched", human_readable_size_of(summary["bytes"]))
+        columns[2].metric("Search time", f"{summary['seconds']:.2f} s")
+        columns[3].metric(
+            "Throughput", f"{human_readable_size_of(summary['bytes_per_second'])}/s")
+        if summary["counts"]:
+            st.caption(", ".join(
+                f"{amount:,} {unit}" for unit, amount in summary["counts"].items()))
+        memory = summary["memory"]
+        if memory:
+            columns = st.columns(4)
+            columns[0].metric(
+                "Peak memory (app)", human_readable_size_of(memory.get("parent_peak_bytes", 0)),
+                help="Growth of the app process's memory during the search")
+            columns[1].metric(
+                "Peak memory (worker)", human_readable_size_of(memory.get("worker_peak_bytes", 0)),
+                help="Highest resident memory of a worker process running a task of the search")
+            columns[2].metric(
+                "Memory budget",
+                human_readable_size_of(memory["budget_bytes"]) if memory.get("budget_bytes")
+                else "None")
+            columns[3].metric(
+                "Files slowed / streamed",
+                f"{memory.get('throttled_files', 0)} / {memory.get('streamed_files', 0)}",
+                help="Files that waited for memory, and files searched on a streaming path, "
+                     "because the search was over its memory budget")
+        st.write("Stages (file stages are summed over files searched at the same time)")
+        st.dataframe(pd.DataFrame(
+            [{"stage": name, "seconds": seconds} for name, seconds in summary["stages"].items()]
+            + [{"stage": f"file: {name}", "seconds": seconds}
+               for name, seconds in summary["file_stages"].items()]))
+        st.write("Files, slowest first")
+        st.dataframe(pd.DataFrame([
+            {
+                "file": file.name,
+                "type": file.file_type,
+                "bytes": file.bytes,
+                "seconds": round(file.seconds, 3),
+                **{f"{name} (s)": round(seconds, 3) for name, seconds in file.stages.items()},
+                **file.counts,
+                "results": file.results,
+                "error": file.error,
+                "peak memory (app)": file.memory.get("parent_peak_bytes"),
+                "peak memory (worker)": file.memory.get("worker_peak_bytes"),
+                "streamed": bool(file.memory.get("streamed")),
+            }
+            for file in sorted(statistics.files, key=lambda file: file.seconds, reverse=True)
+        ]))
+
+
+def display_profile(profile):
+    """Offer a search profile for download, with its most expensive functions."""
+    with st.expander("Search profile"):
+        columns = st.columns(2)
+        columns[0].download_button(
+            label=":floppy_disk: Download pstats",
+            data=profile.pstats_bytes(),
+            file_name="Multi_File_Search_Profile.pstats",
+            help="Open with python -m pstats, snakeviz or tuna")
+        columns[1].download_button(
+            label=":floppy_disk: Download collapsed stacks",
+            data=profile.collapsed_stacks(),
+            file_name="Multi_File_Search_Profile.collapsed.txt",
+            help="Open with flamegraph.pl, speedscope or inferno")
+        st.code(profile.top_functions() or "Nothing was profiled")
+
+
+def session_user():
+    """Identify the browser session to the search service, for its per-user limit."""
+    context = get_script_run_ctx()
+    return context.session_id if context is not None else "anonymous"
 
 
 # def search(files, search_terms, search_mode):
@@ -113,6 +245,10 @@ def multi_file_search():
 
     The main entrypoint for the multi-file search tool.
     """
+    # Serve the search metrics on MFS_METRICS_PORT, if set (once per process)
+    metrics.start_exporter()
+    # Normally started at boot already (see main.py)
+    worker_pool.start_worker_pool()
     # H E A D E R:
     components.tool_header(
         title="Multi-File Search Version 2",
@@ -150,6 +286,17 @@ def multi_file_search():
             (uploaded_files, search_terms, search_options) = search_term_file_search()
     # Run search:
     step_component("4. Select 'Search'")
+    # Admins (?admin in the URL, like the admin tools) may profile a search
+    profile_search = "admin" in st.query_params and st.toggle(
+        "Profile this search",
+        help="Runs the search under a profiler, worker processes included, "
+             "and offers the profile for download")
+    if not service_url() and not worker_pool.is_ready():
+        st.caption(":hourglass_flowing_sand: Search workers are still starting; "
+                   "a search started now waits for them.")
     if st.button("**Search**", type="primary", key="script_runner"):
-        search(uploaded_files, search_terms, search_options)
+        search(uploaded_files, search_terms, search_options,
+               profile=SearchProfile() if profile_search else None)
+    elif service_url() and JOB_QUERY_PARAMETER in st.query_params:
+        resume_search(st.query_params[JOB_QUERY_PARAMETER])
 
@@ -0,0 +1 @@
+"""Multi-File Search Service: a job queue behind an HTTP API (app.py) and its client."""
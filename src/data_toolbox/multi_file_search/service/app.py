@@ -0,0 +1,159 @@
+"""Multi-File Search Service.
+
+A local HTTP service running searches for the Streamlit page (and any other
+client), so long searches outlive the browser session that started them and
+every app replica shares one warm pool of search workers:
+
+    uvicorn data_toolbox.multi_file_search.service.app:app --host 0.0.0.0 --port 8010
+
+Endpoints:
+    POST   /jobs               submit a search (uploaded files or a server path)
+    GET    /jobs/{id}          status and progress
+    GET    /jobs/{id}/results  results found so far, from ?offset= on
+    DELETE /jobs/{id}          cancel
+    GET    /health             queue counts
+    GET    /ready              200 once the worker pool is warm, 503 before
+    GET    /metrics            search metrics in the Prometheus text format
+
+The submitting user is taken from the X-Toolbox-User header and only limits how
+many of their searches run at once; the service trusts its network, like the
+logging backend.
+"""
+import contextlib
+from typing import Annotated
+
+from fastapi import FastAPI, File, Form, Header, HTTPException, Response, UploadFile
+
+from data_toolbox.multi_file_search.engine import SearchSpec
+from data_toolbox.multi_file_search.service.jobs import (
+    JobNotFoundError,
+    JobQueue,
+    QueueFullError,
+)
+from data_toolbox.multi_file_search.utils import metrics, worker_pool
+from data_toolbox.multi_file_search.utils.server_files import ServerPathSearch, is_allowed
+
+
+def create_app(job_queue=None) -> FastAPI:
+    """Build the service around a job queue (default: one created at startup)."""
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        if app.state.job_queue is None:
+            app.state.job_queue = JobQueue()
+        worker_pool.start_worker_pool()
+        yield
+        app.state.job_queue.close()
+        worker_pool.shutdown_worker_pool()
+
+    app = FastAPI(title="Multi-File Search Service", lifespan=lifespan)
+    app.state.job_queue = job_queue
+
+    @app.post("/jobs", status_code=202)
+    def submit_job(
+        terms: Annotated[list[str], Form()],
+        mode: Annotated[str, Form()] = "regular",
+        case_sensitive: Annotated[bool, Form()] = False,
+        whole_word: Annotated[bool, Form()] = False,
+        files: Annotated[list[UploadFile] | None, File()] = None,
+        server_path: Annotated[str | None, Form()] = None,
+        include: Annotated[list[str] | None, Form()] = None,
+        exclude: Annotated[list[str] | None, Form()] = None,
+        max_file_size: Annotated[int | None, Form()] = None,
+        x_toolbox_user: Annotated[str, Header()] = "anonymous",
+    ):
+        """Queue a search of uploaded files, or of a directory on the server."""
+        try:
+            spec = SearchSpec(
+                terms=tuple(term for term in terms if term.strip()),
+                mode=mode,
+                case_sensitive=case_sensitive,
+                whole_word=whole_word,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        if not spec.terms:
+            raise HTTPException(status_code=422, detail="no search term given")
+
+        if server_path is not None:
+            if not is_allowed(server_path):
+                detail = f"{server_path} is not a directory this server allows searching"
+                raise HTTPException(status_code=403, detail=detail)
+            search_files = ServerPathSearch(
+                path=server_path,
+                include=tuple(include or ("*",)),
+                exclude=tuple(exclude or ()),
+                max_file_size=max_file_size,
+            )
+        elif files:
+            search_files = [(upload.filename, upload.file.read()) for upload in files]
+        else:
+            raise HTTPException(status_code=422, detail="no files or server path given")
+
+        try:
+            job = app.state.job_queue.submit(search_files, spec, user=x_toolbox_user)
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e)) from e
+        return job.summary()
+
+    @app.get("/jobs/{job_id}")
+    def job_status(job_id: str):
+        """Return a job's status and progress."""
+        return _get_job(app, job_id).summary()
+
+    @app.get("/jobs/{job_id}/results")
+    def job_results(job_id: str, offset: int = 0):
+        """Return the results found so far, from offset on, with the job's status.
+
+        The status is read first, so once it says the job has finished the
+        results are complete.
+        """
+        job = _get_job(app, job_id)
+        summary = job.summary()
+        results = app.state.job_queue.results(job_id, offset=max(offset, 0))
+        return {
+            **summary,
+            "results": [result.to_dict() for result in results],
+            "next_offset": max(offset, 0) + len(results),
+        }
+
+    @app.delete("/jobs/{job_id}")
+    def cancel_job(job_id: str):
+        """Cancel a job; results found so far can still be fetched."""
+        try:
+            return app.state.job_queue.cancel(job_id).summary()
+        except JobNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+
+    @app.get("/health")
+    def health():
+        """Return how many jobs are in each state."""
+        return {
+            "status": "ok",
+            "workers_ready": worker_pool.is_ready(),
+            "jobs": app.state.job_queue.counts(),
+        }
+
+    @app.get("/ready")
+    def ready():
+        """Answer 200 once the worker pool is warm, for readiness probes."""
+        if not worker_pool.is_ready():
+            raise HTTPException(status_code=503, detail="search workers are starting")
+        return {"status": "ready"}
+
+    @app.get("/metrics")
+    def search_metrics():
+        """Return the search metrics of this process (see metrics.py)."""
+        content, content_type = metrics.latest()
+        return Response(content=content, media_type=content_type)
+
+    return app
+
+def _get_job(app, job_id):
+    """Return a job, or answer 404."""
+    try:
+        return app.state.job_queue.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+app = create_app()
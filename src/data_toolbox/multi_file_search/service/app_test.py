@@ -0,0 +1,90 @@
+import socket
+import threading
+
+import pytest
+import uvicorn
+
+from data_toolbox.multi_file_search.engine import NamedBytesIO, SearchSpec
+from data_toolbox.multi_file_search.service.app import create_app
+from data_toolbox.multi_file_search.service.client import (
+    SearchServiceClient,
+    SearchServiceError,
+)
+from data_toolbox.multi_file_search.service.jobs import JobQueue
+from data_toolbox.multi_file_search.utils import worker_pool
+from data_toolbox.multi_file_search.utils.server_files import ServerPathSearch
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Run the search service on a free local port and return a client for it."""
+    job_queue = JobQueue(max_running=1)
+    server = uvicorn.Server(uvicorn.Config(create_app(job_queue), log_level="warning"))
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [listener]}, daemon=True)
+    thread.start()
+    while not server.started:
+        thread.join(0.01)
+    yield SearchServiceClient(f"http://127.0.0.1:{listener.getsockname()[1]}", user="ann")
+    server.should_exit = True
+    thread.join(5)
+    listener.close()
+
+
+def test_service_searches_uploaded_files(client):
+    # Arrange
+    upload = NamedBytesIO("upload.txt", b"no match\nWaldo here\n")
+    progress = []
+    # Act
+    job_id = client.submit([upload], SearchSpec(terms=("waldo",)))
+    results = list(client.iter_results(
+        job_id, on_progress=lambda *counts: progress.append(counts), poll_interval=0.01))
+    # Assert
+    assert [result.to_dict() for result in results] == [{
+        "file": "upload.txt",
+        "location": " Line 2 of 3",
+        "search_terms": "waldo",
+        "original_content": "Waldo here",
+    }]
+    assert progress[-1] == (1, 1)
+    assert client.status(job_id)["status"] == "done"
+
+def test_service_refuses_server_paths_outside_the_allowed_roots(client, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.delenv("MFS_SERVER_PATHS", raising=False)
+    # Act / Assert
+    with pytest.raises(SearchServiceError, match="403"):
+        client.submit(ServerPathSearch(path=str(tmp_path)), SearchSpec(terms=("waldo",)))
+
+def test_service_refuses_searches_without_terms(client):
+    # Act / Assert
+    with pytest.raises(SearchServiceError, match="no search term given"):
+        client.submit([NamedBytesIO("empty.txt", b"")], SearchSpec(terms=(" ",)))
+
+def test_service_answers_404_for_unknown_jobs(client):
+    # Act / Assert
+    with pytest.raises(SearchServiceError, match="404"):
+        client.cancel("no-such-job")
+
+def test_service_serves_search_metrics(client):
+    # Arrange
+    job_id = client.submit([NamedBytesIO("metrics.txt", b"waldo\n")], SearchSpec(terms=("waldo",)))
+    list(client.iter_results(job_id, poll_interval=0.01))
+    # Act
+    response = client.session.get(f"{client.url}/metrics", timeout=client.timeout)
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'mfs_searches_ended_total{outcome="finished"}' in response.text
+    assert 'mfs_files_searched_total{file_type="txt",outcome="ok"}' in response.text
+
+def test_service_is_ready_once_the_worker_pool_is_warm(client):
+    # Arrange
+    worker_pool.wait_until_ready(timeout=60)
+    # Act
+    response = client.session.get(f"{client.url}/ready", timeout=client.timeout)
+    # Assert
+    assert response.status_code == 200
+    assert client.session.get(f"{client.url}/health", timeout=client.timeout).json()[
+        "workers_ready"] is True
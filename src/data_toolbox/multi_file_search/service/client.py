@@ -0,0 +1,128 @@
+"""Multi-File Search Service Client.
+
+Used by the Streamlit page when MFS_SEARCH_SERVICE_URL is set
+(e.g. "http://search_service:8010"): searches are submitted to the search
+service and their results polled, instead of being run in the app's process.
+"""
+import os
+import time
+
+import requests
+
+from data_toolbox.multi_file_search.engine import SearchResult
+from data_toolbox.multi_file_search.utils.server_files import ServerPathSearch
+
+SEARCH_SERVICE_ENVIRONMENT_VARIABLE = "MFS_SEARCH_SERVICE_URL"
+
+# Seconds between polls for results
+POLL_INTERVAL = 0.5
+
+FINISHED_STATES = ("done", "cancelled", "failed")
+
+
+def service_url() -> str | None:
+    """Return the configured search service URL, if any."""
+    return os.environ.get(SEARCH_SERVICE_ENVIRONMENT_VARIABLE, "").rstrip("/") or None
+
+
+class SearchServiceError(Exception):
+    """Raised when the search service refuses a request or a search fails."""
+
+
+class SearchServiceClient:
+    """Submit searches to the search service, then poll for their results."""
+
+    def __init__(self, url, user="anonymous", timeout=60):
+        """Connect to the service at url, acting for user (see the X-Toolbox-User header)."""
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["X-Toolbox-User"] = user
+
+    def submit(self, files, spec) -> str:
+        """Submit a search and return its job id.
+
+        Args:
+        ----
+            files (list | ServerPathSearch): file-like objects with a ``name``
+            (e.g. uploads), or a directory on the server to crawl
+            spec (SearchSpec): what to search for
+
+        """
+        data = {
+            "terms": list(spec.terms),
+            "mode": spec.mode,
+            "case_sensitive": spec.case_sensitive,
+            "whole_word": spec.whole_word,
+        }
+        uploads = None
+        if isinstance(files, ServerPathSearch):
+            data.update(
+                server_path=files.path, include=list(files.include), exclude=list(files.exclude))
+            if files.max_file_size is not None:
+                data["max_file_size"] = files.max_file_size
+        else:
+            uploads = [("files", (file.name, _read(file))) for file in files]
+        return self._request("post", "/jobs", data=data, files=uploads)["id"]
+
+    def status(self, job_id) -> dict:
+        """Return a job's status and progress."""
+        return self._request("get", f"/jobs/{job_id}")
+
+    def results(self, job_id, offset=0) -> dict:
+        """Return a job's status with the results found so far, from offset on."""
+        return self._request("get", f"/jobs/{job_id}/results", params={"offset": offset})
+
+    def cancel(self, job_id) -> dict:
+        """Cancel a job."""
+        return self._request("delete", f"/jobs/{job_id}")
+
+    def iter_results(self, job_id, on_progress=None, poll_interval=POLL_INTERVAL):
+        """Poll a job until it finishes, yielding SearchResults as they arrive.
+
+        Args:
+        ----
+            job_id (str): the job, as returned by submit()
+            on_progress (callable): called with (files done, files in total)
+            after each poll
+            poll_interval (float): seconds between polls
+
+        Raises:
+        ------
+            SearchServiceError: if the search failed
+
+        """
+        offset = 0
+        while True:
+            page = self.results(job_id, offset=offset)
+            offset = page["next_offset"]
+            if on_progress is not None and page["files_total"]:
+                on_progress(page["files_done"], page["files_total"])
+            for result in page["results"]:
+                yield SearchResult.from_dict(result)
+            if page["status"] == "failed":
+                raise SearchServiceError(page["error"])
+            if page["status"] in FINISHED_STATES:
+                return
+            time.sleep(poll_interval)
+
+    def _request(self, method, path, **kwargs):
+        """Send a request and return its JSON answer."""
+        try:
+            response = self.session.request(
+                method, self.url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            error = f"search service unavailable: {e}"
+            raise SearchServiceError(error) from e
+        if not response.ok:
+            try:
+                detail = response.json()["detail"]
+            except (ValueError, KeyError, TypeError):
+                detail = response.text
+            raise SearchServiceError(f"{response.status_code}: {detail}")
+        return response.json()
+
+def _read(file):
+    """Return the content of an uploaded file."""
+    file.seek(0)
+    return file.read()
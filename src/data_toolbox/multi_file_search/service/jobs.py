@@ -0,0 +1,303 @@
+"""Search Job Queue.
+
+Searches submitted to the search service wait in a bounded queue and are run by
+a fixed number of runner threads, all sharing the process's warm worker pool.
+Each user may only have a few searches running at once; their other searches
+wait while other users' searches go ahead of them. Uploaded files are held in
+memory until their search finishes, so the queue also bounds their total size.
+
+Results are kept in memory as they arrive, so clients can poll for them while
+the search runs and pick them up again after a disconnect, until the job
+expires.
+"""
+import collections
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from data_toolbox.multi_file_search.engine import SearchEngine
+
+# Searches waiting to run, across all users
+MAX_QUEUED_JOBS = 100
+# Bytes of uploaded files held by searches waiting or running, across all users
+MAX_QUEUED_BYTES = 1024 ** 3
+# Searches running at the same time
+MAX_RUNNING_JOBS = 4
+# Searches one user may have running at the same time
+MAX_RUNNING_JOBS_PER_USER = 2
+# Seconds finished jobs (and their results) are kept
+RESULT_TTL = 60 * 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+
+class QueueFullError(Exception):
+    """Raised when a search is submitted while the queue is full (of searches or bytes)."""
+
+
+class JobNotFoundError(LookupError):
+    """Raised for an unknown (or expired) job id."""
+
+
+@dataclass
+class QueuedJob:
+    """A search submitted to the queue.
+
+    Attributes
+    ----------
+        id (str): job id handed to the client
+        user (str): who submitted the search, for the per-user limit
+        files (list | ServerPathSearch): what to search (see SearchJob)
+        spec (SearchSpec): what to search for
+        status (str): "queued", "running", "done", "cancelled" or "failed"
+        results (list): SearchResults found so far
+        error (str | None): why a failed search failed
+        files_done (int): files searched so far
+        files_total (int | None): files to search, once known
+        size (int): bytes of uploaded files the job holds until it finishes
+        statistics (dict | None): the search's RunStatistics (as a dictionary),
+        once it has finished
+
+    """
+
+    id: str
+    user: str
+    files: object
+    spec: object
+    status: str = QUEUED
+    results: list = field(default_factory=list)
+    error: str | None = None
+    files_done: int = 0
+    files_total: int | None = None
+    size: int = 0
+    statistics: dict | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    search_job: object = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done, cancelled or failed."""
+        return self.status in FINISHED_STATES
+
+    def summary(self) -> dict:
+        """Return the job's status, without its results."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "result_count": len(self.results),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "statistics": self.statistics,
+        }
+
+
+class JobQueue:
+    """A bounded queue of searches, run by a fixed number of runner threads."""
+
+    def __init__(
+        self,
+        engine=None,
+        max_queued=MAX_QUEUED_JOBS,
+        max_queued_bytes=MAX_QUEUED_BYTES,
+        max_running=MAX_RUNNING_JOBS,
+        max_running_per_user=MAX_RUNNING_JOBS_PER_USER,
+        result_ttl=RESULT_TTL,
+    ):
+        """Start the runner threads.
+
+        Args:
+        ----
+            engine (SearchEngine): runs the searches (default: a new SearchEngine)
+            max_queued (int): most searches waiting to run; more are refused
+            max_queued_bytes (int): most bytes of uploads held by unfinished
+            searches; searches that would hold more are refused
+            max_running (int): most searches running at the same time
+            max_running_per_user (int): most searches one user may have running
+            result_ttl (float): seconds finished jobs are kept
+
+        """
+        self.engine = engine or SearchEngine()
+        self.max_queued = max_queued
+        self.max_queued_bytes = max_queued_bytes
+        self.max_running_per_user = max_running_per_user
+        self.result_ttl = result_ttl
+        self._condition = threading.Condition()
+        self._jobs = {}
+        self._waiting = collections.deque()
+        self._running_per_user = collections.Counter()
+        self._queued_bytes = 0
+        self._closed = False
+        self._runners = [
+            threading.Thread(target=self._run_jobs, name=f"search-runner-{number}", daemon=True)
+            for number in range(max_running)
+        ]
+        for runner in self._runners:
+            runner.start()
+
+    def submit(self, files, spec, user="anonymous") -> QueuedJob:
+        """Queue a search.
+
+        Raises
+        ------
+            QueueFullError: if max_queued searches are already waiting, or the
+            files would take the uploads held past max_queued_bytes
+
+        """
+        with self._condition:
+            self._expire()
+            if len(self._waiting) >= self.max_queued:
+                error = f"{len(self._waiting)} searches are already waiting, try again later"
+                raise QueueFullError(error)
+            size = upload_size(files)
+            if self._queued_bytes + size > self.max_queued_bytes:
+                error = (f"{self._queued_bytes + size:,} bytes of uploads would be waiting "
+                         f"(at most {self.max_queued_bytes:,}), try again later")
+                raise QueueFullError(error)
+            job = QueuedJob(id=uuid.uuid4().hex, user=user, files=files, spec=spec, size=size)
+            if isinstance(files, list):
+                job.files_total = len(files)
+            self._queued_bytes += size
+            self._jobs[job.id] = job
+            self._waiting.append(job)
+            self._condition.notify_all()
+            return job
+
+    def get(self, job_id) -> QueuedJob:
+        """Return a job by id.
+
+        Raises
+        ------
+            JobNotFoundError: if there is no such job, or it has expired
+
+        """
+        with self._condition:
+            self._expire()
+            try:
+                return self._jobs[job_id]
+            except KeyError:
+                error = f"no search job {job_id}"
+                raise JobNotFoundError(error) from None
+
+    def results(self, job_id, offset=0) -> list:
+        """Return the results of a job found so far, from offset on."""
+        job = self.get(job_id)
+        with self._condition:
+            return job.results[offset:]
+
+    def cancel(self, job_id) -> QueuedJob:
+        """Cancel a job; results found so far are kept."""
+        job = self.get(job_id)
+        with self._condition:
+            if job.status == QUEUED:
+                self._waiting.remove(job)
+                self._finish(job, CANCELLED)
+            elif job.status == RUNNING:
+                # The runner finishes the job once the files being searched are done
+                job.status = CANCELLED
+                job.search_job.cancel()
+            return job
+
+    def counts(self) -> dict:
+        """Return how many jobs are in each state."""
+        with self._condition:
+            return dict(collections.Counter(job.status for job in self._jobs.values()))
+
+    def queued_bytes(self) -> int:
+        """Return the bytes of uploads held by searches that have not finished."""
+        with self._condition:
+            return self._queued_bytes
+
+    def close(self) -> None:
+        """Cancel every job and stop the runner threads."""
+        with self._condition:
+            self._closed = True
+            for job in list(self._jobs.values()):
+                if not job.finished:
+                    self.cancel(job.id)
+            self._condition.notify_all()
+        for runner in self._runners:
+            runner.join()
+
+    def _run_jobs(self):
+        """Run queued jobs, one at a time, until the queue is closed."""
+        while (job := self._next_job()) is not None:
+            self._run(job)
+
+    def _next_job(self):
+        """Wait for the first queued job whose user is under their running limit."""
+        with self._condition:
+            while not self._closed:
+                for job in self._waiting:
+                    if self._running_per_user[job.user] < self.max_running_per_user:
+                        self._waiting.remove(job)
+                        self._running_per_user[job.user] += 1
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        job.search_job = self.engine.submit(
+                            job.files, job.spec, on_progress=self._progress_recorder(job))
+                        return job
+                self._condition.wait()
+            return None
+
+    def _progress_recorder(self, job):
+        """Return an on_progress callback that records a job's progress."""
+        def record_progress(files_done, files_total):
+            job.files_done, job.files_total = files_done, files_total
+        return record_progress
+
+    def _run(self, job):
+        """Run a job, collecting its results as they arrive."""
+        status, error = DONE, None
+        try:
+            for result in job.search_job:
+                with self._condition:
+                    if job.status == CANCELLED:
+                        break
+                    job.results.append(result)
+        except PermissionError as e:
+            status, error = FAILED, str(e)
+        except Exception as e:  # noqa: BLE001
+            status, error = FAILED, f"{type(e).__name__}: {e}"
+        with self._condition:
+            self._running_per_user[job.user] -= 1
+            job.files_total = job.search_job.files_total
+            job.statistics = job.search_job.statistics.to_dict()
+            job.error = error
+            self._finish(job, CANCELLED if job.search_job.cancelled else status)
+            self._condition.notify_all()
+
+    def _finish(self, job, status):
+        """Mark a job finished (the condition must be held)."""
+        job.status = status
+        job.finished_at = time.time()
+        job.search_job = None
+        job.files = None
+        self._queued_bytes -= job.size
+
+    def _expire(self):
+        """Forget jobs that finished more than result_ttl seconds ago (the condition must be held)."""
+        cutoff = time.time() - self.result_ttl
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+
+def upload_size(files) -> int:
+    """Return the bytes of the (name, content) uploads to search; 0 for a server path."""
+    if not isinstance(files, list):
+        return 0
+    return sum(len(file[1]) for file in files if isinstance(file, tuple))
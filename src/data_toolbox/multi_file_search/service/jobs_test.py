@@ -0,0 +1,133 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from data_toolbox.multi_file_search.engine import SearchSpec
+from data_toolbox.multi_file_search.service.jobs import (
+    JobNotFoundError,
+    JobQueue,
+    QueueFullError,
+)
+from data_toolbox.multi_file_search.utils.server_files import ServerPathSearch
+
+# Base path for mocking functions called by the engine
+base_path = "data_toolbox.multi_file_search.engine"
+
+SPEC = SearchSpec(terms=("waldo",))
+
+
+def wait_for(condition, timeout=5):
+    """Wait until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+@pytest.fixture
+def blocked_router():
+    """Make every file search wait until the returned event is set."""
+    release = threading.Event()
+
+    def search_file(file, *_):
+        release.wait(5)
+        return [{"file": file.name, "location": "Error reading file"}]
+
+    with patch(f"{base_path}.router", side_effect=search_file):
+        yield release
+    release.set()
+
+
+def test_job_queue_runs_searches_and_keeps_their_results():
+    # Arrange
+    job_queue = JobQueue(max_running=1)
+    # Act
+    job = job_queue.submit([("a.txt", b"waldo\n"), ("b.txt", b"no match\n")], SPEC)
+    wait_for(lambda: job.finished)
+    # Assert
+    assert job.status == "done"
+    assert (job.files_done, job.files_total) == (2, 2)
+    assert [result.file for result in job_queue.results(job.id)] == ["a.txt"]
+    assert job_queue.results(job.id, offset=1) == []
+    job_queue.close()
+
+def test_job_queue_limits_running_searches_per_user(blocked_router):
+    # Arrange
+    job_queue = JobQueue(max_running=2, max_running_per_user=1)
+    first = job_queue.submit([("1.txt", b"")], SPEC, user="ann")
+    second = job_queue.submit([("2.txt", b"")], SPEC, user="ann")
+    other_user = job_queue.submit([("3.txt", b"")], SPEC, user="bob")
+    # Act
+    wait_for(lambda: other_user.status == "running")
+    # Assert: bob's search overtook ann's second one
+    assert (first.status, second.status) == ("running", "queued")
+    blocked_router.set()
+    wait_for(lambda: second.finished)
+    assert job_queue.counts() == {"done": 3}
+    job_queue.close()
+
+def test_job_queue_refuses_searches_when_full(blocked_router):
+    # Arrange
+    job_queue = JobQueue(max_queued=1, max_running=1)
+    running = job_queue.submit([("1.txt", b"")], SPEC)
+    wait_for(lambda: running.status == "running")
+    job_queue.submit([("2.txt", b"")], SPEC)
+    # Act / Assert
+    with pytest.raises(QueueFullError):
+        job_queue.submit([("3.txt", b"")], SPEC)
+    blocked_router.set()
+    job_queue.close()
+
+def test_job_queue_refuses_searches_holding_too_many_bytes(blocked_router):
+    # Arrange
+    job_queue = JobQueue(max_queued_bytes=10, max_running=1)
+    running = job_queue.submit([("1.txt", b"123456")], SPEC)
+    wait_for(lambda: running.status == "running")
+    # Act / Assert: running searches still hold their uploads
+    with pytest.raises(QueueFullError, match="bytes of uploads"):
+        job_queue.submit([("2.txt", b"12345")], SPEC)
+    assert job_queue.queued_bytes() == 6
+    blocked_router.set()
+    wait_for(lambda: running.finished)
+    job_queue.submit([("2.txt", b"12345")], SPEC)
+    job_queue.close()
+
+def test_job_queue_cancels_queued_and_running_searches(blocked_router):
+    # Arrange
+    job_queue = JobQueue(max_running=1)
+    running = job_queue.submit([("1.txt", b""), ("2.txt", b"")], SPEC)
+    queued = job_queue.submit([("3.txt", b"")], SPEC)
+    wait_for(lambda: running.status == "running")
+    # Act
+    job_queue.cancel(queued.id)
+    job_queue.cancel(running.id)
+    blocked_router.set()
+    # Assert
+    wait_for(lambda: running.finished_at is not None)
+    assert (running.status, queued.status) == ("cancelled", "cancelled")
+    assert job_queue.counts() == {"cancelled": 2}
+    job_queue.close()
+
+def test_job_queue_fails_searches_outside_the_allowed_roots(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.delenv("MFS_SERVER_PATHS", raising=False)
+    job_queue = JobQueue(max_running=1)
+    # Act
+    job = job_queue.submit(ServerPathSearch(path=str(tmp_path)), SPEC)
+    wait_for(lambda: job.finished)
+    # Assert
+    assert job.status == "failed"
+    assert "not a directory this server allows searching" in job.error
+    job_queue.close()
+
+def test_job_queue_forgets_expired_jobs():
+    # Arrange
+    job_queue = JobQueue(max_running=1, result_ttl=0)
+    job = job_queue.submit([("a.txt", b"waldo\n")], SPEC)
+    wait_for(lambda: job.finished)
+    time.sleep(0.01)
+    # Act / Assert
+    with pytest.raises(JobNotFoundError):
+        job_queue.get(job.id)
+    job_queue.close()
@@ -2,8 +2,23 @@
 
 A collection of custom streamlit UI components used in the multi-file-search tool.
 """
+from pathlib import Path
+
 import streamlit as st
 
+from data_toolbox.multi_file_search.file_router.registry import uploader_types
+from data_toolbox.multi_file_search.utils.server_files import (
+    ServerPathSearch,
+    allowed_roots,
+)
+from data_toolbox.utils import (
+    display_restored_uploaded_files,
+    restore_uploaded_files,
+    were_files_restored,
+)
+
+MiB = 1024 * 1024
+
 
 def case_sensitive_checkbox():
     """Case Sensitive Checkbox.
@@ -42,12 +57,68 @@ def multi_file_uploader():
     """Multi File Uploader.
 
     Streamlit UI Component for uploading files.
-    This code should be edited as new file types are supported
+    Accepts every file type with a handler in the file_router registry.
     """
-    valid_search_files=["docx", "pdf", "pptx", "txt", "xls", "xlsx", "csv"]
+    valid_search_files = uploader_types()
     return st.file_uploader(
         "Upload files to be searched here",
         label_visibility="collapsed",
         type=valid_search_files,
         accept_multiple_files=True,
     )
+
+def files_to_search():
+    """Files To Search.
+
+    Streamlit UI Component for choosing the files to search: uploaded files or,
+    when the server is configured with searchable paths, a directory on the server.
+    Returns uploaded files or a ServerPathSearch.
+    """
+    roots = allowed_roots()
+    if roots:
+        source = st.radio(
+            label="Select files to search:",
+            label_visibility="collapsed",
+            options=["Upload files", "Search a server path"],
+            horizontal=True,
+            key="file_source",
+        )
+        if source == "Search a server path":
+            return server_path_selector(roots)
+    uploaded_files = restore_uploaded_files()
+    if were_files_restored(uploaded_files):
+        display_restored_uploaded_files(uploaded_files)
+        return uploaded_files
+    return multi_file_uploader()
+
+def server_path_selector(roots):
+    """Server Path Selector.
+
+    Streamlit UI Component for choosing a directory on the server to search.
+    """
+    root = st.selectbox("Searchable path", options=[str(root) for root in roots])
+    subdirectory = st.text_input(
+        "Folder (optional)",
+        help="A folder inside the searchable path, e.g. `2023/contracts`",
+    )
+    include = st.text_input(
+        "Include files matching",
+        value="*",
+        help="Comma separated glob patterns, e.g. `*.pdf, reports/*.docx`",
+    )
+    exclude = st.text_input(
+        "Exclude files and folders matching",
+        help="Comma separated glob patterns, e.g. `archive, *.tmp`",
+    )
+    max_file_size = st.number_input(
+        "Skip files larger than (MiB)", min_value=1, value=512, step=64)
+    return ServerPathSearch(
+        path=str(Path(root) / subdirectory.strip().lstrip("/")),
+        include=_split_patterns(include) or ("*",),
+        exclude=_split_patterns(exclude),
+        max_file_size=int(max_file_size) * MiB,
+    )
+
+def _split_patterns(patterns):
+    """Split a comma separated list of glob patterns."""
+    return tuple(pattern.strip() for pattern in patterns.split(",") if pattern.strip())
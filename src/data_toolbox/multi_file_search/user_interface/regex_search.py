@@ -7,14 +7,9 @@ import streamlit as st
 from streamlit_tags import st_tags
 
 from data_toolbox.multi_file_search.user_interface.components import (
-    multi_file_uploader,
+    files_to_search,
     step_component,
 )
-from data_toolbox.utils import (
-    display_restored_uploaded_files,
-    restore_uploaded_files,
-    were_files_restored,
-)
 
 
 def regex_search():
@@ -26,11 +21,7 @@ def regex_search():
     }
     st.write("#") # large spacer
     step_component("2. Upload files to be searched")
-    uploaded_files = restore_uploaded_files()
-    if were_files_restored(uploaded_files):
-        display_restored_uploaded_files(uploaded_files)
-    else:
-        uploaded_files = multi_file_uploader()
+    uploaded_files = files_to_search()
     step_component(
         "3. Type in a regular expression and *press enter*",
         "Example: `\d{3}\d{3}\d{4}`",  # noqa: W605
@@ -4,16 +4,11 @@ import streamlit as st
 
 from data_toolbox.multi_file_search.user_interface.components import (
     case_sensitive_checkbox,
-    multi_file_uploader,
+    files_to_search,
     step_component,
     whole_word_search_checkbox,
 )
 from data_toolbox.multi_file_search.utils.utils import search_term_file_to_list
-from data_toolbox.utils import (
-    display_restored_uploaded_files,
-    restore_uploaded_files,
-    were_files_restored,
-)
 
 
 def search_term_file_search():
@@ -27,11 +22,7 @@ def search_term_file_search():
         "whole-word": whole_word_search,
     }
     step_component("2. Upload files to be searched")
-    uploaded_files = restore_uploaded_files()
-    if were_files_restored(uploaded_files):
-        display_restored_uploaded_files(uploaded_files)
-    else:
-        uploaded_files = multi_file_uploader()
+    uploaded_files = files_to_search()
     step_component(
         "3. Upload search term file",
         "The program will only read the first column in the excel",
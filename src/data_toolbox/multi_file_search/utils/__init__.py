@@ -1,11 +1,40 @@
-from data_toolbox.multi_file_search.utils.utils import (
-    build_result,
-    data_frame_to_excel,
-    detect_encoding,
-    document_search,
-    get_excel_column_letter,
-    match_function,
-    search_term_file_to_list,
-    strip_list,
-    tabular_search,
-)
+"""Multi-File Search utilities.
+
+Names are imported from their modules on first access, so importing one of the
+submodules (e.g. ``worker_pool`` on the home page) does not import the search
+functions of utils.utils and their dependencies (chardet, pandas) along with it.
+"""
+import importlib
+
+# name -> module defining it
+_EXPORTS = {
+    "build_result": "utils",
+    "data_frame_to_excel": "utils",
+    "detect_encoding": "utils",
+    "document_search": "utils",
+    "get_excel_column_letter": "utils",
+    "iter_decoded_lines": "utils",
+    "local_file_path": "utils",
+    "match_function": "utils",
+    "search_term_file_to_list": "utils",
+    "stream_document_search": "utils",
+    "stream_record_search": "utils",
+    "strip_list": "utils",
+    "tabular_search": "utils",
+    "byte_document_search": "byte_search",
+    "may_contain_matches": "byte_search",
+    "open_byte_buffer": "byte_search",
+    "supports_byte_search": "byte_search",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the search utilities when they are first accessed."""
+    if name in _EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
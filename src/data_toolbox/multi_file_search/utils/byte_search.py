@@ -0,0 +1,316 @@
+"""Byte Search.
+
+Search the raw bytes of large ASCII / UTF-8 text files without decoding them.
+
+The file is memory-mapped (or, for in-memory uploads, viewed through its
+buffer) and the search terms are compiled to a bytes pattern that finds every
+line that *could* contain a hit. Only those candidate lines are decoded and
+confirmed with match_function, so results are identical to the decoding path
+while the cost of decoding every line is avoided.
+"""
+import functools
+import io
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from data_toolbox.multi_file_search.utils import metrics, run_statistics
+from data_toolbox.multi_file_search.utils.utils import (
+    STREAM_CHUNK_SIZE,
+    build_result,
+    match_function,
+)
+
+# Encodings whose raw bytes can be searched directly
+BYTE_SEARCH_ENCODINGS = {"ascii", "utf-8", "utf-8-sig"}
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# Non-ASCII characters whose lowercase form contains an ASCII letter
+# ("İ".lower() == "i̇", "K".lower() == "k"), see _literal_pattern
+_FOLDED_ALTERNATIVES = {"i": "İ", "k": "K"}
+
+# Every character str() can produce for a number, boolean or NaN parsed by pandas
+_PANDAS_VALUE_CHARS = set("0123456789.-+einfaTruFls")
+
+_NEWLINE = re.compile(b"\n")
+
+_NEWLINE_CATEGORIES = {
+    sre_constants.CATEGORY_NOT_DIGIT,
+    sre_constants.CATEGORY_SPACE,
+    sre_constants.CATEGORY_NOT_WORD,
+}
+_REPEATS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+}
+
+
+def normalize_encoding(encoding) -> str:
+    """Return a lowercase, dash separated encoding name ("UTF-8-SIG" -> "utf-8-sig")."""
+    return (encoding or "").lower().replace("_", "-")
+
+def supports_byte_search(encoding, search_terms, search_options) -> bool:
+    """Check if a search can run on the raw bytes of a file with this encoding.
+
+    Literal searches need UTF-8 compatible content. Case-insensitive searches
+    additionally need ASCII search terms, and regex searches need ASCII content,
+    an ASCII pattern and a pattern that can never match across a line break.
+    """
+    encoding = normalize_encoding(encoding)
+    if encoding not in BYTE_SEARCH_ENCODINGS or not search_terms:
+        return False
+    if search_options["mode"] == "regex":
+        return encoding == "ascii" and all(_regex_stays_on_line(term) for term in search_terms)
+    if any("\n" in term for term in search_terms):
+        return False
+    if not search_options["case-sensitive"]:
+        return all(term.isascii() for term in search_terms)
+    return True
+
+def may_contain_matches(file, encoding, search_terms, search_options) -> bool:
+    """Cheaply check the raw bytes of a CSV for any possible hit.
+
+    Returns False only when no cell parsed by pandas can match any search term,
+    allowing the (expensive) parse to be skipped. Terms that pandas could
+    synthesise from numbers, booleans or NaN (e.g. "1.0", "nan") and terms
+    containing quotes always return True.
+    """
+    if (not supports_byte_search(encoding, search_terms, search_options)
+            or search_options["mode"] == "regex"):
+        return True
+    case_sensitive = search_options["case-sensitive"]
+    value_chars = (_PANDAS_VALUE_CHARS if case_sensitive
+                   else {char.lower() for char in _PANDAS_VALUE_CHARS})
+    for term in search_terms:
+        comparable = term if case_sensitive else term.lower()
+        if '"' in term or set(comparable) <= value_chars:
+            return True
+    pattern = _literal_pattern(search_terms, search_options)
+    with open_byte_buffer(file) as buffer:
+        return pattern.search(buffer) is not None
+
+@contextmanager
+def open_byte_buffer(file):
+    """Expose a file's raw bytes without reading them into a new bytes object.
+
+    In-memory uploads (BytesIO / Streamlit UploadedFile) are viewed through
+    their buffer, files on disk are memory-mapped and any other stream is
+    spilled to a temporary file which is then memory-mapped.
+    """
+    if hasattr(file, "getbuffer"):
+        view = file.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+    try:
+        fileno = file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is not None:
+        with _mmap_file(fileno) as mapped:
+            yield mapped
+        return
+    with tempfile.TemporaryFile() as spill_file:
+        file.seek(0)
+        shutil.copyfileobj(file, spill_file, STREAM_CHUNK_SIZE)
+        spill_file.flush()
+        file.seek(0)
+        with _mmap_file(spill_file.fileno()) as mapped:
+            yield mapped
+
+def byte_document_search(file_name, file, encoding, search_terms, search_options,
+                         location_context=""):
+    """Search the raw bytes of a UTF-8 compatible file line by line.
+
+    Produces the same results as stream_document_search over the decoded
+    lines, but only candidate lines are ever decoded. Call
+    supports_byte_search first.
+    """
+    results = []
+    if search_options["mode"] == "regex":
+        patterns = [re.compile(term.encode("ascii"), re.MULTILINE) for term in search_terms]
+    else:
+        patterns = [_literal_pattern(search_terms, search_options)]
+
+    with open_byte_buffer(file) as buffer, run_statistics.stage("matching"):
+        start = len(UTF8_BOM) if bytes(buffer[:len(UTF8_BOM)]) == UTF8_BOM else 0
+        total_lines = _count_newlines(buffer, 0, len(buffer)) + 1
+        run_statistics.count("lines", total_lines)
+        candidate_lines = set()
+        for pattern in patterns:
+            candidate_lines.update(_iter_candidate_line_starts(buffer, pattern, start))
+
+        line_number = 1
+        position = 0
+        for line_start in sorted(candidate_lines):
+            line_number += _count_newlines(buffer, position, line_start)
+            position = line_start
+            line_end = _line_end(buffer, line_start)
+            line = bytes(buffer[line_start:line_end]).decode("utf-8", errors="replace")
+            matched_terms_in_line = [
+                term for term in search_terms if match_function(line, term, search_options)
+            ]
+            if matched_terms_in_line:
+                results.append(build_result(
+                    file_name=file_name,
+                    location_context=location_context,
+                    location=f"Line {line_number} of {total_lines}",
+                    search_terms=matched_terms_in_line,
+                    original_content=line,
+                ))
+    return results
+
+@contextmanager
+def _mmap_file(fileno):
+    """Memory-map a whole file read-only (empty files map to b"")."""
+    if os.fstat(fileno).st_size == 0:
+        yield b""
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+def _literal_pattern(search_terms, search_options):
+    """Compile all literal search terms into one bytes pattern.
+
+    The pattern matches a superset of what match_function accepts: whole-word
+    searches are reduced to a substring search and case-insensitive searches
+    also accept the non-ASCII characters that lowercase to an ASCII letter.
+    Patterns are cached, as every file of a search needs the same one.
+    """
+    return _compile_literal_pattern(tuple(search_terms), search_options["case-sensitive"])
+
+@functools.lru_cache(maxsize=64)
+def _compile_literal_pattern(search_terms, case_sensitive):
+    """Compile the pattern of _literal_pattern (cached)."""
+    alternatives = []
+    for term in sorted(search_terms, key=len, reverse=True):
+        if case_sensitive:
+            alternatives.append(re.escape(term.encode("utf-8")))
+            continue
+        term_pattern = b""
+        for char in term:
+            folded = _FOLDED_ALTERNATIVES.get(char.lower())
+            escaped = re.escape(char.encode("ascii"))
+            if folded:
+                escaped = b"(?:" + escaped + b"|" + folded.encode("utf-8") + b")"
+            term_pattern += escaped
+        alternatives.append(term_pattern)
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(b"|".join(alternatives), flags)
+
+metrics.register_cache("byte_pattern", _compile_literal_pattern)
+
+def _regex_stays_on_line(pattern) -> bool:
+    """Check that a regex is ASCII, valid as bytes and can never match a line break.
+
+    Lookarounds and string anchors (\\A, \\Z) are rejected too, as they behave
+    differently on a single line than on the whole buffer.
+    """
+    if not pattern.isascii():
+        return False
+    try:
+        re.compile(pattern.encode("ascii"))
+        parsed = sre_parse.parse(pattern)
+    except (re.error, TypeError, ValueError):
+        return False
+    if parsed.state.flags & sre_constants.SRE_FLAG_DOTALL:
+        return False
+    return not _can_match_newline(parsed)
+
+def _can_match_newline(items) -> bool:  # noqa: C901, PLR0911, PLR0912
+    """Walk a parsed regex and report whether any part of it could consume "\\n"."""
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            if av == ord("\n"):
+                return True
+        elif op in (sre_constants.NOT_LITERAL, sre_constants.ASSERT,
+                    sre_constants.ASSERT_NOT):
+            return True
+        elif op is sre_constants.AT:
+            if av in (sre_constants.AT_BEGINNING_STRING, sre_constants.AT_END_STRING):
+                return True
+        elif op is sre_constants.CATEGORY:
+            if av in _NEWLINE_CATEGORIES:
+                return True
+        elif op is sre_constants.IN:
+            if _class_can_match_newline(av):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            _, add_flags, _, sub_items = av
+            if add_flags & sre_constants.SRE_FLAG_DOTALL or _can_match_newline(sub_items):
+                return True
+        elif op in _REPEATS:
+            if _can_match_newline(av[2]):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_can_match_newline(branch) for branch in av[1]):
+                return True
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            if _can_match_newline(av):
+                return True
+        elif op is sre_constants.GROUPREF_EXISTS:
+            _, yes_items, no_items = av
+            if _can_match_newline(yes_items) or (no_items and _can_match_newline(no_items)):
+                return True
+    return False
+
+def _class_can_match_newline(class_items) -> bool:
+    """Check a parsed character class ([...]) for anything matching "\\n"."""
+    for op, av in class_items:
+        if op is sre_constants.NEGATE:
+            return True
+        if op is sre_constants.LITERAL and av == ord("\n"):
+            return True
+        if op is sre_constants.RANGE and av[0] <= ord("\n") <= av[1]:
+            return True
+        if op is sre_constants.CATEGORY and av in _NEWLINE_CATEGORIES:
+            return True
+    return False
+
+def _iter_candidate_line_starts(buffer, pattern, start):
+    """Yield the start offset of every line in which the pattern matches."""
+    position = start
+    size = len(buffer)
+    while position <= size:
+        match = pattern.search(buffer, position)
+        if match is None:
+            return
+        line_start = max(_line_start(buffer, match.start()), start)
+        yield line_start
+        position = _line_end(buffer, match.start()) + 1
+
+def _line_start(buffer, position) -> int:
+    """Return the offset of the first byte of the line containing position."""
+    while position > 0:
+        window_start = max(0, position - STREAM_CHUNK_SIZE)
+        newline = bytes(buffer[window_start:position]).rfind(b"\n")
+        if newline != -1:
+            return window_start + newline + 1
+        position = window_start
+    return 0
+
+def _line_end(buffer, position) -> int:
+    """Return the offset of the newline ending the line containing position."""
+    newline = _NEWLINE.search(buffer, position)
+    return newline.start() if newline else len(buffer)
+
+def _count_newlines(buffer, start, end) -> int:
+    """Count "\\n" bytes in buffer[start:end] one chunk at a time."""
+    count = 0
+    for window_start in range(start, end, STREAM_CHUNK_SIZE):
+        window_end = min(end, window_start + STREAM_CHUNK_SIZE)
+        count += bytes(buffer[window_start:window_end]).count(b"\n")
+    return count
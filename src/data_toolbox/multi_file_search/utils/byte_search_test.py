@@ -0,0 +1,101 @@
+"""Test suite for Multi File Search byte level search."""
+from io import BytesIO
+
+from data_toolbox.multi_file_search.utils.byte_search import (
+    byte_document_search,
+    may_contain_matches,
+    open_byte_buffer,
+    supports_byte_search,
+)
+from data_toolbox.multi_file_search.utils.utils import document_search
+
+CONTENT = "\n".join([
+    "Hello, World! This is a test string.",
+    "",
+    "An İstanbul KELVIN line with K and hourglass",
+    "  indented hour\r",
+    "apple,Orange,PEAR",
+    "nothing to see here",
+    "emoji 🙂 and 欢迎 welcome",
+    "ends with newline",
+    "",
+])
+
+class PlainStream:
+    def __init__(self, content):
+        self.__content = BytesIO(content)
+
+    def read(self, size=-1):
+        return self.__content.read(size)
+
+    def seek(self, position):
+        return self.__content.seek(position)
+
+def search_options(mode="regular", case_sensitive=False, whole_word=False):
+    return {"mode": mode, "case-sensitive": case_sensitive, "whole-word": whole_word}
+
+def assert_same_as_decoding(content, search_terms, options, encoding="utf-8"):
+    expected = document_search(
+        "test.txt", content.split("\n"), search_terms, options, location_context="",
+    )
+    result = byte_document_search(
+        "test.txt", BytesIO(content.encode("utf-8")), encoding, search_terms, options,
+    )
+    assert result == expected
+
+
+def test_byte_search_matches_decoding_literal():
+    search_terms = ["hour", "i", "kelvin", "orange", "欢迎", "e w", "see"]
+    for case_sensitive in (True, False):
+        for whole_word in (True, False):
+            options = search_options(case_sensitive=case_sensitive, whole_word=whole_word)
+            terms = search_terms if case_sensitive else [t for t in search_terms if t.isascii()]
+            assert_same_as_decoding(CONTENT, terms, options)
+
+def test_byte_search_matches_decoding_regex():
+    ascii_content = CONTENT.encode("ascii", errors="ignore").decode("ascii")
+    search_terms = [r"^\w+,", r"h[a-z]{3}\b", r"line$", r"\d*", r"(o)\1?r"]
+    options = search_options(mode="regex")
+    assert supports_byte_search("ascii", search_terms, options)
+    assert_same_as_decoding(ascii_content, search_terms, options, encoding="ascii")
+
+def test_byte_search_skips_bom():
+    content = "﻿first line\nsecond line"
+    result = byte_document_search(
+        "bom.txt",
+        BytesIO(content.encode("utf-8")),
+        "UTF-8-SIG",
+        ["first"],
+        search_options(),
+    )
+    assert result[0]["location"] == " Line 1 of 2"
+    assert result[0]["original_content"] == "first line"
+
+def test_supports_byte_search():
+    assert supports_byte_search("utf-8", ["term"], search_options())
+    assert supports_byte_search("UTF-8-SIG", ["欢迎"], search_options(case_sensitive=True))
+    assert not supports_byte_search("utf-8", ["欢迎"], search_options())
+    assert not supports_byte_search("Big5", ["term"], search_options())
+    assert not supports_byte_search(None, ["term"], search_options())
+    assert not supports_byte_search("utf-8", [r"\d+"], search_options(mode="regex"))
+    for pattern in [r"\s", r"[^a]", r"a.b(?s)", r"(?<=a)b", r"\Aa", r"[\x00-\x7f]"]:
+        assert not supports_byte_search("ascii", [pattern], search_options(mode="regex"))
+
+def test_may_contain_matches():
+    csv_file = BytesIO(b"name,phone\nAlice,5551234\nBob,\n")
+    assert may_contain_matches(csv_file, "ascii", ["alice"], search_options())
+    assert not may_contain_matches(csv_file, "ascii", ["carol"], search_options())
+    # pandas renders the empty cell as "nan" and the phone numbers as floats
+    assert may_contain_matches(csv_file, "ascii", ["nan"], search_options())
+    assert may_contain_matches(csv_file, "ascii", ["1.0"], search_options())
+    assert may_contain_matches(csv_file, "Big5", ["carol"], search_options())
+
+def test_open_byte_buffer_sources(tmp_path):
+    path = tmp_path / "test.txt"
+    path.write_bytes(b"on disk")
+    with path.open("rb") as disk_file, open_byte_buffer(disk_file) as buffer:
+        assert bytes(buffer[:]) == b"on disk"
+    # a stream without fileno() or getbuffer() is spilled to a temporary file
+    stream = PlainStream(b"spilled")
+    with open_byte_buffer(stream) as buffer:
+        assert bytes(buffer[:]) == b"spilled"
@@ -0,0 +1,291 @@
+"""Memory Accounting.
+
+Peak memory of a search, per file and per run, so containers can be sized from
+measurements rather than guesswork:
+
+    - this process: growth of its RSS high-water mark while searches run,
+      sampled per file; or, with MFS_TRACE_ALLOCATIONS=1, of the Python
+      allocations (numpy and pandas buffers included) traced by tracemalloc,
+      which is more precise but makes searches several times slower
+    - worker processes: the RSS high-water mark of each worker task
+
+High-water marks are reset at each sample (on Linux through
+/proc/self/clear_refs; elsewhere the RSS figures are the lifetime maximum), so
+memory freed between two samples still counts. They are process wide: when
+files (or searches) overlap in time a file's peak includes the memory of the
+others, so it is an upper bound.
+
+A search may have a memory budget (MFS_MEMORY_BUDGET_MIB). Once the memory it
+uses passes the budget it degrades instead of growing further: new files wait
+until the files being searched are done, and handlers with a streaming path
+take it (see should_stream), e.g. CSV files are parsed in chunks and archive
+members are searched one at a time.
+"""
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+MEMORY_BUDGET_ENVIRONMENT_VARIABLE = "MFS_MEMORY_BUDGET_MIB"
+TRACE_ALLOCATIONS_ENVIRONMENT_VARIABLE = "MFS_TRACE_ALLOCATIONS"
+MiB = 1024 * 1024
+
+# Seconds between two samples of the memory
+SAMPLE_INTERVAL = 0.01
+
+_CLEAR_REFS_PATH = "/proc/self/clear_refs"
+_STATUS_PATH = "/proc/self/status"
+
+# Trackers of the running searches; tracemalloc is stopped when the last one tracing ends
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_trackers = set()
+# The tracker and file statistics of the file searched by the current thread
+_current = threading.local()
+
+
+def budget_from_environment() -> int | None:
+    """Return the per-search memory budget in bytes, if one is configured."""
+    configured = os.environ.get(MEMORY_BUDGET_ENVIRONMENT_VARIABLE, "").strip()
+    return int(configured) * MiB if configured else None
+
+def trace_allocations_from_environment() -> bool:
+    """Whether searches should trace Python allocations with tracemalloc."""
+    return os.environ.get(TRACE_ALLOCATIONS_ENVIRONMENT_VARIABLE, "").strip().lower() in {
+        "1", "true"}
+
+
+class MemoryTracker:
+    """Peak memory of one search, and its memory budget.
+
+    Attributes
+    ----------
+        budget (int | None): bytes the search may use before it degrades
+        trace_allocations (bool): measure this process with tracemalloc
+        rather than its RSS
+        peak_bytes (int): peak growth of the memory of this process
+        worker_peak_bytes (int): highest RSS high-water mark of a worker task
+        throttled_files (int): files that waited for memory to start
+
+    """
+
+    def __init__(self, budget=None, interval=SAMPLE_INTERVAL, trace_allocations=None):
+        """Prepare to track a search; call start() before searching."""
+        self.budget = budget
+        self.trace_allocations = (
+            trace_allocations if trace_allocations is not None
+            else trace_allocations_from_environment())
+        self.interval = interval
+        self.peak_bytes = 0
+        self.worker_peak_bytes = 0
+        self.throttled_files = 0
+        self._baseline = 0
+        self._running = {}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_until_stopped,
+                                         name="memory-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling the memory of this process (and tracing allocations)."""
+        # Reset the peaks first, so this search's peak starts from now
+        _observe_peaks()
+        _start_tracking(self)
+        self._baseline = self._current_bytes()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling (and tracing allocations, if no other search traces them)."""
+        self._stop_event.set()
+        if self._sampler.is_alive():
+            self._sampler.join()
+        self._sample()
+        _stop_tracking(self)
+
+    def summary(self) -> dict:
+        """Return the run's memory figures, for its RunStatistics."""
+        return {
+            "parent_peak_bytes": self.peak_bytes,
+            "parent_measure": "tracemalloc" if self.trace_allocations else "rss",
+            "worker_peak_bytes": self.worker_peak_bytes,
+            "budget_bytes": self.budget,
+            "throttled_files": self.throttled_files,
+        }
+
+    @contextmanager
+    def track_file(self, file_statistics):
+        """Track the memory of the file searched by this thread, after waiting for budget.
+
+        While the search is over budget, a file waits for the files being
+        searched to finish (one file always runs, so the search progresses).
+        """
+        with self._condition:
+            if self.over_budget() and self._running:
+                self.throttled_files += 1
+                while self.over_budget() and self._running:
+                    self._condition.wait(self.interval)
+            self._running[id(file_statistics)] = [file_statistics, self._current_bytes(), 0]
+        previous = getattr(_current, "file", None)
+        _current.file = (self, file_statistics)
+        try:
+            yield
+        finally:
+            _current.file = previous
+            self._sample()
+            with self._condition:
+                _, _, parent_peak = self._running.pop(id(file_statistics))
+                file_statistics.memory["parent_peak_bytes"] = parent_peak
+                file_statistics.memory.setdefault("worker_peak_bytes", 0)
+                self._condition.notify_all()
+
+    def record_worker_task(self, file_statistics, rss_before, rss_peak) -> None:
+        """Record the RSS of a worker task run for a file."""
+        with self._condition:
+            self.worker_peak_bytes = max(self.worker_peak_bytes, rss_peak)
+            file_statistics.memory["worker_peak_bytes"] = max(
+                file_statistics.memory.get("worker_peak_bytes", 0), rss_peak)
+            file_statistics.memory["worker_growth_bytes"] = max(
+                file_statistics.memory.get("worker_growth_bytes", 0), rss_peak - rss_before)
+
+    def used_bytes(self) -> int:
+        """Return the memory the search uses now.
+
+        That is the memory growth of this process plus the largest RSS growth
+        of a worker task of a file being searched.
+        """
+        parent = max(0, self._current_bytes() - self._baseline)
+        with self._condition:
+            workers = max(
+                (file_statistics.memory.get("worker_growth_bytes", 0)
+                 for file_statistics, _, _ in self._running.values()),
+                default=0,
+            )
+        return parent + workers
+
+    def over_budget(self) -> bool:
+        """Whether the search uses more memory than its budget."""
+        return self.budget is not None and self.used_bytes() > self.budget
+
+    def _current_bytes(self) -> int:
+        """Return the memory this process uses now, as this tracker measures it."""
+        if self.trace_allocations:
+            return tracemalloc.get_traced_memory()[0]
+        return _rss_status("VmRSS:") or _max_rss()
+
+    def _sample_until_stopped(self):
+        """Sample the memory until stop() is called."""
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        """Update the peaks of every running search."""
+        _observe_peaks()
+
+    def _record_peaks(self, peaks):
+        """Update the run's and the running files' peaks from the peaks since the last sample."""
+        peak = peaks["tracemalloc" if self.trace_allocations else "rss"]
+        with self._condition:
+            self.peak_bytes = max(self.peak_bytes, peak - self._baseline)
+            for running in self._running.values():
+                running[2] = max(running[2], peak - running[1])
+            if self.budget is not None:
+                self._condition.notify_all()
+
+
+def current_tracker():
+    """Return the (tracker, file statistics) of the file searched by this thread, if any."""
+    return getattr(_current, "file", None)
+
+def should_stream() -> bool:
+    """Whether the file searched by this thread should take its streaming path.
+
+    True when its search is over its memory budget; the file's statistics
+    record that it was streamed.
+    """
+    current = current_tracker()
+    if current is None:
+        return False
+    tracker, file_statistics = current
+    if not tracker.over_budget():
+        return False
+    file_statistics.memory["streamed"] = True
+    return True
+
+def measured_task(fn, args):
+    """Run a worker task, measuring its RSS high-water mark (worker side).
+
+    Returns
+    -------
+        tuple: (the task's result, RSS before the task, RSS high-water mark)
+
+    """
+    reset = _reset_peak_rss()
+    rss_before = _rss_status("VmRSS:") if reset else _max_rss()
+    result = fn(*args)
+    rss_peak = _rss_status("VmHWM:") if reset else _max_rss()
+    return result, rss_before or 0, rss_peak or 0
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's RSS high-water mark, returning False where that is not possible."""
+    try:
+        with open(_CLEAR_REFS_PATH, "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+def _rss_status(field) -> int | None:
+    """Return a memory field ("VmRSS:", "VmHWM:") of /proc/self/status in bytes."""
+    try:
+        with open(_STATUS_PATH) as status:
+            for line in status:
+                if line.startswith(field):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+def _max_rss() -> int:
+    """Return the highest RSS of this process so far, in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+def _observe_peaks():
+    """Hand the memory peaks since the last sample to every tracker, and reset them."""
+    with _tracing_lock:
+        peaks = {"rss": _rss_status("VmHWM:") or _max_rss()}
+        _reset_peak_rss()
+        if tracemalloc.is_tracing():
+            peaks["tracemalloc"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        trackers = list(_trackers)
+    for tracker in trackers:
+        tracker._record_peaks(peaks)  # noqa: SLF001
+
+def _start_tracking(tracker):
+    """Register a search's tracker, starting tracemalloc if it traces allocations."""
+    global _tracing_users  # noqa: PLW0603
+    with _tracing_lock:
+        _trackers.add(tracker)
+        if not tracker.trace_allocations:
+            return
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_users = 1
+        elif _tracing_users:
+            _tracing_users += 1
+
+def _stop_tracking(tracker):
+    """Unregister a search's tracker, stopping tracemalloc when the last search tracing ends."""
+    global _tracing_users  # noqa: PLW0603
+    with _tracing_lock:
+        _trackers.discard(tracker)
+        if tracker.trace_allocations and _tracing_users:
+            _tracing_users -= 1
+            if _tracing_users == 0:
+                tracemalloc.stop()
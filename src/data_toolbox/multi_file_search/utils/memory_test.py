@@ -0,0 +1,94 @@
+import io
+import tracemalloc
+
+import pytest
+
+from data_toolbox.multi_file_search.engine import SearchEngine, SearchSpec
+from data_toolbox.multi_file_search.file_router.csv import search_csv
+from data_toolbox.multi_file_search.utils import memory
+from data_toolbox.multi_file_search.utils.memory import MemoryTracker
+from data_toolbox.multi_file_search.utils.run_statistics import FileStatistics
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+def csv_upload():
+    """Return a CSV upload with a hit in its first and last rows."""
+    upload = io.BytesIO(b"waldo,1\n" + b"a,2\n" * 200 + b"b,waldo\n")
+    upload.name = "table.csv"
+    return upload
+
+@pytest.mark.parametrize("trace_allocations", [False, True])
+def test_tracker_records_the_peak_memory_of_a_file(trace_allocations):
+    # Arrange
+    tracker = MemoryTracker(trace_allocations=trace_allocations)
+    file_statistics = FileStatistics(name="big.txt")
+    # Act
+    tracker.start()
+    with tracker.track_file(file_statistics):
+        block = b"x" * (8 * memory.MiB)
+        del block
+    tracker.stop()
+    # Assert
+    # (RSS may reuse memory this process freed earlier)
+    assert file_statistics.memory["parent_peak_bytes"] >= 6 * memory.MiB
+    assert tracker.summary()["parent_peak_bytes"] >= 6 * memory.MiB
+    assert tracker.summary()["parent_measure"] == ("tracemalloc" if trace_allocations else "rss")
+    assert not tracemalloc.is_tracing()
+
+def test_should_stream_only_over_budget():
+    # Arrange
+    within, over = FileStatistics(name="within.csv"), FileStatistics(name="over.csv")
+    tracker, no_budget = MemoryTracker(budget=0), MemoryTracker()
+    # Act
+    for started in (tracker, no_budget):
+        started.start()
+    with no_budget.track_file(within):
+        streamed_within = memory.should_stream()
+    with tracker.track_file(over):
+        block = b"x" * (4 * memory.MiB)  # noqa: F841
+        streamed_over = memory.should_stream()
+    for started in (tracker, no_budget):
+        started.stop()
+    # Assert
+    assert (streamed_within, streamed_over) == (False, True)
+    assert "streamed" not in within.memory
+    assert over.memory["streamed"] is True
+    assert memory.should_stream() is False
+
+def test_streamed_csv_finds_the_same_results(monkeypatch):
+    # Arrange
+    monkeypatch.setattr("data_toolbox.multi_file_search.file_router.csv.ROWS_PER_CHUNK", 50)
+    expected = search_csv(csv_upload(), ["waldo"], search_options)
+    tracker = MemoryTracker(budget=0)
+    file_statistics = FileStatistics(name="table.csv")
+    # Act
+    tracker.start()
+    with tracker.track_file(file_statistics):
+        block = b"x" * (4 * memory.MiB)  # noqa: F841
+        results = search_csv(csv_upload(), ["waldo"], search_options)
+    tracker.stop()
+    # Assert
+    assert file_statistics.memory["streamed"] is True
+    assert results == expected
+    assert len(results) == 2
+
+def test_measured_task_reports_the_rss_of_the_task():
+    # Act
+    result, rss_before, rss_peak = memory.measured_task(sum, ([1, 2, 3],))
+    # Assert
+    assert result == 6
+    assert 0 < rss_before <= rss_peak
+
+def test_search_job_records_memory_statistics():
+    # Arrange
+    job = SearchEngine(memory_budget=64 * memory.MiB).submit(
+        [("notes.txt", b"waldo\n"), ("table.csv", b"a,waldo\n")], SearchSpec(terms=["waldo"]))
+    # Act
+    results = list(job)
+    # Assert
+    summary = job.statistics.summary()["memory"]
+    assert len(results) == 2
+    assert summary["budget_bytes"] == 64 * memory.MiB
+    assert summary["parent_peak_bytes"] > 0
+    assert summary["streamed_files"] == 0
+    assert all("parent_peak_bytes" in file.memory for file in job.statistics.files)
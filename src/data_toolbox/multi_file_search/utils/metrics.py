@@ -0,0 +1,182 @@
+"""Search Metrics.
+
+Counters and histograms of the searches run by this process, in the Prometheus
+text format, so operations can watch throughput and latency under load:
+
+    - searches started, and ended by outcome (finished, cancelled, failed)
+    - search latency, and per-stage latency (run and file stages, see
+      RunStatistics)
+    - files searched by type and outcome, and bytes searched by type
+    - worker pool queue depth (tasks submitted and not finished), size and
+      readiness
+    - hits and misses of the caches registered with register_cache()
+
+The engine records a search once when it ends (see record_search), so the cost
+per search is a few dozen counter updates; nothing is recorded per line or per
+worker task. The pool and cache figures are read when metrics are scraped.
+
+Metrics are served by the search service at GET /metrics. The Streamlit app
+serves them on a local port when MFS_METRICS_PORT is set, and/or rewrites a
+file (for node_exporter's textfile collector) after every search when
+MFS_METRICS_FILE is set.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+    write_to_textfile,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from data_toolbox.multi_file_search.file_router.registry import supported_extensions
+from data_toolbox.multi_file_search.utils import worker_pool
+
+log = logging.getLogger("Toolbox")
+
+METRICS_PORT_ENVIRONMENT_VARIABLE = "MFS_METRICS_PORT"
+METRICS_FILE_ENVIRONMENT_VARIABLE = "MFS_METRICS_FILE"
+
+FINISHED = "finished"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# File type label of extensions no handler is registered for, so labels stay few
+OTHER_FILE_TYPE = "other"
+
+# Seconds, from a small file's sniff to a long search of a server path
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0, 300.0, 900.0, float("inf"))
+
+SEARCHES_STARTED = Counter(
+    "mfs_searches_started", "Searches started.")
+SEARCHES_ENDED = Counter(
+    "mfs_searches_ended", "Searches ended, by outcome (finished, cancelled, failed).",
+    ["outcome"])
+SEARCH_SECONDS = Histogram(
+    "mfs_search_duration_seconds", "Time from the start of a search until it ended.",
+    buckets=LATENCY_BUCKETS)
+STAGE_SECONDS = Histogram(
+    "mfs_stage_duration_seconds",
+    "Time spent in a stage: per search for run stages, per file for file stages.",
+    ["scope", "stage"], buckets=LATENCY_BUCKETS)
+FILES_SEARCHED = Counter(
+    "mfs_files_searched", "Files searched, by file type and outcome (ok, error).",
+    ["file_type", "outcome"])
+BYTES_SEARCHED = Counter(
+    "mfs_searched_bytes", "Bytes of the files searched, by file type.", ["file_type"])
+RESULTS_FOUND = Counter(
+    "mfs_results", "Result rows found.")
+QUEUE_DEPTH = Gauge(
+    "mfs_worker_pool_queue_depth", "Tasks submitted to the worker pool and not finished.")
+QUEUE_DEPTH.set_function(worker_pool.pending_tasks)
+WORKERS = Gauge(
+    "mfs_worker_pool_workers", "Worker processes of the worker pool.")
+WORKERS.set_function(worker_pool.worker_count)
+READY = Gauge(
+    "mfs_worker_pool_ready", "1 once the worker pool's workers are warm, else 0.")
+READY.set_function(lambda: float(worker_pool.is_ready()))
+
+# Name -> functools.lru_cache wrapped function, see register_cache()
+_caches = {}
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+class _CacheCollector:
+    """Report the hits and misses of the registered caches when scraped."""
+
+    def collect(self):
+        """Yield the cache metrics (see prometheus_client's custom collectors)."""
+        hits = CounterMetricFamily("mfs_cache_hits", "Cache hits, by cache.", labels=["cache"])
+        misses = CounterMetricFamily(
+            "mfs_cache_misses", "Cache misses, by cache.", labels=["cache"])
+        ratio = GaugeMetricFamily(
+            "mfs_cache_hit_ratio", "Share of lookups that hit, by cache.", labels=["cache"])
+        for name, cached_function in sorted(_caches.items()):
+            info = cached_function.cache_info()
+            hits.add_metric([name], info.hits)
+            misses.add_metric([name], info.misses)
+            lookups = info.hits + info.misses
+            ratio.add_metric([name], info.hits / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+REGISTRY.register(_CacheCollector())
+
+
+def register_cache(name, cached_function) -> None:
+    """Report the hits and misses of a functools.lru_cache wrapped function as a named cache."""
+    _caches[name] = cached_function
+
+def search_started() -> None:
+    """Count a search that started."""
+    SEARCHES_STARTED.inc()
+
+def record_search(statistics, outcome) -> None:
+    """Record a search that ended, from its RunStatistics.
+
+    Args:
+    ----
+        statistics (RunStatistics): the search's statistics, once it finished
+        outcome (str): FINISHED, CANCELLED or FAILED
+
+    """
+    SEARCHES_ENDED.labels(outcome).inc()
+    SEARCH_SECONDS.observe(statistics.seconds)
+    for stage, seconds in statistics.stages.items():
+        STAGE_SECONDS.labels("run", stage).observe(seconds)
+    known_types = supported_extensions()
+    for file in statistics.files:
+        file_type = file.file_type if file.file_type in known_types else OTHER_FILE_TYPE
+        FILES_SEARCHED.labels(file_type, "error" if file.error else "ok").inc()
+        BYTES_SEARCHED.labels(file_type).inc(file.bytes or 0)
+        RESULTS_FOUND.inc(file.results)
+        for stage, seconds in file.stages.items():
+            STAGE_SECONDS.labels("file", stage).observe(seconds)
+    _write_metrics_file()
+
+def record_stage(stage, seconds) -> None:
+    """Record a run stage timed after the search ended (e.g. the Excel export)."""
+    STAGE_SECONDS.labels("run", stage).observe(seconds)
+
+def latest() -> tuple:
+    """Return the current metrics in the Prometheus text format, and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+def start_exporter() -> None:
+    """Serve the metrics on MFS_METRICS_PORT, if set; safe to call on every page run."""
+    global _exporter_started  # noqa: PLW0603
+    port = os.environ.get(METRICS_PORT_ENVIRONMENT_VARIABLE, "").strip()
+    with _exporter_lock:
+        if _exporter_started or not port:
+            return
+        _exporter_started = True
+        try:
+            start_http_server(int(port))
+        except (OSError, ValueError):
+            log.exception("Multi-File Search metrics could not be served on port %s", port)
+            return
+    log.info("Multi-File Search metrics served on port %s", port)
+
+def _write_metrics_file():
+    """Rewrite MFS_METRICS_FILE, if set, with the current metrics."""
+    path = os.environ.get(METRICS_FILE_ENVIRONMENT_VARIABLE, "").strip()
+    if not path:
+        return
+    try:
+        # Written to a temporary file and renamed, so readers never see half a file
+        write_to_textfile(path, REGISTRY)
+    except OSError:
+        log.exception("Multi-File Search metrics could not be written to %s", path)
@@ -0,0 +1,81 @@
+import functools
+
+from prometheus_client import REGISTRY
+
+from data_toolbox.multi_file_search.engine import SearchEngine, SearchSpec
+from data_toolbox.multi_file_search.utils import metrics, worker_pool
+
+
+def sample(name, **labels):
+    """Return the current value of a metric sample (0 when it was never recorded)."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_finished_search_is_recorded():
+    # Arrange
+    before = {
+        "started": sample("mfs_searches_started_total"),
+        "finished": sample("mfs_searches_ended_total", outcome="finished"),
+        "csv": sample("mfs_files_searched_total", file_type="csv", outcome="ok"),
+        "other": sample("mfs_files_searched_total", file_type="other", outcome="ok"),
+        "bytes": sample("mfs_searched_bytes_total", file_type="csv"),
+        "matching": sample("mfs_stage_duration_seconds_count", scope="file", stage="matching"),
+        "search": sample("mfs_stage_duration_seconds_count", scope="run", stage="search"),
+    }
+    # (files of unregistered types are sniffed, e.g. as text)
+    files = [("table.csv", b"a,waldo\n"), ("notes.unknown", b"waldo\n")]
+    # Act
+    list(SearchEngine().search(files, SearchSpec(terms=["waldo"])))
+    # Assert
+    assert sample("mfs_searches_started_total") == before["started"] + 1
+    assert sample("mfs_searches_ended_total", outcome="finished") == before["finished"] + 1
+    assert sample("mfs_files_searched_total", file_type="csv", outcome="ok") == before["csv"] + 1
+    assert sample("mfs_files_searched_total",
+                  file_type="other", outcome="ok") == before["other"] + 1
+    assert sample("mfs_searched_bytes_total", file_type="csv") == before["bytes"] + 8
+    assert sample("mfs_stage_duration_seconds_count",
+                  scope="file", stage="matching") > before["matching"]
+    assert sample("mfs_stage_duration_seconds_count",
+                  scope="run", stage="search") == before["search"] + 1
+
+def test_abandoned_search_counts_as_cancelled():
+    # Arrange
+    cancelled = sample("mfs_searches_ended_total", outcome="cancelled")
+    results = SearchEngine().search(
+        [("one.txt", b"waldo\n"), ("two.txt", b"waldo\n")], SearchSpec(terms=["waldo"]))
+    # Act
+    next(results)
+    results.close()
+    # Assert
+    assert sample("mfs_searches_ended_total", outcome="cancelled") == cancelled + 1
+
+def test_registered_cache_hit_ratio_is_reported():
+    # Arrange
+    @functools.lru_cache
+    def double(number):
+        return 2 * number
+    metrics.register_cache("test_double", double)
+    # Act
+    for number in (1, 1, 1, 2):
+        double(number)
+    # Assert
+    assert sample("mfs_cache_hits_total", cache="test_double") == 2
+    assert sample("mfs_cache_misses_total", cache="test_double") == 2
+    assert sample("mfs_cache_hit_ratio", cache="test_double") == 0.5
+
+def test_queue_depth_counts_unfinished_worker_tasks():
+    # Act
+    future = worker_pool.submit(sum, [1, 2])
+    depth_while_queued = sample("mfs_worker_pool_queue_depth")
+    worker_pool.result(future)
+    # Assert
+    assert depth_while_queued >= 1
+    assert sample("mfs_worker_pool_queue_depth") == worker_pool.pending_tasks() == 0
+
+def test_metrics_file_is_written_after_a_search(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "mfs.prom"
+    monkeypatch.setenv(metrics.METRICS_FILE_ENVIRONMENT_VARIABLE, str(path))
+    # Act
+    list(SearchEngine().search([("notes.txt", b"waldo\n")], SearchSpec(terms=["waldo"])))
+    # Assert
+    assert "mfs_searches_started_total" in path.read_text()
@@ -0,0 +1,220 @@
+"""Search Profiling.
+
+Profile one search, across the threads searching its files and the worker
+processes their handlers hand work to, e.g. to find out why a search of
+production data is slow without reproducing it locally.
+
+Two profiles are collected together:
+
+    - a deterministic cProfile profile (every call, with call counts), which
+      can be downloaded as a .pstats file for pstats / snakeviz
+    - sampled call stacks, counted in the "collapsed stacks" format that
+      flamegraph.pl, speedscope and inferno read
+
+Threads take part once they enter SearchProfile.profile_thread(); tasks they
+submit to the worker pool are then run under a profiler in the worker and
+their profile is merged back (see worker_pool.submit). Without a profile
+nothing is wrapped, so the cost when profiling is off is one thread-local
+lookup per worker task.
+
+Each thread runs its own cProfile profiler. Python 3.12 and later allow only
+one active profiler per process ("Another profiling tool is already active"),
+so there a thread whose profiler cannot be enabled, e.g. a second file searched
+at the same time, is covered by the stack sampler alone.
+
+Tasks of the process pools tabular_search and document_search start for
+themselves are not profiled in the worker, and threads started by handlers
+(archive members) are not followed.
+"""
+from __future__ import annotations
+
+import collections
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+from contextlib import contextmanager
+
+# Seconds between two samples of the call stacks
+SAMPLE_INTERVAL = 0.005
+
+# The profile of the current thread, see SearchProfile.profile_thread()
+_current = threading.local()
+
+
+class _RawStats:
+    """cProfile statistics (Profile.stats) in the form pstats.Stats loads."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        """Nothing to do, the statistics are complete."""
+
+
+class StackSampler:
+    """Count the call stacks of a set of threads, sampled by a background thread."""
+
+    def __init__(self, thread_ids=(), interval=SAMPLE_INTERVAL):
+        """Prepare to sample the given threads (more can be added to thread_ids)."""
+        self.thread_ids = set(thread_ids)
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _sample(self):
+        """Sample until stopped."""
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()  # noqa: SLF001
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[collapsed_stack(frame)] += 1
+
+
+class SearchProfile:
+    """The profile of one search: cProfile statistics and sampled stacks.
+
+    Attributes
+    ----------
+        interval (float): seconds between two stack samples
+
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        """Prepare an empty profile; call start() before searching."""
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stats = pstats.Stats()
+        self._stacks = collections.Counter()
+        self._sampler = StackSampler(interval=interval)
+
+    def start(self) -> None:
+        """Start sampling the stacks of the threads taking part."""
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling; the profile is complete."""
+        self._sampler.stop()
+        with self._lock:
+            self._stacks.update(self._sampler.stacks)
+            self._sampler.stacks.clear()
+
+    @contextmanager
+    def profile_thread(self):
+        """Profile the current thread (and its worker tasks) for the body of a with statement."""
+        thread_id = threading.get_ident()
+        previous = getattr(_current, "profile", None)
+        _current.profile = self
+        self._sampler.thread_ids.add(thread_id)
+        profile = _enabled_profiler()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._sampler.thread_ids.discard(thread_id)
+            _current.profile = previous
+            if profile is not None:
+                profile.create_stats()
+                self.add(profile.stats, {})
+
+    def add(self, stats, stacks) -> None:
+        """Merge cProfile statistics and stack counts (e.g. from a worker) into the profile."""
+        with self._lock:
+            if stats:
+                self._stats.add(_RawStats(stats))
+            self._stacks.update(stacks)
+
+    @property
+    def stats(self) -> dict:
+        """The merged cProfile statistics, as pstats.Stats.stats."""
+        return self._stats.stats
+
+    def pstats_bytes(self) -> bytes:
+        """Return the statistics in the file format of pstats.Stats.dump_stats()."""
+        with self._lock:
+            return marshal.dumps(self._stats.stats)
+
+    def collapsed_stacks(self) -> str:
+        """Return the sampled stacks, one "frame;frame;frame count" line per stack."""
+        with self._lock:
+            return "".join(
+                f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def top_functions(self, limit=30) -> str:
+        """Return the pstats report of the functions with the most cumulative time."""
+        stream = io.StringIO()
+        with self._lock:
+            if self._stats.stats:
+                self._stats.stream = stream
+                self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return stream.getvalue()
+
+
+def current_profile() -> SearchProfile | None:
+    """Return the profile the current thread takes part in, if any."""
+    return getattr(_current, "profile", None)
+
+def profiled_task(fn, args, interval):
+    """Run a worker task under cProfile and a stack sampler (worker side).
+
+    Returns
+    -------
+        tuple: (the task's result, cProfile statistics, stack counts)
+
+    """
+    sampler = StackSampler([threading.get_ident()], interval)
+    sampler.start()
+    profile = _enabled_profiler()
+    try:
+        result = fn(*args)
+    finally:
+        if profile is not None:
+            profile.disable()
+        sampler.stop()
+    if profile is None:
+        return result, {}, dict(sampler.stacks)
+    profile.create_stats()
+    return result, profile.stats, dict(sampler.stacks)
+
+def _enabled_profiler():
+    """Return an enabled cProfile profiler, or None if another profiler is active.
+
+    Python 3.12+ raises ValueError when a second profiler is enabled in the
+    process; the stack sampler still covers the thread.
+    """
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        return None
+    return profile
+
+def collapsed_stack(frame) -> str:
+    """Return a frame's call stack, outermost first, as "function (file:line);...".
+
+    Frames of the profiler and the sampler themselves are left out.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename != __file__:
+            file_name = os.path.basename(code.co_filename)
+            names.append(f"{code.co_name} ({file_name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
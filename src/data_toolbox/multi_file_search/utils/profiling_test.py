@@ -0,0 +1,132 @@
+import cProfile
+import marshal
+import pstats
+import threading
+import time
+
+from data_toolbox.multi_file_search.engine import SearchEngine, SearchSpec
+from data_toolbox.multi_file_search.utils import profiling, worker_pool
+from data_toolbox.multi_file_search.utils.profiling import SearchProfile
+
+
+def busy_task(seconds):
+    """Worker task that keeps the CPU busy."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+    return seconds
+
+
+def function_names(stats):
+    return {function for _, _, function in stats}
+
+def test_profile_covers_worker_tasks_and_samples_stacks():
+    # Arrange
+    profile = SearchProfile(interval=0.001)
+    # Act
+    profile.start()
+    with profile.profile_thread():
+        result = worker_pool.result(worker_pool.submit(busy_task, 0.05))
+    profile.stop()
+    # Assert
+    assert result == 0.05
+    assert {"busy_task", "result"} <= function_names(profile.stats)
+    assert "busy_task (profiling_test.py:" in profile.collapsed_stacks()
+    assert "busy_task" in profile.top_functions()
+
+def test_pstats_bytes_load_with_pstats(tmp_path):
+    # Arrange
+    profile = SearchProfile()
+    with profile.profile_thread():
+        sorted(range(1000))
+    path = tmp_path / "search.pstats"
+    # Act
+    path.write_bytes(profile.pstats_bytes())
+    # Assert
+    assert marshal.loads(path.read_bytes()) == profile.stats
+    assert "sorted" in str(function_names(pstats.Stats(str(path)).stats))
+
+def test_worker_tasks_are_not_wrapped_without_a_profile():
+    # Act
+    future = worker_pool.submit(busy_task, 0)
+    # Assert
+    assert profiling.current_profile() is None
+    assert future.profile is None
+    assert worker_pool.result(future) == 0
+
+def test_search_engine_profiles_a_search():
+    # Arrange
+    profile = SearchProfile()
+    # Act
+    results = list(SearchEngine().search(
+        [("notes.txt", b"waldo\n")], SearchSpec(terms=["waldo"]), profile=profile))
+    # Assert
+    assert len(results) == 1
+    assert "search_txt" in function_names(profile.stats)
+
+class OneActiveProfiler(cProfile.Profile):
+    """cProfile.Profile allowing one enabled profiler per process, like Python 3.12+."""
+
+    active = None
+    lock = threading.Lock()
+
+    def enable(self, *args, **kwargs):
+        with OneActiveProfiler.lock:
+            if OneActiveProfiler.active is not None:
+                raise ValueError("Another profiling tool is already active")
+            OneActiveProfiler.active = self
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        with OneActiveProfiler.lock:
+            OneActiveProfiler.active = None
+
+def search_first_file():
+    busy_task(0.05)
+
+def search_second_file():
+    busy_task(0.05)
+
+def test_two_files_profiled_at_the_same_time(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(profiling.cProfile, "Profile", OneActiveProfiler)
+    profile = SearchProfile(interval=0.001)
+    both_profiled = threading.Barrier(2)
+    errors = []
+    def search_file(search):
+        try:
+            with profile.profile_thread():
+                both_profiled.wait(timeout=5)
+                search()
+        except Exception as error:  # noqa: BLE001
+            errors.append(error)
+    threads = [threading.Thread(target=search_file, args=(search,))
+               for search in (search_first_file, search_second_file)]
+    # Act
+    profile.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profile.stop()
+    # Assert
+    assert errors == []
+    # (one thread's cProfile profiler could not be enabled, ...)
+    names = function_names(profile.stats)
+    assert ("search_first_file" in names) != ("search_second_file" in names)
+    # (... but the sampler covers both threads)
+    stacks = profile.collapsed_stacks()
+    assert "search_first_file" in stacks
+    assert "search_second_file" in stacks
+
+def test_search_engine_profiles_files_searched_at_the_same_time(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(profiling.cProfile, "Profile", OneActiveProfiler)
+    profile = SearchProfile()
+    files = [(f"notes{number}.txt", b"waldo\n" * 2000) for number in range(4)]
+    # Act
+    results = list(SearchEngine().search(files, SearchSpec(terms=["waldo"]), profile=profile))
+    # Assert
+    assert len(results) == 4 * 2000
+    assert not [result for result in results if "Error" in result.location]
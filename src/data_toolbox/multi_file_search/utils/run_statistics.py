@@ -0,0 +1,253 @@
+"""Run Statistics.
+
+Where the time of a search went, per stage and per file, and how much was
+searched (bytes, lines, cells, pages...).
+
+The engine measures each file in the thread searching it (see measure_file);
+handlers and utilities mark their stages with stage() and report what they
+searched with count(). Outside a measured file both do nothing, so handlers
+called directly (tests, benchmarks) pay almost nothing for them.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from data_toolbox.utils.files import determine_file_extension
+
+log = logging.getLogger("Toolbox")
+
+# Time of a file not spent in a measured stage: reading and parsing it
+PARSING_STAGE = "parsing"
+
+# The file measured by the current thread, see measure_file()
+_current = threading.local()
+
+
+@dataclass
+class FileStatistics:
+    """How searching one file went.
+
+    Attributes
+    ----------
+        name (str): file name, as in its results
+        file_type (str): file extension
+        bytes (int | None): file size, when known
+        seconds (float): time spent searching the file
+        stages (dict): seconds per stage ("sniff", "detect_encoding",
+        "pool_startup", "matching", "parsing"...)
+        counts (dict): what was searched, per unit ("lines", "cells", "pages"...)
+        results (int): result rows
+        error (bool): whether the file could not be read
+        memory (dict): peak memory ("parent_peak_bytes", "worker_peak_bytes",
+        and "streamed" when it was searched on a streaming path), see memory.py
+
+    """
+
+    name: str
+    file_type: str = ""
+    bytes: int | None = None
+    seconds: float = 0.0
+    stages: dict = field(default_factory=dict)
+    counts: dict = field(default_factory=dict)
+    results: int = 0
+    error: bool = False
+    memory: dict = field(default_factory=dict)
+
+    def add_stage(self, name, seconds) -> None:
+        """Add time spent in a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a JSON serialisable dictionary."""
+        return {
+            "name": self.name,
+            "file_type": self.file_type,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 6),
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            "counts": dict(self.counts),
+            "results": self.results,
+            "error": self.error,
+            "memory": dict(self.memory),
+        }
+
+
+@dataclass
+class RunStatistics:
+    """How a search went.
+
+    Attributes
+    ----------
+        files (list): FileStatistics, in the order the files finished
+        stages (dict): seconds per run stage ("crawl", "search", and the
+        "results_table" / "excel_export" of the user interface)
+        seconds (float): time from the start of the search until it finished
+        memory (dict): peak memory of the run and its budget, see
+        MemoryTracker.summary()
+
+    """
+
+    files: list = field(default_factory=list)
+    stages: dict = field(default_factory=dict)
+    seconds: float = 0.0
+    memory: dict = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def add_stage(self, name, seconds) -> None:
+        """Add time spent in a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        """Time the body of a with statement as a stage of the run."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start_time)
+
+    def finish(self) -> None:
+        """Record the time since the search started."""
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def bytes(self) -> int:
+        """Bytes of the files searched (of those whose size is known)."""
+        return sum(file.bytes or 0 for file in self.files)
+
+    @property
+    def counts(self) -> dict:
+        """Lines, cells, pages... searched, summed over the files."""
+        totals = {}
+        for file in self.files:
+            for unit, amount in file.counts.items():
+                totals[unit] = totals.get(unit, 0) + amount
+        return totals
+
+    @property
+    def file_stages(self) -> dict:
+        """Seconds per file stage, summed over the files (files overlap in time)."""
+        totals = {}
+        for file in self.files:
+            for name, seconds in file.stages.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        """Throughput of the search stage."""
+        seconds = self.stages.get("search")
+        return self.bytes / seconds if seconds else None
+
+    def summary(self) -> dict:
+        """Return the totals of the run, without the files."""
+        return {
+            "seconds": round(self.seconds, 6),
+            "files": len(self.files),
+            "errors": sum(file.error for file in self.files),
+            "results": sum(file.results for file in self.files),
+            "bytes": self.bytes,
+            "bytes_per_second": round(self.bytes_per_second or 0, 1),
+            "counts": self.counts,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "file_stages": {
+                name: round(seconds, 6) for name, seconds in self.file_stages.items()},
+            "memory": {
+                **self.memory,
+                "streamed_files": sum(bool(file.memory.get("streamed")) for file in self.files),
+            },
+        }
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a JSON serialisable dictionary."""
+        return {**self.summary(), "file_statistics": [file.to_dict() for file in self.files]}
+
+    @classmethod
+    def from_dict(cls, statistics) -> RunStatistics:
+        """Rebuild statistics from to_dict() (e.g. sent by the search service)."""
+        return cls(
+            files=[FileStatistics(**file) for file in statistics.get("file_statistics", [])],
+            stages=dict(statistics.get("stages", {})),
+            seconds=statistics.get("seconds", 0.0),
+            memory={key: value for key, value in statistics.get("memory", {}).items()
+                    if key != "streamed_files"},
+        )
+
+    def log(self) -> None:
+        """Log the run's totals, and each file's statistics at debug level."""
+        log.info("Multi-File Search run statistics: %s", json.dumps(self.summary()))
+        if log.isEnabledFor(logging.DEBUG):
+            for file in self.files:
+                log.debug("Multi-File Search file statistics: %s", json.dumps(file.to_dict()))
+
+
+@contextmanager
+def measure_file(file_statistics):
+    """Time the search of one file in this thread, collecting its stages and counts.
+
+    Time not spent in a stage is recorded as the "parsing" stage.
+    """
+    previous = getattr(_current, "file", None)
+    _current.file = file_statistics
+    start_time = time.perf_counter()
+    try:
+        yield file_statistics
+    finally:
+        _current.file = previous
+        file_statistics.seconds = time.perf_counter() - start_time
+        measured = sum(file_statistics.stages.values())
+        file_statistics.add_stage(PARSING_STAGE, max(0.0, file_statistics.seconds - measured))
+
+@contextmanager
+def stage(name):
+    """Time the body of a with statement as a stage of the file being measured."""
+    file_statistics = getattr(_current, "file", None)
+    if file_statistics is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        file_statistics.add_stage(name, time.perf_counter() - start_time)
+
+def count(unit, amount) -> None:
+    """Record that amount lines / cells / pages... of the file being measured were searched."""
+    file_statistics = getattr(_current, "file", None)
+    if file_statistics is not None:
+        file_statistics.counts[unit] = file_statistics.counts.get(unit, 0) + amount
+
+def file_statistics_for(name, file) -> FileStatistics:
+    """Start the statistics of a file about to be searched."""
+    return FileStatistics(
+        name=name,
+        file_type=determine_file_extension(os.path.basename(name).lower()),
+        bytes=file_size(file),
+    )
+
+def file_size(file) -> int | None:
+    """Return the size of a path, (name, bytes) pair or file-like object, if known."""
+    if isinstance(file, (str, os.PathLike)):
+        try:
+            return os.path.getsize(file)
+        except OSError:
+            return None
+    if isinstance(file, tuple):
+        return len(file[1])
+    size = getattr(file, "size", None)
+    if isinstance(size, int):
+        return size
+    try:
+        position = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return size
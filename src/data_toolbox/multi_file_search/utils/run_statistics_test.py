@@ -0,0 +1,59 @@
+import io
+
+from data_toolbox.multi_file_search.utils import run_statistics
+from data_toolbox.multi_file_search.utils.run_statistics import (
+    FileStatistics,
+    RunStatistics,
+    file_size,
+)
+
+
+def test_stages_and_counts_are_recorded_for_the_measured_file_only():
+    # Arrange
+    file_statistics = FileStatistics(name="a.txt")
+    # Act
+    with run_statistics.measure_file(file_statistics):
+        with run_statistics.stage("matching"):
+            pass
+        run_statistics.count("lines", 10)
+        run_statistics.count("lines", 5)
+    with run_statistics.stage("matching"):
+        run_statistics.count("lines", 100)
+    # Assert
+    assert file_statistics.counts == {"lines": 15}
+    assert set(file_statistics.stages) == {"matching", "parsing"}
+    assert sum(file_statistics.stages.values()) >= file_statistics.seconds - 1e-6
+
+def test_run_statistics_totals_and_round_trips():
+    # Arrange
+    statistics = RunStatistics(files=[
+        FileStatistics(name="a.txt", bytes=100, stages={"matching": 1.0},
+                       counts={"lines": 10}, results=2),
+        FileStatistics(name="b.csv", bytes=None, stages={"matching": 0.5},
+                       counts={"cells": 4}, error=True),
+    ])
+    statistics.add_stage("search", 2.0)
+    # Act
+    summary = statistics.summary()
+    copy = RunStatistics.from_dict(statistics.to_dict())
+    # Assert
+    assert (summary["files"], summary["errors"], summary["results"]) == (2, 1, 2)
+    assert summary["bytes"] == 100
+    assert summary["bytes_per_second"] == 50
+    assert summary["counts"] == {"lines": 10, "cells": 4}
+    assert summary["file_stages"] == {"matching": 1.5}
+    assert copy.files == statistics.files
+    assert copy.stages == statistics.stages
+
+def test_file_size_of_paths_pairs_and_streams(tmp_path):
+    # Arrange
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"12345")
+    stream = io.BytesIO(b"123")
+    stream.read(1)
+    # Act / Assert
+    assert file_size(path) == 5
+    assert file_size(("b.txt", b"12")) == 2
+    assert file_size(stream) == 3
+    assert stream.tell() == 1
+    assert file_size(tmp_path / "missing.txt") is None
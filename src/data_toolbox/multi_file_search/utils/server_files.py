@@ -0,0 +1,149 @@
+"""Server Files.
+
+Search files on a volume mounted into the container instead of uploading them.
+
+Only directories listed in the MFS_SERVER_PATHS environment variable (separated
+by os.pathsep, e.g. "/data/corpus:/mnt/evidence") and their subdirectories can
+be searched. Files are opened straight from disk, so TXT / CSV search can
+memory-map them and PDF / PPTX workers open them by path without a copy.
+"""
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+
+from data_toolbox.multi_file_search.file_router.registry import supported_extensions
+from data_toolbox.multi_file_search.file_router.router import router
+from data_toolbox.utils.files import determine_file_extension, human_readable_size_of
+
+SERVER_PATHS_ENVIRONMENT_VARIABLE = "MFS_SERVER_PATHS"
+
+# Most files one crawl will return
+MAX_SERVER_FILES = 100_000
+
+
+def allowed_roots() -> list[Path]:
+    """Return the resolved directories that may be searched."""
+    configured = os.environ.get(SERVER_PATHS_ENVIRONMENT_VARIABLE, "")
+    return [
+        Path(root).resolve()
+        for root in configured.split(os.pathsep)
+        if root.strip() and Path(root).is_dir()
+    ]
+
+def is_allowed(path) -> bool:
+    """Check if a path (after resolving symlinks and "..") is inside an allowed root."""
+    resolved = Path(path).resolve()
+    return any(resolved == root or root in resolved.parents for root in allowed_roots())
+
+
+@dataclass(frozen=True)
+class ServerPathSearch:
+    """A directory tree on the server to search, and which of its files to include.
+
+    Attributes
+    ----------
+        path (str): directory to crawl, inside one of the allowed roots
+        include (tuple): glob patterns, a file must match one of them
+        exclude (tuple): glob patterns for files and directories to leave out
+        max_file_size (int): size in bytes above which files are skipped
+
+    Patterns are matched against the path relative to ``path`` ("2023/*.pdf")
+    and against the bare file or directory name ("*.pdf").
+
+    """
+
+    path: str
+    include: tuple = ("*",)
+    exclude: tuple = ()
+    max_file_size: int | None = None
+
+    def crawl(self, max_files=MAX_SERVER_FILES):
+        """Walk the directory tree, keeping the files the router can search.
+
+        Args:
+        ----
+            max_files (int): most files to return
+
+        Returns:
+        -------
+            tuple: (paths of the files to search, results for skipped files)
+
+        Raises:
+        ------
+            PermissionError: if the path is outside the allowed roots
+
+        """
+        root = Path(self.path).resolve()
+        if not is_allowed(root) or not root.is_dir():
+            error = f"{self.path} is not a directory this server allows searching"
+            raise PermissionError(error)
+
+        files, skipped = [], []
+        directories = [root]
+        while directories:
+            directory = directories.pop()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                skipped.append(skipped_result(directory, "directory could not be read"))
+                continue
+            subdirectories = []
+            for entry in entries:
+                relative_path = Path(entry.path).relative_to(root).as_posix()
+                if self._matches(self.exclude, relative_path, entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(Path(entry.path))
+                    continue
+                if not entry.is_file() or not self._matches(
+                        self.include, relative_path, entry.name):
+                    continue
+                if determine_file_extension(entry.name.lower()) not in supported_extensions():
+                    continue
+                # Symlinks may only point at files inside the allowed roots
+                if entry.is_symlink() and not is_allowed(entry.path):
+                    skipped.append(skipped_result(entry.path, "links outside the allowed paths"))
+                    continue
+                size = entry.stat().st_size
+                if self.max_file_size is not None and size > self.max_file_size:
+                    skipped.append(skipped_result(
+                        entry.path, f"larger than {human_readable_size_of(self.max_file_size)}"))
+                    continue
+                if len(files) == max_files:
+                    skipped.append(skipped_result(str(root), f"more than {max_files} files"))
+                    return files, skipped
+                files.append(Path(entry.path))
+            # Visit subdirectories in name order
+            directories.extend(reversed(subdirectories))
+        return files, skipped
+
+    @staticmethod
+    def _matches(patterns, relative_path, name):
+        """Check a path against glob patterns."""
+        return any(
+            fnmatch(relative_path, pattern) or fnmatch(name, pattern) for pattern in patterns
+        )
+
+
+def search_server_file(path, search_terms, search_options):
+    """Open a crawled file from disk and route it to its handler.
+
+    The file is reported under its full path on the server.
+    """
+    try:
+        file = open(path, "rb")  # noqa: SIM115
+    except OSError:
+        return [{
+            "file": str(path),
+            "location": "Error reading file",
+        }]
+    with file:
+        return router(file, search_terms, search_options)
+
+def skipped_result(name, reason):
+    """Build the result reported for a file that is not searched."""
+    return {
+        "file": str(name),
+        "location": f"Skipped, {reason}",
+    }
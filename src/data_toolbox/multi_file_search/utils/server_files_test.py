@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from data_toolbox.multi_file_search.utils.server_files import (
+    ServerPathSearch,
+    allowed_roots,
+    search_server_file,
+)
+
+search_options = {"mode": "regular", "case-sensitive": False, "whole-word": False}
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """An allowed root holding a small tree of files, and a directory outside it."""
+    root = tmp_path / "corpus"
+    (root / "2023" / "drafts").mkdir(parents=True)
+    (root / "a.txt").write_text("waldo")
+    (root / "2023" / "b.csv").write_text("name\nwaldo")
+    (root / "2023" / "drafts" / "c.txt").write_text("draft")
+    (root / "2023" / "image.png").write_bytes(b"\x89PNG")
+    (root / "big.txt").write_text("x" * 2048)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("waldo")
+    monkeypatch.setenv("MFS_SERVER_PATHS", str(root))
+    return root
+
+def test_allowed_roots_ignores_missing_directories(corpus, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("MFS_SERVER_PATHS", os.pathsep.join([str(corpus), "/does/not/exist"]))
+    # Act
+    roots = allowed_roots()
+    # Assert
+    assert roots == [corpus.resolve()]
+
+def test_crawl_lists_supported_files_in_name_order(corpus):
+    # Arrange
+    search = ServerPathSearch(path=str(corpus))
+    # Act
+    files, skipped = search.crawl()
+    # Assert
+    assert [path.relative_to(corpus).as_posix() for path in files] == [
+        "a.txt", "big.txt", "2023/b.csv", "2023/drafts/c.txt",
+    ]
+    assert skipped == []
+
+def test_crawl_applies_globs_and_size_limit(corpus):
+    # Arrange
+    search = ServerPathSearch(
+        path=str(corpus), include=("*.txt",), exclude=("drafts",), max_file_size=1024)
+    # Act
+    files, skipped = search.crawl()
+    # Assert
+    assert [path.name for path in files] == ["a.txt"]
+    assert skipped == [{"file": str(corpus / "big.txt"), "location": "Skipped, larger than 1.0KiB"}]
+
+def test_crawl_rejects_paths_outside_allowed_roots(corpus):
+    # Arrange
+    search = ServerPathSearch(path=str(corpus / ".." / "outside"))
+    # Act / Assert
+    with pytest.raises(PermissionError):
+        search.crawl()
+
+def test_crawl_skips_links_out_of_allowed_roots(corpus):
+    # Arrange
+    (corpus / "link.txt").symlink_to(corpus.parent / "outside" / "secret.txt")
+    search = ServerPathSearch(path=str(corpus), include=("link.txt",))
+    # Act
+    files, skipped = search.crawl()
+    # Assert
+    assert files == []
+    assert skipped == [{
+        "file": str(corpus / "link.txt"),
+        "location": "Skipped, links outside the allowed paths",
+    }]
+
+def test_search_server_file_opens_file_from_disk(corpus):
+    # Act
+    result = search_server_file(corpus / "a.txt", ["waldo"], search_options)
+    # Assert
+    assert result == [{
+        "file": str(corpus / "a.txt"),
+        "location": " Line 1 of 1",
+        "search_terms": "waldo",
+        "original_content": "waldo",
+    }]
@@ -4,12 +4,25 @@ A collection of utilities for the Multi-File Search tool.
 """
 import re
 import os
+import codecs
+from collections import deque
 from io import BytesIO
+import shutil
+import tempfile
 import concurrent.futures
-import numpy as np
+from contextlib import contextmanager
+from pathlib import Path
 
-import chardet
-import pandas as pd
+# pandas and numpy are imported where they are used, so that importing the
+# file router does not import them before a spreadsheet is searched
+from chardet.universaldetector import UniversalDetector
+
+from data_toolbox.multi_file_search.utils import run_statistics, worker_pool
+
+# Bytes read from a file per incremental decode / encoding detection step
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Lines handed to a worker process per task when streaming a document
+STREAM_LINES_PER_TASK = 10_000
 
 
 # Global variables and helper functions for document search multiprocessing
@@ -43,6 +56,22 @@ def process_document_chunk(chunk):
             })
     return chunk_results
 
+def process_line_chunk(chunk, search_terms, search_options):
+    """Search (key, text) records, returning (key, matched_terms, text) for hits.
+
+    Keys are line numbers for stream_document_search, where the final location
+    string is only known once the whole file has been read, and
+    (location_context, location) pairs for stream_record_search.
+    """
+    chunk_results = []
+    for key, line in chunk:
+        matched_terms_in_line = [
+            term for term in search_terms if match_function(line, term, search_options)
+        ]
+        if matched_terms_in_line:
+            chunk_results.append((key, matched_terms_in_line, line))
+    return chunk_results
+
 
 # Global variables and helper functions for tabular search multiprocessing
 _worker_tabular_columns = None
@@ -84,6 +113,8 @@ def process_tabular_chunk(chunk):
 
 def data_frame_to_excel(df):
     """Convert Data Frame to Excel."""
+    import pandas as pd
+
     output_xlsx_file = BytesIO()
     with pd.ExcelWriter(output_xlsx_file, engine="xlsxwriter") as writer:
         df.to_excel(writer, index=False)
@@ -91,14 +122,84 @@ def data_frame_to_excel(df):
     return output_xlsx_file
 
 def detect_encoding(file):
-    """Detect a files encoding."""
-    content = file.read()
-    encoding = chardet.detect(content)["encoding"]
-    file.seek(0)
-    return encoding
+    """Detect a files encoding.
+
+    The file is fed to chardet in chunks so the whole content is never copied
+    into memory; detection stops as soon as chardet is confident.
+    Plain ASCII files, which chardet would only report as "ascii" after running
+    its (slow) UTF-16/32 probers over every byte, are recognised up front.
+    """
+    with run_statistics.stage("detect_encoding"):
+        if _is_plain_ascii(file):
+            return "ascii"
+        detector = UniversalDetector()
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            detector.feed(chunk)
+            if detector.done:
+                break
+        encoding = detector.close()["encoding"]
+        file.seek(0)
+        return encoding
+
+def _is_plain_ascii(file):
+    """Check if a file is non-empty ASCII without NUL bytes or ISO-2022 / HZ escapes.
+
+    chardet reports exactly these files as "ascii". The file is rewound.
+    """
+    previous_byte = b""
+    is_empty = True
+    try:
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            is_empty = False
+            if (not chunk.isascii() or b"\x00" in chunk or b"\x1b" in chunk
+                    or b"~{" in previous_byte + chunk):
+                return False
+            previous_byte = chunk[-1:]
+        return not is_empty
+    finally:
+        file.seek(0)
+
+@contextmanager
+def local_file_path(file):
+    """Yield a path on disk holding the file's content.
+
+    Files opened from disk are used in place; uploads are spilled to a
+    temporary file (removed afterwards) so worker processes can open them
+    by path instead of receiving a pickled copy of the content.
+    """
+    name = getattr(file, "name", None)
+    if hasattr(file, "fileno") and isinstance(name, str) and Path(name).is_file():
+        yield name
+        return
+    suffix = Path(name).suffix if isinstance(name, str) else ""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir) / f"upload{suffix}"
+        file.seek(0)
+        with temp_path.open("wb") as spill_file:
+            shutil.copyfileobj(file, spill_file, STREAM_CHUNK_SIZE)
+        file.seek(0)
+        yield str(temp_path)
+
+def iter_decoded_lines(file, encoding, chunk_size=STREAM_CHUNK_SIZE, errors="strict"):
+    """Decode a binary file incrementally and lazily yield its lines.
+
+    Lines are split on "\n" exactly like ``content.decode(encoding).split("\n")``
+    (including the trailing empty line after a final newline), but only one
+    chunk of raw bytes and one partial line are held in memory at a time.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ""
+    while raw := file.read(chunk_size):
+        lines = (pending + decoder.decode(raw)).split("\n")
+        pending = lines.pop()
+        yield from lines
+    lines = (pending + decoder.decode(b"", final=True)).split("\n")
+    yield from lines
 
 def tabular_search(file_name, df, search_terms, search_options, sheet_name=""):
     """Search a data frame using multiprocessing."""
+    import numpy as np
+
     results = []
     columns = df.columns.tolist()
     num_processes = os.cpu_count() or 4
@@ -107,8 +208,9 @@ def tabular_search(file_name, df, search_terms, search_options, sheet_name=""):
         return results
     
     chunks = np.array_split(df, num_processes)
+    run_statistics.count("cells", df.size)
     
-    with concurrent.futures.ProcessPoolExecutor(
+    with run_statistics.stage("matching"), concurrent.futures.ProcessPoolExecutor(
         initializer=init_tabular_worker,
         initargs=(columns, file_name, sheet_name, search_terms, search_options)
     ) as executor:
@@ -128,8 +230,9 @@ def document_search(file_name, line_list, search_terms, search_options, location
     num_processes = os.cpu_count() or 4
     chunk_size = (len(line_data) + num_processes - 1) // num_processes
     chunks = [line_data[i:i+chunk_size] for i in range(0, len(line_data), chunk_size)]
+    run_statistics.count("lines", total_lines)
     
-    with concurrent.futures.ProcessPoolExecutor(
+    with run_statistics.stage("matching"), concurrent.futures.ProcessPoolExecutor(
         initializer=init_document_worker,
         initargs=(file_name, location_context, total_lines, search_terms, search_options)
     ) as executor:
@@ -138,6 +241,89 @@ def document_search(file_name, line_list, search_terms, search_options, location
             results.extend(chunk_result)
     return results
 
+def stream_document_search(file_name, lines, search_terms, search_options, location_context,
+                           lines_per_task=STREAM_LINES_PER_TASK):
+    """Search an iterable of strings using multiprocessing, without materialising it.
+
+    Lines are numbered and batched as they are produced and each batch is handed
+    to the shared worker pool straight away. At most two batches per worker are in
+    flight, so peak memory is a small multiple of ``lines_per_task`` no matter
+    how large the document is. Results match document_search.
+    """
+    line_count = [0]
+
+    def numbered_lines():
+        for line_number, line in enumerate(lines, start=1):
+            line_count[0] = line_number
+            yield line_number, line
+
+    hits = _stream_search(numbered_lines(), search_terms, search_options, lines_per_task)
+    run_statistics.count("lines", line_count[0])
+    return [
+        build_result(
+            file_name=file_name,
+            location_context=location_context,
+            location=f"Line {line_number} of {line_count[0]}",
+            search_terms=matched_terms,
+            original_content=line,
+        )
+        for line_number, matched_terms, line in hits
+    ]
+
+def stream_record_search(file_name, records, search_terms, search_options,
+                         records_per_task=STREAM_LINES_PER_TASK):
+    """Search an iterable of ((location_context, location), text) records.
+
+    Used by handlers that know where each piece of text is as they parse it
+    (paragraphs, table cells, slides...). Records are batched to the shared
+    worker pool as they are produced, like stream_document_search.
+    """
+    record_count = [0]
+
+    def counted_records():
+        for record_number, record in enumerate(records, start=1):
+            record_count[0] = record_number
+            yield record
+
+    hits = _stream_search(counted_records(), search_terms, search_options, records_per_task)
+    run_statistics.count("records", record_count[0])
+    return [
+        build_result(
+            file_name=file_name,
+            location_context=location_context,
+            location=location,
+            search_terms=matched_terms,
+            original_content=content,
+        )
+        for (location_context, location), matched_terms, content in hits
+    ]
+
+def _stream_search(records, search_terms, search_options, records_per_task):
+    """Submit batches of (key, text) records to the worker pool as they are produced.
+
+    Returns the (key, matched_terms, text) hits in record order.
+    """
+    hits = []
+    max_pending = 2 * worker_pool.worker_count()
+    pending = deque()
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == records_per_task:
+            pending.append(worker_pool.submit(
+                process_line_chunk, chunk, search_terms, search_options))
+            chunk = []
+            if len(pending) >= max_pending:
+                with run_statistics.stage("matching"):
+                    hits.extend(worker_pool.result(pending.popleft()))
+    if chunk:
+        pending.append(worker_pool.submit(
+            process_line_chunk, chunk, search_terms, search_options))
+    with run_statistics.stage("matching"):
+        while pending:
+            hits.extend(worker_pool.result(pending.popleft()))
+    return hits
+
 def build_result(file_name, location_context, location, search_terms, original_content):
     """Build search results."""
     return {
@@ -153,6 +339,8 @@ def strip_list(a_list) -> list:
 
 def search_term_file_to_list(search_term_file) -> list:
     """Convert search term file to list."""
+    import pandas as pd
+
     search_term_df = pd.read_excel(search_term_file, header=None)
     search_term_df = search_term_df.dropna()
     search_terms = search_term_df.iloc[:, 0].tolist()
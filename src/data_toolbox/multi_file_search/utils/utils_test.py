@@ -9,8 +9,10 @@ from data_toolbox.multi_file_search.utils.utils import (
     detect_encoding,
     document_search,
     get_excel_column_letter,
+    iter_decoded_lines,
     match_function,
     search_term_file_to_list,
+    stream_document_search,
     strip_list,
     tabular_search,
 )
@@ -128,6 +130,38 @@ def test_document_search():
     assert len(search_results) == 3
     assert search_results == expected_results
 
+def test_iter_decoded_lines_matches_split():
+    content = "first line\nsecond 欢迎 line\r\n\nlast line\n"
+    # a tiny chunk size forces multi-byte characters across chunk boundaries
+    file = BytesIO(content.encode("utf-8"))
+    lines = list(iter_decoded_lines(file, "utf-8", chunk_size=3))
+    assert lines == content.split("\n")
+
+def test_iter_decoded_lines_empty_file():
+    assert list(iter_decoded_lines(BytesIO(b""), "utf-8")) == [""]
+
+def test_stream_document_search_matches_document_search():
+    file_name = "test_doc.txt"
+    line_list = [f"line {i} {'needle' if i % 7 == 0 else 'hay'}" for i in range(1, 101)]
+    search_terms = ["needle", "line 5"]
+    search_options={
+        "mode": "regular",
+        "case-sensitive": False,
+        "whole-word": False,
+    }
+    expected_results = document_search(
+        file_name, line_list, search_terms, search_options, location_context="",
+    )
+    search_results = stream_document_search(
+        file_name,
+        iter(line_list),
+        search_terms,
+        search_options,
+        location_context="",
+        lines_per_task=8,
+    )
+    assert search_results == expected_results
+
 def test_build_result():
     # Arrange
     file_name = "test.pptx"
@@ -0,0 +1,261 @@
+"""Worker Pool.
+
+A single process pool shared by every search running in this process.
+
+Spawning a ProcessPoolExecutor per file (or per PDF page) costs far more than
+the searching itself for small inputs, so handlers submit their work here
+instead. Tasks must be module level functions that receive everything they
+need (search terms, options, ...) as arguments.
+
+The pool is started when the app (or the search service) boots, see
+start_worker_pool(), so the first search does not pay for it. Workers are
+forked from a forkserver that has already imported the parsers
+(PRELOAD_MODULES), so each worker starts with them loaded instead of importing
+pandas and friends from scratch; every worker is then warmed up with a task,
+after which the pool is ready (is_ready()).
+"""
+import concurrent.futures
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from data_toolbox.multi_file_search.utils import memory, profiling, run_statistics
+
+log = logging.getLogger("Toolbox")
+
+# Imported once by the forkserver: the modules of the worker tasks and the
+# parsers they use (missing ones are skipped). Package modules are found when
+# the process runs from src, as the app, the service and the CLI do.
+PRELOAD_MODULES = (
+    "pandas",
+    "lxml.etree",
+    "pymupdf",
+    "pypdf",
+    "chardet",
+    "data_toolbox.multi_file_search.utils.utils",
+    "data_toolbox.multi_file_search.file_router.pdf",
+    "data_toolbox.multi_file_search.file_router.pptx",
+)
+# Seconds each warm-up task holds its worker, so that every worker is started
+WARM_UP_SECONDS = 0.1
+
+_pool = None
+_pool_lock = threading.Lock()
+# Set once the current pool's workers are warm (or warming them up failed)
+_ready = threading.Event()
+# Set by set_worker_count(), otherwise one worker per CPU
+_worker_count = None
+# Tasks submitted and not finished yet, across pools (see pending_tasks)
+_pending_tasks = 0
+_pending_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    """Return the number of worker processes in the pool."""
+    return _worker_count or os.cpu_count() or 4
+
+def set_worker_count(count) -> None:
+    """Size the pool (e.g. from a command line option), replacing a running pool."""
+    global _worker_count  # noqa: PLW0603
+    _worker_count = count
+    shutdown_worker_pool()
+
+def pending_tasks() -> int:
+    """Return how many tasks were submitted and have not finished: the pool's queue depth."""
+    return _pending_tasks
+
+def task_ranges(item_count, max_items_per_task) -> list:
+    """Split item indices into (first, last) ranges, roughly one per worker.
+
+    Ranges hold at most ``max_items_per_task`` items so that results start
+    coming back (and memory is released) before the whole file is done.
+    """
+    items_per_task = min(
+        max_items_per_task,
+        max(1, math.ceil(item_count / worker_count())),
+    )
+    return [
+        (first_item, min(first_item + items_per_task, item_count))
+        for first_item in range(0, item_count, items_per_task)
+    ]
+
+def start_worker_pool(wait=False) -> concurrent.futures.ProcessPoolExecutor:
+    """Start the shared pool and warm its workers up in the background, e.g. at boot.
+
+    A running pool is left alone, so this is safe to call on every page run.
+
+    Args:
+    ----
+        wait (bool): return only once the pool is ready
+
+    Returns:
+    -------
+        ProcessPoolExecutor: the shared pool
+
+    """
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        pool = _pool
+        if pool is None:
+            _ready.clear()
+            pool = _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=worker_count(), mp_context=_context())
+            threading.Thread(target=_warm_up, args=(pool,), name="worker-pool-warm-up",
+                             daemon=True).start()
+    if wait:
+        _ready.wait()
+    return pool
+
+def is_ready() -> bool:
+    """Whether the shared pool is running and its workers are warm."""
+    return _pool is not None and _ready.is_set()
+
+def wait_until_ready(timeout=None) -> bool:
+    """Wait for the pool started by start_worker_pool() to be warm; return is_ready()."""
+    _ready.wait(timeout)
+    return is_ready()
+
+def get_worker_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared pool started at boot, once it is warm.
+
+    The pool is only started here when none is running: nothing started one
+    (e.g. a script calling handlers directly) or the last one broke. Time
+    spent waiting for it is the "pool_startup" stage of the file searched.
+    """
+    pool = start_worker_pool()
+    if not _ready.is_set():
+        with run_statistics.stage("pool_startup"):
+            _ready.wait()
+    return pool
+
+def submit(fn, *args) -> concurrent.futures.Future:
+    """Submit a task to the shared pool, replacing the pool if it has broken.
+
+    A worker killed by the OS (e.g. out of memory) breaks the whole pool;
+    later searches should not fail because of it.
+
+    When the calling thread searches a file whose memory is tracked, the
+    task's RSS high-water mark is measured in the worker; when it takes part
+    in a search profile, the task is run under a profiler in the worker.
+    result() records both.
+    """
+    tracked = memory.current_tracker()
+    profile = profiling.current_profile()
+    task = (fn, args)
+    if tracked is not None:
+        task = (memory.measured_task, task)
+    if profile is not None:
+        task = (profiling.profiled_task, (*task, profile.interval))
+    pool = get_worker_pool()
+    try:
+        future = _submit(pool, *task)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = get_worker_pool()
+        future = _submit(pool, *task)
+    # Kept so result() can run the task again in a fresh pool
+    future.task = (fn, args)
+    future.pool = pool
+    future.tracked = tracked
+    future.profile = profile
+    return future
+
+def result(future):
+    """Return the result of a task from submit(), rerunning it if the pool broke.
+
+    When a worker dies every task in flight fails with BrokenProcessPool, not
+    only the one that killed it (which may belong to another file, or another
+    user's search). Those tasks are run once more in a fresh pool; a task that
+    breaks that pool too raises BrokenProcessPool, for its handler to report
+    the file as unreadable.
+    """
+    try:
+        return _unwrap(future, future.result())
+    except BrokenProcessPool:
+        _discard_pool(future.pool)
+        fn, args = future.task
+        future = submit(fn, *args)
+        return _unwrap(future, future.result())
+
+def _unwrap(future, value):
+    """Return a task's result, recording its memory and merging its profile."""
+    if future.profile is not None:
+        value, stats, stacks = value
+        future.profile.add(stats, stacks)
+    if future.tracked is not None:
+        value, rss_before, rss_peak = value
+        tracker, file_statistics = future.tracked
+        tracker.record_worker_task(file_statistics, rss_before, rss_peak)
+    return value
+
+def _submit(pool, fn, args):
+    """Submit a task, counting it in the queue depth until it finishes."""
+    global _pending_tasks  # noqa: PLW0603
+    future = pool.submit(fn, *args)
+    with _pending_lock:
+        _pending_tasks += 1
+    future.add_done_callback(_task_done)
+    return future
+
+def _task_done(_future):
+    """Count a task out of the queue depth."""
+    global _pending_tasks  # noqa: PLW0603
+    with _pending_lock:
+        _pending_tasks -= 1
+
+def shutdown_worker_pool() -> None:
+    """Shut the shared pool down (a new one is started on next use)."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _ready.clear()
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _discard_pool(pool) -> None:
+    """Forget a broken pool so the next call creates a fresh one."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            _ready.clear()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _context():
+    """Return a forkserver context preloading PRELOAD_MODULES, or spawn where there is none."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Only read when the forkserver starts, i.e. by the first pool of the process
+    context.set_forkserver_preload(list(PRELOAD_MODULES))
+    return context
+
+def _warm_up(pool):
+    """Start every worker of a new pool with a task, then mark the pool ready."""
+    start_time = time.perf_counter()
+    try:
+        futures = [pool.submit(_warm_up_task, WARM_UP_SECONDS) for _ in range(worker_count())]
+        preloaded = set()
+        for future in futures:
+            preloaded.update(future.result())
+    except Exception:  # noqa: BLE001
+        # Searches will find out (and replace the pool) if it is really broken
+        log.exception("Multi-File Search worker pool could not be warmed up")
+    else:
+        log.info("Multi-File Search worker pool ready: %s workers in %.2fs, preloaded %s",
+                 len(futures), time.perf_counter() - start_time, ", ".join(sorted(preloaded)))
+    finally:
+        with _pool_lock:
+            if _pool is pool:
+                _ready.set()
+
+def _warm_up_task(seconds) -> list:
+    """Hold a worker for a moment (worker side); return the preloaded modules it started with."""
+    preloaded = [name for name in PRELOAD_MODULES if name in sys.modules]
+    time.sleep(seconds)
+    return preloaded
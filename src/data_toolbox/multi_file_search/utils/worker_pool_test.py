@@ -0,0 +1,50 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from data_toolbox.multi_file_search.utils import worker_pool
+
+
+def kill_worker(_):
+    """Worker task that dies like an out of memory kill."""
+    os._exit(1)
+
+def add_one(number):
+    """Worker task."""
+    return number + 1
+
+
+def test_result_reruns_tasks_failed_by_another_tasks_dead_worker():
+    # Arrange
+    worker_pool.shutdown_worker_pool()
+    killer = worker_pool.submit(kill_worker, 0)
+    bystander = worker_pool.submit(add_one, 1)
+    # Act / Assert
+    with pytest.raises(BrokenProcessPool):
+        worker_pool.result(killer)
+    assert worker_pool.result(bystander) == 2
+    assert worker_pool.result(worker_pool.submit(add_one, 2)) == 3
+    worker_pool.shutdown_worker_pool()
+
+def test_started_pool_is_warm_with_the_parsers_preloaded():
+    # Arrange
+    worker_pool.shutdown_worker_pool()
+    # Act
+    pool = worker_pool.start_worker_pool(wait=True)
+    preloaded = worker_pool.result(worker_pool.submit(worker_pool._warm_up_task, 0))  # noqa: SLF001
+    # Assert
+    assert worker_pool.is_ready()
+    assert worker_pool.get_worker_pool() is pool
+    assert worker_pool.start_worker_pool() is pool
+    assert "pandas" in preloaded
+    assert "data_toolbox.multi_file_search.file_router.pdf" in preloaded
+
+def test_shut_down_pool_is_not_ready():
+    # Arrange
+    worker_pool.start_worker_pool(wait=True)
+    # Act
+    worker_pool.shutdown_worker_pool()
+    # Assert
+    assert not worker_pool.is_ready()
+    assert not worker_pool.wait_until_ready(timeout=0)
@@ -1,14 +1,17 @@
 from pathlib import Path
 from uuid import UUID
 
-import pandas as pd
-
 from .association import Association
+from .json_lines import JsonLinesFile
 
 
 class Coordinator:
     """A class used to manage associations between projects and its list of tags.
 
+    Projects are also indexed by tag, so finding the projects with a tag does
+    not scan every association. Change the tags of a project with the
+    Coordinator (add_association(), set_association_tags()) so the index follows.
+
     Properties:
     ----------
         associations: dict[str, Association]
@@ -18,8 +21,10 @@ class Coordinator:
     -------
         add_association(key, tag_id)
         add_associations(project_name, tag_ids)
+        set_association_tags(project_name, tag_ids)
         get_association(key)
         association_exists(project_name, tag_id)
+        projects_with_tag(tag_id)
         import_associations(input_file)
         reload_associations()
         export_associations()
@@ -41,7 +46,9 @@ class Coordinator:
         :return: None
         """
         self.__associations = {}
+        self.__projects_by_tag = {}
         self.__import_file = None
+        self.__association_file = None
 
     def add_association(self, key: str, tag_id=None) -> None:
         """Add a tag association to the given project's list of tags.
@@ -55,6 +62,7 @@ class Coordinator:
             self.__associations[key] = Association(key, [])
         if tag_id and tag_id not in self.__associations[key].tags:
             self.__associations[key].add_tag(tag_id)
+            self.__projects_by_tag.setdefault(tag_id, set()).add(key)
 
     def add_associations(self, project_name: str, tag_ids: list) -> None:
         """Add multiple associations given a project name and a list of tag ids.
@@ -67,6 +75,19 @@ class Coordinator:
         for tag_id in tag_ids:
             self.add_association(project_name, tag_id)
 
+    def set_association_tags(self, project_name: str, tag_ids: list) -> None:
+        """Replace the list of tags of a project.
+
+        :param project_name: str
+            The project name
+        :param tag_ids: List[UUID]
+            The new list of tag guids
+        """
+        association = self.get_association(project_name)
+        self.__unindex(association)
+        association.set_tags(list(tag_ids))
+        self.__index(association)
+
     def get_association(self, key: str) -> Association:
         """Return the association for the project."""
         if key not in self.__associations:
@@ -75,38 +96,56 @@ class Coordinator:
 
     def association_exists(self, project_name: str, tag_id: UUID) -> bool:
         """Check if an association exists for the given project."""
-        if project_name not in self.__associations:
-            return False
-        return tag_id in self.__associations[project_name]
+        return project_name in self.__projects_by_tag.get(tag_id, ())
+
+    def projects_with_tag(self, tag_id: UUID) -> list:
+        """Return the names of the projects associated with the tag, sorted."""
+        return sorted(self.__projects_by_tag.get(tag_id, ()))
 
     def import_associations(self, import_file: str) -> None:
         """Import associations from the given file.
 
+        Importing the same file again only applies what changed in it (see
+        reload_associations()).
+
         :param import_file: str
             The file to import associations from
         """
-        self.__import_file = import_file
-        associaton_df = pd.read_json(self.__import_file, lines=True)
-        for row in range(len(associaton_df)):
-            self.__import_association(associaton_df.iloc[row])
+        if self.__association_file is None or Path(import_file) != Path(self.__import_file):
+            self.__import_file = import_file
+            self.__association_file = JsonLinesFile(
+                import_file, key=lambda association: association["project_name"])
+        self.reload_associations()
 
     def reload_associations(self) -> None:
         """Reload associations from the previously imported file.
 
+        Does not read the file if its modification time and size did not change
+        since it was last read or exported. Otherwise only the lines that changed
+        are applied: their projects' associations are replaced, and projects
+        removed from the file are dropped.
+
         :param None:
         :return: None
         """
-        reload_df = pd.read_json(self.__import_file, lines=True)
-        for row in range(len(reload_df)):
-            self.__import_association(reload_df.iloc[row])
+        if self.__association_file is None:
+            return
+        changes = self.__association_file.changes()
+        if changes is None:
+            return
+        changed_associations, removed_projects = changes
+        for project_name in removed_projects:
+            association = self.__associations.pop(project_name, None)
+            if association is not None:
+                self.__unindex(association)
+        for association in changed_associations:
+            self.__import_association(association)
 
     def export_associations(self) -> None:
-        """Export associations to the given file."""
-        serialized_associations = []
-        self.__associations = dict(sorted(self.__associations.items()))  # noqa: E501
-        serialized_associations = [association.serialize() for association in self.__associations.values()]  # noqa: E501
-        with Path.open(self.__import_file, "w") as f:
-            f.write("\n".join(serialized_associations))
+        """Export associations to the import file, atomically; unchanged ones are not rewritten."""
+        self.__associations = dict(sorted(self.__associations.items()))
+        self.__association_file.write(
+            [association.serialize() for association in self.__associations.values()])
 
     def __import_association(self, association: dict) -> None:
         """Import a single association.
@@ -116,4 +155,20 @@ class Coordinator:
         """
         key = association["project_name"]
         tags = [UUID(tag_str) for tag_str in association["tags"]]
+        if key in self.__associations:
+            self.__unindex(self.__associations[key])
         self.__associations[key] = Association(key, tags)
+        self.__index(self.__associations[key])
+
+    def __index(self, association: Association) -> None:
+        """Add the project to the index of each of its tags."""
+        for tag_id in association.tags:
+            self.__projects_by_tag.setdefault(tag_id, set()).add(association.project_name)
+
+    def __unindex(self, association: Association) -> None:
+        """Remove the project from the index of each of its tags."""
+        for tag_id in association.tags:
+            projects = self.__projects_by_tag.get(tag_id, set())
+            projects.discard(association.project_name)
+            if not projects:
+                self.__projects_by_tag.pop(tag_id, None)
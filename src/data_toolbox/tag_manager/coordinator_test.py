@@ -0,0 +1,71 @@
+from collections import Counter
+from uuid import uuid4
+
+from data_toolbox.tag_manager import Coordinator
+from data_toolbox.tag_manager.association import Association
+
+PROJECT_COUNT = 5000
+
+
+def count_reads(monkeypatch, cls, *attributes):
+    """Count the reads of properties of cls, e.g. of the tags a lookup looks at."""
+    reads = Counter()
+    for attribute in attributes:
+        getter = getattr(cls, attribute).fget
+        def counting_getter(self, getter=getter, attribute=attribute):
+            reads[attribute] += 1
+            return getter(self)
+        monkeypatch.setattr(cls, attribute, property(counting_getter))
+    return reads
+
+def test_projects_with_tag_at_thousands_of_tools(tmp_path, monkeypatch):
+    # Arrange
+    tag_ids = [uuid4() for _ in range(50)]
+    association_file = tmp_path / "associations.jsonl"
+    association_file.write_text("\n".join(
+        f'{{"project_name": "tool {number}", '
+        f'"tags": ["{tag_ids[number % 50]}", "{tag_ids[(number + 1) % 50]}"]}}'
+        for number in range(PROJECT_COUNT)))
+    coordinator = Coordinator()
+    coordinator.import_associations(association_file)
+    reads = count_reads(monkeypatch, Association, "project_name", "tags")
+    # Act
+    projects = {tag_id: coordinator.projects_with_tag(tag_id) for tag_id in tag_ids}
+    exists = [coordinator.association_exists(f"tool {number}", tag_ids[number % 50])
+              for number in range(PROJECT_COUNT)]
+    lookup_reads = sum(reads.values())
+    # Assert
+    assert all(len(tagged) == 2 * PROJECT_COUNT // 50 for tagged in projects.values())
+    assert "tool 0" in projects[tag_ids[0]]
+    assert "tool 49" in projects[tag_ids[0]]
+    assert all(exists)
+    # (at most an association per lookup; scanning the list reads thousands)
+    assert lookup_reads <= len(tag_ids) + PROJECT_COUNT
+
+def test_index_follows_added_and_replaced_tags():
+    # Arrange
+    crypto, geo = uuid4(), uuid4()
+    coordinator = Coordinator()
+    coordinator.add_associations("Wallet Finder", [crypto, geo])
+    coordinator.add_association("Map Viewer", geo)
+    # Act
+    coordinator.set_association_tags("Wallet Finder", [crypto])
+    # Assert
+    assert coordinator.projects_with_tag(crypto) == ["Wallet Finder"]
+    assert coordinator.projects_with_tag(geo) == ["Map Viewer"]
+    assert coordinator.get_association("Wallet Finder").tags == [crypto]
+    assert not coordinator.association_exists("Wallet Finder", geo)
+
+def test_reload_replaces_the_indexed_tags_of_a_project(tmp_path):
+    # Arrange
+    crypto, geo = uuid4(), uuid4()
+    association_file = tmp_path / "associations.jsonl"
+    association_file.write_text(f'{{"project_name": "Wallet Finder", "tags": ["{crypto}"]}}')
+    coordinator = Coordinator()
+    coordinator.import_associations(association_file)
+    association_file.write_text(f'{{"project_name": "Wallet Finder", "tags": ["{geo}"]}}')
+    # Act
+    coordinator.reload_associations()
+    # Assert
+    assert coordinator.projects_with_tag(crypto) == []
+    assert coordinator.projects_with_tag(geo) == ["Wallet Finder"]
@@ -0,0 +1,124 @@
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+# Mode of a json lines file written for the first time
+NEW_FILE_MODE = 0o644
+
+
+class JsonLinesFile:
+    """A json lines file of records, read incrementally and written atomically.
+
+    Every page run imports the tag and association files, so reading them must
+    be cheap when nothing changed and proportional to the change otherwise:
+
+        - changes() returns nothing without reading the file when its
+          modification time and size are those of the last read (or write)
+        - otherwise it reads the file line by line and only parses the lines
+          that were not in the file before
+        - write() replaces the file with a temporary file renamed over it, so a
+          reader never sees half a file, and does nothing if the lines did not
+          change
+
+    Methods:
+    -------
+        changes()
+        write(lines)
+
+    """
+
+    def __init__(self, path, key: Callable[[dict], object]):
+        """Initialize a new JsonLinesFile object.
+
+        Args:
+        ----
+        path (str | Path): The json lines file.
+        key (Callable[[dict], object]): Returns the key of a record, e.g. its id.
+
+        """
+        self.__path = Path(path)
+        self.__key = key
+        self.__signature = None
+        self.__lines = []
+        self.__keys_by_line = {}
+
+    def changes(self) -> tuple:
+        """Return the records added or changed, and the keys removed, since the last call.
+
+        Returns:
+        -------
+        tuple[list[dict], set] | None: None if the file did not change.
+
+        Raises:
+        ------
+        FileNotFoundError: If the file does not exist.
+
+        """
+        # Taken before reading, so a write during the read is seen by the next call
+        signature = self.__file_signature()
+        if signature is not None and signature == self.__signature:
+            return None
+        lines = []
+        keys_by_line = {}
+        changed_records = []
+        with self.__path.open(encoding="utf-8") as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                if not line:
+                    continue
+                lines.append(line)
+                if line in self.__keys_by_line:
+                    keys_by_line[line] = self.__keys_by_line[line]
+                    continue
+                record = json.loads(line)
+                keys_by_line[line] = self.__key(record)
+                changed_records.append(record)
+        removed_keys = set(self.__keys_by_line.values()) - set(keys_by_line.values())
+        self.__signature = signature
+        self.__lines = lines
+        self.__keys_by_line = keys_by_line
+        return changed_records, removed_keys
+
+    def write(self, lines: list) -> None:
+        """Replace the file with the lines, atomically, unless they are the lines it holds.
+
+        Args:
+        ----
+        lines (list[str]): The serialized records, one per line.
+
+        """
+        if lines == self.__lines and self.__file_signature() == self.__signature:
+            return
+        mode = NEW_FILE_MODE
+        if self.__path.exists():
+            mode = stat.S_IMODE(self.__path.stat().st_mode)
+        with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.__path.parent,
+                prefix=f".{self.__path.name}.", suffix=".tmp", delete=False) as f:
+            f.write("\n".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(f.name, mode)  # noqa: PTH101
+            os.replace(f.name, self.__path)  # noqa: PTH105
+        except OSError:
+            Path(f.name).unlink(missing_ok=True)
+            raise
+        keys_by_line = {}
+        for line in lines:
+            keys_by_line[line] = (self.__keys_by_line[line] if line in self.__keys_by_line
+                                  else self.__key(json.loads(line)))
+        self.__signature = self.__file_signature()
+        self.__lines = list(lines)
+        self.__keys_by_line = keys_by_line
+
+    def __file_signature(self) -> tuple:
+        """Return the modification time and size of the file, None if it is missing."""
+        try:
+            file_stat = self.__path.stat()
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
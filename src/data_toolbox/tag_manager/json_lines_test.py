@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from data_toolbox.tag_manager.json_lines import JsonLinesFile
+
+LINES = ['{"id": 1, "name": "one"}', '{"id": 2, "name": "two"}', '{"id": 3, "name": "three"}']
+
+
+def touch_later(path):
+    """Move the modification time on, for file systems with coarse timestamps."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_only_changed_lines_are_parsed(tmp_path):
+    # Arrange
+    path = tmp_path / "records.jsonl"
+    path.write_text("\n".join(LINES))
+    keys = []
+    records = JsonLinesFile(path, key=lambda record: keys.append(record["id"]) or record["id"])
+    first = records.changes()
+    path.write_text("\n".join([LINES[0], '{"id": 2, "name": "deux"}', '{"id": 4, "name": "four"}']))
+    touch_later(path)
+    # Act
+    second = records.changes()
+    # Assert
+    assert first == ([{"id": 1, "name": "one"}, {"id": 2, "name": "two"},
+                      {"id": 3, "name": "three"}], set())
+    assert second == ([{"id": 2, "name": "deux"}, {"id": 4, "name": "four"}], {3})
+    assert keys == [1, 2, 3, 2, 4]
+
+def test_unchanged_file_is_not_read(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "records.jsonl"
+    path.write_text("\n".join(LINES))
+    records = JsonLinesFile(path, key=lambda record: record["id"])
+    records.changes()
+    # Act
+    monkeypatch.setattr(type(path), "open", lambda *_, **__: pytest.fail("file was read"))
+    # Assert
+    assert records.changes() is None
+
+def test_write_replaces_the_file_and_keeps_its_mode(tmp_path):
+    # Arrange
+    path = tmp_path / "records.jsonl"
+    path.write_text(LINES[0])
+    path.chmod(0o640)
+    records = JsonLinesFile(path, key=lambda record: record["id"])
+    records.changes()
+    # Act
+    records.write(LINES)
+    # Assert
+    assert path.read_text() == "\n".join(LINES)
+    assert oct(path.stat().st_mode & 0o777) == oct(0o640)
+    assert [entry.name for entry in tmp_path.iterdir()] == ["records.jsonl"]
+    assert records.changes() is None
+
+def test_write_of_unchanged_lines_leaves_the_file_alone(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "records.jsonl"
+    path.write_text("\n".join(LINES))
+    records = JsonLinesFile(path, key=lambda record: record["id"])
+    records.changes()
+    modified = path.stat().st_mtime_ns
+    monkeypatch.setattr(os, "replace", lambda *_: pytest.fail("file was rewritten"))
+    # Act
+    records.write(list(LINES))
+    # Assert
+    assert path.stat().st_mtime_ns == modified
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "records.jsonl"
+    path.write_text(LINES[0])
+    records = JsonLinesFile(path, key=lambda record: record["id"])
+    def fail(*_):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    # Act
+    with pytest.raises(OSError, match="disk full"):
+        records.write(LINES)
+    # Assert
+    assert path.read_text() == LINES[0]
+    assert [entry.name for entry in tmp_path.iterdir()] == ["records.jsonl"]
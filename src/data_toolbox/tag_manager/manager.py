@@ -1,14 +1,22 @@
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-import pandas as pd
-
+from .json_lines import JsonLinesFile
 from .tag import Tag
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class TagManager:
     """Manage tags associated with tools, responsible for creation and export of tags.
 
+    Tags are also indexed by id and by name, so looking a tag up does not scan
+    the list. Rename tags with update_tag() so the name index follows.
+
     Properties:
     ----------
         tags : List[Tag]
@@ -24,6 +32,7 @@ class TagManager:
         to_dataframe()
         get_tag(tag_name)
         get_tag(tag_id)
+        update_tag(tag, tag_name, tag_color)
         delete_tag(tag)
 
     """
@@ -40,7 +49,10 @@ class TagManager:
             No parameters are required for initialization
         """
         self.__tags = []
+        self.__tags_by_id = {}
+        self.__tags_by_name = {}
         self.__import_file = None
+        self.__tag_file = None
 
     def create_new_tag(self, tag_name: str, tag_color: str) -> None:
         """Create a new tag with the given name and color.
@@ -52,22 +64,30 @@ class TagManager:
         """
         tag_id = uuid4()
         tag = Tag(tag_id, tag_color, tag_name)
-        self.__tags.append(tag)
+        self.__add_tag(tag)
 
     def import_tags(self, import_file: str) -> None:
         """Import tags from a json lines file.
 
+        Importing the same file again only applies what changed in it (see
+        reload_tags()).
+
         :param import_file: str
             The path to the tags json file
         """
-        self.__import_file = import_file
-        import_df = pd.read_json(self.__import_file, lines=True)
-        for row in range(len(import_df)):
-            self.__import_tag(import_df.iloc[row])
+        if self.__tag_file is None or Path(import_file) != Path(self.__import_file):
+            self.__import_file = import_file
+            self.__tag_file = JsonLinesFile(import_file, key=lambda tag_dict: UUID(tag_dict["id"]))
+        self.reload_tags()
 
     def reload_tags(self) -> None:
         """Reload tags from the specified import file.
 
+        Does not read the file if its modification time and size did not change
+        since it was last read or exported. Otherwise only the lines that changed
+        are applied: new tags are added, changed tags updated and tags removed
+        from the file deleted.
+
         Example:
         -------
         >>> manager = TagManager()
@@ -75,9 +95,18 @@ class TagManager:
         >>> manager.reload_tags()
 
         """
-        reload_df = pd.read_json(self.__import_file, lines=True)
-        for row in range(len(reload_df)):
-            self.__import_tag(reload_df.iloc[row])
+        if self.__tag_file is None:
+            return
+        changes = self.__tag_file.changes()
+        if changes is None:
+            return
+        changed_tags, removed_tag_ids = changes
+        for tag_id in removed_tag_ids:
+            tag = self.get_tag_by_id(tag_id)
+            if tag is not None:
+                self.delete_tag(tag)
+        for tag_dict in changed_tags:
+            self.__import_tag(tag_dict)
 
     def tag_exists(self, tag_name: str) -> bool:
         """Check if a tag exists.
@@ -90,19 +119,17 @@ class TagManager:
         """
         if not tag_name:
             return False
-        return any(tag.name == tag_name for tag in self.__tags)
+        return self.get_tag(tag_name) is not None
 
     def export_tags(self) -> None:
-        """Export tags to a json string."""
-        serialized_tags = []
+        """Export tags to the import file, atomically; unchanged tags are not rewritten."""
         self.__tags.sort(key=self.__get_tag_name)
-        for tag in self.__tags:
-            serialized_tags = [tag.serialize() for tag in self.__tags]
-        with Path.open(self.__import_file, "w") as f:
-            f.write("\n".join(serialized_tags))
+        self.__tag_file.write([tag.serialize() for tag in self.__tags])
 
     def to_dataframe(self) -> pd.DataFrame:
         """Convert the tags to a pandas dataframe."""
+        import pandas as pd
+
         return pd.DataFrame(tag.to_dict() for tag in self.__tags)
 
     def get_tag(self, tag_name: str) -> Tag:
@@ -114,9 +141,12 @@ class TagManager:
             The name of the tag
 
         """
-        for tag in self.__tags:  # noqa: RET503
-            if tag.name == tag_name:
-                return tag
+        tag = self.__tags_by_name.get(tag_name)
+        if tag is not None and tag.name != tag_name:
+            # Renamed without update_tag()
+            self.__reindex_names()
+            tag = self.__tags_by_name.get(tag_name)
+        return tag
 
     def get_tag_by_id(self, tag_id: UUID) -> Tag:
         """Return the tag with the given id.
@@ -127,9 +157,25 @@ class TagManager:
             The id of the tag
 
         """
-        for tag in self.__tags:  # noqa: RET503
-            if tag.id == tag_id:
-                return tag
+        return self.__tags_by_id.get(tag_id)
+
+    def update_tag(self, tag: Tag, tag_name: str, tag_color: str) -> None:
+        """Rename and recolor a tag, keeping the name index up to date.
+
+        Parameters:
+        ----------
+        tag: Tag
+            A tag of this manager
+        tag_name: str
+            The new name of the tag
+        tag_color: str
+            The new color of the tag
+
+        """
+        renamed = tag.name != tag_name
+        tag.update_values(tag_name, tag_color)
+        if renamed:
+            self.__reindex_names()
 
     def delete_tag(self, tag: Tag) -> None:
         """Remove a tag from the list of managed tags.
@@ -155,6 +201,10 @@ class TagManager:
 
         """
         self.__tags.remove(tag)
+        if self.__tags_by_id.get(tag.id) is tag:
+            del self.__tags_by_id[tag.id]
+        if self.__tags_by_name.get(tag.name) is tag:
+            self.__reindex_names()
 
     def __import_tag(self, tag_dict: dict) -> None:
         """Add a tag from a dictionary.
@@ -165,9 +215,23 @@ class TagManager:
             The dictionary of attributes for a tag
 
         """
-        tag = Tag(UUID(tag_dict["id"]), tag_dict["color"], tag_dict["name"])
-        if not self.tag_exists(tag_dict["name"]):
-            self.__tags.append(tag)
+        tag = self.get_tag_by_id(UUID(tag_dict["id"]))
+        if tag is not None:
+            self.update_tag(tag, tag_dict["name"], tag_dict["color"])
+        elif not self.tag_exists(tag_dict["name"]):
+            self.__add_tag(Tag(UUID(tag_dict["id"]), tag_dict["color"], tag_dict["name"]))
+
+    def __add_tag(self, tag: Tag) -> None:
+        """Add a tag to the list and the indices (the first tag of a name keeps it)."""
+        self.__tags.append(tag)
+        self.__tags_by_id[tag.id] = tag
+        self.__tags_by_name.setdefault(tag.name, tag)
+
+    def __reindex_names(self) -> None:
+        """Rebuild the name index, e.g. after a tag was renamed or deleted."""
+        self.__tags_by_name = {}
+        for tag in self.__tags:
+            self.__tags_by_name.setdefault(tag.name, tag)
 
     def __get_tag_name(self, tag: Tag):
         return tag.name
@@ -0,0 +1,115 @@
+from collections import Counter
+from uuid import uuid4
+
+from data_toolbox.tag_manager import TagManager
+from data_toolbox.tag_manager.tag import Tag
+
+TAG_COUNT = 5000
+
+
+def write_tags(path, count):
+    """Write count tags to a json lines file and return their ids."""
+    tag_ids = [uuid4() for _ in range(count)]
+    path.write_text("\n".join(
+        f'{{"id": "{tag_id}", "name": "tag {number}", "color": "#{number:06x}"}}'
+        for number, tag_id in enumerate(tag_ids)))
+    return tag_ids
+
+def count_reads(monkeypatch, cls, *attributes):
+    """Count the reads of properties of cls, e.g. of the tags a lookup looks at."""
+    reads = Counter()
+    for attribute in attributes:
+        getter = getattr(cls, attribute).fget
+        def counting_getter(self, getter=getter, attribute=attribute):
+            reads[attribute] += 1
+            return getter(self)
+        monkeypatch.setattr(cls, attribute, property(counting_getter))
+    return reads
+
+def test_lookups_by_id_and_name_at_thousands_of_tags(tmp_path, monkeypatch):
+    # Arrange
+    tag_file = tmp_path / "tags.jsonl"
+    tag_ids = write_tags(tag_file, TAG_COUNT)
+    manager = TagManager()
+    manager.import_tags(tag_file)
+    reads = count_reads(monkeypatch, Tag, "id", "name", "color")
+    # Act
+    by_id = [manager.get_tag_by_id(tag_id) for tag_id in tag_ids]
+    by_name = [manager.get_tag(f"tag {number}") for number in range(TAG_COUNT)]
+    exist = [manager.tag_exists(f"tag {number}") for number in range(TAG_COUNT)]
+    lookup_reads = sum(reads.values())
+    # Assert
+    assert len(manager.tags) == TAG_COUNT
+    assert [tag.id for tag in by_id] == tag_ids
+    assert by_name == by_id
+    assert all(exist)
+    assert not manager.tag_exists("tag -1")
+    # (at most a tag per lookup; scanning the list reads thousands)
+    assert lookup_reads <= 3 * TAG_COUNT
+
+def test_indices_follow_create_rename_and_delete():
+    # Arrange
+    manager = TagManager()
+    manager.create_new_tag("Crypto", "#08e8e4")
+    manager.create_new_tag("Geo", "#00ff00")
+    crypto = manager.get_tag("Crypto")
+    # Act
+    manager.update_tag(crypto, "Finance", "#08e8e4")
+    manager.delete_tag(manager.get_tag("Geo"))
+    # Assert
+    assert manager.get_tag("Finance") is crypto
+    assert manager.get_tag_by_id(crypto.id) is crypto
+    assert not manager.tag_exists("Crypto")
+    assert not manager.tag_exists("Geo")
+    assert [tag.name for tag in manager.tags] == ["Finance"]
+
+def test_reload_adds_new_tags_once(tmp_path):
+    # Arrange
+    tag_file = tmp_path / "tags.jsonl"
+    write_tags(tag_file, 3)
+    manager = TagManager()
+    manager.import_tags(tag_file)
+    new_id = uuid4()
+    tag_file.write_text(tag_file.read_text()
+                        + f'\n{{"id": "{new_id}", "name": "new", "color": "#ffffff"}}')
+    # Act
+    manager.reload_tags()
+    manager.reload_tags()
+    # Assert
+    assert len(manager.tags) == 4
+    assert manager.get_tag_by_id(new_id) is manager.get_tag("new")
+
+def test_reload_applies_renames_and_removals_from_the_file(tmp_path):
+    # Arrange
+    tag_file = tmp_path / "tags.jsonl"
+    first_id, second_id = write_tags(tag_file, 2)
+    manager = TagManager()
+    manager.import_tags(tag_file)
+    first = manager.get_tag_by_id(first_id)
+    tag_file.write_text(f'{{"id": "{first_id}", "name": "renamed", "color": "#000000"}}')
+    # Act
+    manager.import_tags(tag_file)
+    # Assert
+    assert manager.tags == [first]
+    assert (first.name, first.color) == ("renamed", "#000000")
+    assert manager.get_tag("renamed") is first
+    assert manager.get_tag_by_id(second_id) is None
+
+def test_export_is_read_back_without_changes(tmp_path):
+    # Arrange
+    tag_file = tmp_path / "tags.jsonl"
+    write_tags(tag_file, 3)
+    manager = TagManager()
+    manager.import_tags(tag_file)
+    manager.create_new_tag("new", "#ffffff")
+    # Act
+    manager.export_tags()
+    exported = tag_file.read_text()
+    other_manager = TagManager()
+    other_manager.import_tags(tag_file)
+    manager.reload_tags()
+    # Assert
+    assert len(exported.splitlines()) == 4
+    assert sorted(tag.name for tag in other_manager.tags) == sorted(
+        tag.name for tag in manager.tags)
+    assert len(manager.tags) == 4
@@ -1,7 +1,7 @@
 import streamlit as st
 
 from data_toolbox.tag_manager.association import Association
-from data_toolbox.tag_manager.singletons import manager
+from data_toolbox.tag_manager.singletons import coordinator, manager
 
 
 class AssociationEditView:
@@ -54,4 +54,4 @@ class AssociationEditView:
             List of tag names that should now be associated with the tool
         """
         updated_tag_ids = [manager.get_tag(tag_name).id for tag_name in updated_tags]
-        self.__association.set_tags(updated_tag_ids)
+        coordinator.set_association_tags(self.__association.project_name, updated_tag_ids)
@@ -51,7 +51,7 @@ class TagEditView:
                 color = st.color_picker("Tag Color",
                 self.__tag.color,
                 key=f"{self.__tag.id}_Color_Picker")
-                self.__tag.update_values(name, color)
+                manager.update_tag(self.__tag, name, color)
         with col1:
             st.text(self.__tag.name)
         with col2:
@@ -2,16 +2,41 @@
 
 A collection of reusable, non-UI related, utilities.
 
+Names are imported from their modules on first access, so using one utility
+(e.g. ``determine_file_extension``) does not import the text extraction stack
+and Streamlit along with it.
 """
+import importlib
 
-from .files import determine_file_extension
-from .greetings import Greeting, greetings
-from .string_utils import TextConverter, TextExtractor, string_operations
-from .uploaded_file_extensions import (
-    determine_file_extensions,
-    display_restored_uploaded_files,
-    file_upload_result_to_file_list,
-    restore_uploaded_files,
-    store_uploaded_files_for_page_switch,
-    were_files_restored,
-)
+# name -> module defining it
+_EXPORTS = {
+    "determine_file_extension": "files",
+    "Greeting": "greetings",
+    "greetings": "greetings",
+    "TextConverter": "string_utils",
+    "TextExtractor": "string_utils",
+    "string_operations": "string_utils",
+    "determine_file_extensions": "uploaded_file_extensions",
+    "display_restored_uploaded_files": "uploaded_file_extensions",
+    "file_upload_result_to_file_list": "uploaded_file_extensions",
+    "restore_uploaded_files": "uploaded_file_extensions",
+    "store_uploaded_files_for_page_switch": "uploaded_file_extensions",
+    "were_files_restored": "uploaded_file_extensions",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import utilities when they are first accessed."""
+    if name in _EXPORTS:
+        module_name = _EXPORTS[name]
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        # Importing a module binds it to its name here, which may be an export too
+        # ("greetings"); bind every export of the module over it
+        for export, export_module in _EXPORTS.items():
+            if export_module == module_name:
+                globals()[export] = getattr(module, export)
+        return globals()[name]
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
@@ -1,3 +1,3 @@
 __version__ = "0.5.0-Data-Team-Edition"
 
-from .main import counts, start_tracking, stop_tracking, track
+from .main import counts, start_tracking, stop_tracking, track, track_search_memory
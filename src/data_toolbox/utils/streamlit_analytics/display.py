@@ -220,6 +220,18 @@ def show_results(current_counts, reset_callback, error_log_callback, unsafe_pass
     with st.expander(f"Full {option} Analytics"):
         st.write(counts[option])
 
+    search_memory = counts[option].get("search_memory")
+    if search_memory:
+        st.subheader(f"Search Memory for {option}")
+        columns = st.columns(4)
+        columns[0].metric("Searches", search_memory["searches"])
+        columns[1].metric("Peak memory (app)",
+                          f"{search_memory['max_parent_peak_bytes'] / 1024 ** 2:.1f} MiB")
+        columns[2].metric("Peak memory (worker)",
+                          f"{search_memory['max_worker_peak_bytes'] / 1024 ** 2:.1f} MiB")
+        columns[3].metric("Files slowed / streamed",
+                          f"{search_memory['throttled_files']} / {search_memory['streamed_files']}")
+
     st.subheader(f"Raw Error Log for {option}")
     with st.expander("Error Log"):
         st.write(counts[option]["error_log"])
@@ -20,7 +20,6 @@ import streamlit as st
 
 from config import styles_config
 
-from . import display, firestore
 from .utils import clear_error_log, collate_results, get_time, replace_empty
 
 # Configure logging
@@ -179,6 +178,34 @@ def _track_user():
         container_counts[current_page]["total_pageviews"] += 1
         container_counts["per_day"]["pageviews"][-1] += 1
         container_counts[current_page]["per_day"]["pageviews"][-1] += 1
+
+def track_search_memory(memory: dict):
+    """Track the peak memory of a search run on the current page.
+
+    Args:
+    ----
+        memory (dict): a search's memory figures, see RunStatistics.summary()["memory"]
+
+    """
+    # Nothing to do when analytics are not tracking this page.
+    if not isinstance(container_counts.get(current_page), dict):
+        return
+    with lock:
+        search_memory = container_counts[current_page].setdefault("search_memory", {
+            "searches": 0,
+            "max_parent_peak_bytes": 0,
+            "max_worker_peak_bytes": 0,
+            "streamed_files": 0,
+            "throttled_files": 0,
+        })
+        search_memory["searches"] += 1
+        search_memory["max_parent_peak_bytes"] = max(
+            search_memory["max_parent_peak_bytes"], memory.get("parent_peak_bytes") or 0)
+        search_memory["max_worker_peak_bytes"] = max(
+            search_memory["max_worker_peak_bytes"], memory.get("worker_peak_bytes") or 0)
+        search_memory["streamed_files"] += memory.get("streamed_files") or 0
+        search_memory["throttled_files"] += memory.get("throttled_files") or 0
+
 def _wrap_error_handler(func):
     @functools.wraps(func)
     def inner(*args, **kwargs):
@@ -483,6 +510,9 @@ def start_tracking(  # noqa: C901, PLR0915
     `with streamlit_analytics.track():`.
     """
     if firestore_key_file and not container_counts["loaded_from_firestore"]:
+        # Imported here: google-cloud-firestore is only needed when it is configured
+        from . import firestore
+
         firestore.load(container_counts, firestore_key_file, firestore_collection_name)
         container_counts["loaded_from_firestore"] = True
     if firestore_key_file and not container_counts["loaded_from_firestore"]:
@@ -712,6 +742,8 @@ def stop_tracking(
         if verbose:
             LOGGER.info("Saving count data to firestore:")
             LOGGER.info(counts)
+        from . import firestore
+
         firestore.save(counts, firestore_key_file, firestore_collection_name)
 
     if save_to_json is not None:
@@ -720,6 +752,9 @@ def stop_tracking(
     # Show analytics results in the streamlit app:
     query_params = st.query_params
     if "tool" in query_params and "User Analytics" in query_params["tool"]:
+        # Imported here: altair and pandas are only needed on the analytics page
+        from . import display
+
         display.show_results(counts, reset_counts, clear_error_log, unsafe_password, save_to_json, lock)
 
 @contextmanager
@@ -1,4 +1,5 @@
 """A collection utils for extracting, converting and manipulating text."""
+from .pdf_backends import PdfDocument
 from .string_operations import hex2rgb, rgb2hex
 from .text_converter import TextConverter
 from .text_extractor import TextExtractor
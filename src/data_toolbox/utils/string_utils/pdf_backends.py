@@ -0,0 +1,251 @@
+"""PDF Backends.
+
+Pluggable PDF text extraction shared by the Text Extractor and Multi-File Search.
+
+The native PyMuPDF backend is used by default as it is typically an order of
+magnitude faster than the pure-Python pypdf. When PyMuPDF is not installed or
+cannot open a file, the next backend is tried; when it fails on a single page,
+only that page is re-extracted with the next backend.
+
+The preferred backend can be set with the PDF_BACKEND environment variable.
+
+Compare the backends on a corpus of PDFs with:
+    python -m data_toolbox.utils.string_utils.pdf_backends file1.pdf file2.pdf ...
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_PDF_BACKEND = "pymupdf"
+
+
+class PyMuPDFDocument:
+    """PDF opened with PyMuPDF (imported as pymupdf, or fitz on old versions)."""
+
+    name = "pymupdf"
+
+    def __init__(self, source):
+        """Open a PDF from a path, bytes or a binary file object."""
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        if isinstance(source, (str, Path)):
+            self.__document = pymupdf.open(source)
+        else:
+            self.__document = pymupdf.open(stream=_read_bytes(source), filetype="pdf")
+
+    @property
+    def page_count(self) -> int:
+        """Return the number of pages."""
+        return self.__document.page_count
+
+    def page_text(self, page: int) -> str:
+        """Return the text of a page (0-based), without PyMuPDF's final newline."""
+        text = self.__document[page].get_text()
+        return text[:-1] if text.endswith("\n") else text
+
+    def close(self) -> None:
+        """Release the document."""
+        self.__document.close()
+
+
+class PyPDFDocument:
+    """PDF opened with pypdf."""
+
+    name = "pypdf"
+
+    def __init__(self, source):
+        """Open a PDF from a path, bytes or a binary file object."""
+        import pypdf
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        self.__reader = pypdf.PdfReader(source)
+
+    @property
+    def page_count(self) -> int:
+        """Return the number of pages."""
+        return len(self.__reader.pages)
+
+    def page_text(self, page: int) -> str:
+        """Return the text of a page (0-based)."""
+        return self.__reader.pages[page].extract_text()
+
+    def close(self) -> None:
+        """Release the document (pypdf holds no resources)."""
+
+
+# Backends in fallback order, keyed on their name
+PDF_BACKENDS = {
+    PyMuPDFDocument.name: PyMuPDFDocument,
+    PyPDFDocument.name: PyPDFDocument,
+}
+
+
+class PdfDocument:
+    """A PDF opened with the first working backend, falling back per page.
+
+    Use as a context manager:
+        with PdfDocument(file) as pdf:
+            for page in range(pdf.page_count):
+                text = pdf.page_text(page)
+    """
+
+    def __init__(self, source, backend: str | None = None):
+        """Open the PDF with the preferred backend or the first one that works.
+
+        Args:
+        ----
+            source: a path, bytes or a binary file object
+            backend (str, optional): preferred backend name, defaults to the
+            PDF_BACKEND environment variable or "pymupdf"
+
+        Raises:
+        ------
+            Exception: the error of the last backend when none can open the file
+
+        """
+        self.__source = source
+        self.__fallbacks = backend_order(backend)
+        self.__document = None
+        error = None
+        while self.__fallbacks:
+            backend_class = PDF_BACKENDS[self.__fallbacks.pop(0)]
+            try:
+                self.__document = backend_class(_rewound(source))
+                break
+            except Exception as e:  # noqa: BLE001
+                error = e
+        if self.__document is None:
+            raise error
+        self.__page_fallback = None
+
+    @property
+    def backend(self) -> str:
+        """Return the name of the backend that opened the document."""
+        return self.__document.name
+
+    @property
+    def page_count(self) -> int:
+        """Return the number of pages."""
+        return self.__document.page_count
+
+    def page_text(self, page: int) -> str:
+        """Return the text of a page (0-based), re-trying with fallback backends."""
+        try:
+            return self.__document.page_text(page)
+        except Exception:
+            if not self.__fallbacks:
+                raise
+        if self.__page_fallback is None:
+            self.__page_fallback = PdfDocument(self.__source, self.__fallbacks[0])
+        return self.__page_fallback.page_text(page)
+
+    def close(self) -> None:
+        """Release the document and any fallback document."""
+        self.__document.close()
+        if self.__page_fallback is not None:
+            self.__page_fallback.close()
+
+    def __enter__(self):
+        """Return the opened document."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the document."""
+        self.close()
+
+
+def backend_order(backend: str | None = None) -> list[str]:
+    """Return backend names with the preferred one first.
+
+    Args:
+    ----
+        backend (str, optional): preferred backend, defaults to the PDF_BACKEND
+        environment variable or "pymupdf"
+
+    Returns:
+    -------
+        list[str]: backend names in the order they are tried
+
+    """
+    preferred = backend or os.environ.get("PDF_BACKEND") or DEFAULT_PDF_BACKEND
+    if preferred not in PDF_BACKENDS:
+        error = f"Unknown PDF backend '{preferred}', expected one of {list(PDF_BACKENDS)}"
+        raise ValueError(error)
+    return [preferred] + [name for name in PDF_BACKENDS if name != preferred]
+
+def compare_backends(pdf_path) -> dict:
+    """Extract a PDF with every backend and report speed and text parity.
+
+    Parity is the share of words (whitespace separated, case-sensitive) the
+    backend's text has in common with the pypdf text.
+
+    Args:
+    ----
+        pdf_path: path of the PDF to compare
+
+    Returns:
+    -------
+        dict: seconds, page count and parity per backend
+
+    """
+    report = {"file": str(pdf_path)}
+    texts = {}
+    for name, backend_class in PDF_BACKENDS.items():
+        start_time = time.perf_counter()
+        try:
+            document = backend_class(pdf_path)
+            texts[name] = [document.page_text(page) for page in range(document.page_count)]
+            document.close()
+        except Exception as e:  # noqa: BLE001
+            report[name] = {"error": repr(e)}
+            continue
+        report[name] = {
+            "seconds": round(time.perf_counter() - start_time, 4),
+            "pages": len(texts[name]),
+        }
+    reference = texts.get(PyPDFDocument.name)
+    for name, pages in texts.items():
+        if reference is not None:
+            report[name]["parity"] = _word_parity(" ".join(pages), " ".join(reference))
+    return report
+
+def _word_parity(text: str, reference: str) -> float:
+    """Return the share of words two texts have in common (1.0 == same words)."""
+    words, reference_words = Counter(text.split()), Counter(reference.split())
+    total = max(sum(words.values()), sum(reference_words.values()))
+    if total == 0:
+        return 1.0
+    return round(sum((words & reference_words).values()) / total, 4)
+
+def _read_bytes(source) -> bytes:
+    """Return the content of bytes or a binary file object."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    return source.read()
+
+def _rewound(source):
+    """Seek file objects back to the start so each backend reads the whole file."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+if __name__ == "__main__":
+    reports = [compare_backends(path) for path in sys.argv[1:]]
+    print(json.dumps(reports, indent=2))
+    for name in PDF_BACKENDS:
+        seconds = [r[name]["seconds"] for r in reports if "seconds" in r.get(name, {})]
+        parity = [r[name]["parity"] for r in reports if "parity" in r.get(name, {})]
+        if seconds:
+            mean_parity = sum(parity) / max(len(parity), 1)
+            print(f"{name}: {sum(seconds):.2f}s total, mean parity {mean_parity:.3f}")
@@ -0,0 +1,71 @@
+"""Tests for the PDF backends."""
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from .pdf_backends import (
+    PDF_BACKENDS,
+    PdfDocument,
+    PyPDFDocument,
+    backend_order,
+    compare_backends,
+)
+
+TEST_PDF = Path("data_toolbox/utils/string_utils/test_data/test.pdf")
+
+
+class BrokenDocument:
+    """A backend that cannot open anything."""
+
+    name = "broken"
+
+    def __init__(self, source):
+        raise ValueError("cannot open " + str(source))
+
+
+class BrokenPagesDocument(PyPDFDocument):
+    """A backend that opens files but fails on every page."""
+
+    name = "broken-pages"
+
+    def page_text(self, page):
+        raise ValueError("cannot read page " + str(page))
+
+
+def test_backend_order_prefers_pymupdf(monkeypatch):
+    monkeypatch.delenv("PDF_BACKEND", raising=False)
+    assert backend_order() == ["pymupdf", "pypdf"]
+    monkeypatch.setenv("PDF_BACKEND", "pypdf")
+    assert backend_order() == ["pypdf", "pymupdf"]
+    with pytest.raises(ValueError):
+        backend_order("pdfminer")
+
+
+def test_pdf_document_extracts_text():
+    with TEST_PDF.open("rb") as file, PdfDocument(file) as pdf_document:
+        assert pdf_document.backend == "pymupdf"
+        assert pdf_document.page_count == 1
+        assert "Waldo Was Here." in pdf_document.page_text(0)
+
+
+def test_pdf_document_falls_back_when_backend_cannot_open():
+    backends = {"broken": BrokenDocument, "pypdf": PyPDFDocument}
+    with patch.dict(PDF_BACKENDS, backends, clear=True), PdfDocument(TEST_PDF, "broken") as pdf:
+        assert pdf.backend == "pypdf"
+        assert "Waldo Was Here." in pdf.page_text(0)
+
+
+def test_pdf_document_falls_back_per_page():
+    backends = {"broken-pages": BrokenPagesDocument, "pypdf": PyPDFDocument}
+    with patch.dict(PDF_BACKENDS, backends, clear=True), \
+            PdfDocument(TEST_PDF, "broken-pages") as pdf:
+        assert pdf.backend == "broken-pages"
+        assert "Waldo Was Here." in pdf.page_text(0)
+
+
+def test_compare_backends_reports_parity():
+    report = compare_backends(TEST_PDF)
+    assert report["pymupdf"]["pages"] == report["pypdf"]["pages"] == 1
+    assert report["pypdf"]["parity"] == 1.0
+    assert report["pymupdf"]["parity"] == 1.0
@@ -6,11 +6,12 @@ import re
 from pathlib import Path
 
 import docx2txt
-import pypdf
 import streamlit as st
 from bs4 import BeautifulSoup
 from odfdo import Document
 
+from .pdf_backends import PdfDocument
+
 
 class TextExtractor:
     """A class that handles extracting text from various types of files.
@@ -112,6 +113,8 @@ class TextExtractor:
     def extract_pdf(file, *, cleanup: bool = True) -> str:
         """Extract text from a PDF file.
 
+        Uses the PyMuPDF backend, falling back to pypdf (see pdf_backends).
+
         Args:
         ----
             file (_type_): uploaded file from streamlit file uploaded
@@ -123,10 +126,10 @@ class TextExtractor:
             str: string object
 
         """
-        pdf_reader = pypdf.PdfReader(file)
         text = ""
-        for page in range(len(pdf_reader.pages)):
-            text += pdf_reader.pages[page].extract_text()
+        with PdfDocument(file) as pdf_document:
+            for page in range(pdf_document.page_count):
+                text += pdf_document.page_text(page)
         if cleanup:
             text = TextExtractor.text_cleanup(text)
         return text
@@ -20,6 +20,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning, module="tensorflo
 import streamlit as st
 
 from data_toolbox.application_layout.application_layout import embed_in_application_layout
+from data_toolbox.multi_file_search.utils import worker_pool
 from data_toolbox.tag_manager.singletons import coordinator, manager
 from data_toolbox.utils import Greeting, greetings
 from pages.tool_wizard import tool_wizard
@@ -75,6 +76,8 @@ if __name__ == "__main__":
     # Track Current Page.
 
     st.session_state["current_page"] = "Home Page"
+    # Warm the search workers up in the background, so the first search does not wait
+    worker_pool.start_worker_pool()
     tag_file = Path(Path(__file__).parent,
                     "data_toolbox",
                     "tag_manager",
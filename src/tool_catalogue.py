@@ -0,0 +1,217 @@
+# noqa: INP001 Don't want __init__.py in the top level for pytest
+"""Cached catalogue of the tools, for searching and filtering them.
+
+The Tool Search page filters the tools on every rerun, i.e. on every keystroke.
+The catalogue is built once per process and only rebuilt when one of the files
+it is built from changes on disk (tags, project-tag associations and tool
+visibility); it keeps the tools indexed by category, accepted file type and tag
+so filters are dictionary lookups.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from thefuzz import fuzz
+
+import tool_dictionary
+from data_toolbox.tag_manager.singletons import coordinator, manager
+
+if TYPE_CHECKING:
+    from data_toolbox.tag_manager import Coordinator, TagManager
+    from tool_metadata import ToolMetadata
+
+TAG_MANAGER_DIRECTORY = Path(__file__).parent / "data_toolbox" / "tag_manager"
+TAG_FILE = TAG_MANAGER_DIRECTORY / "tags.jsonl"
+ASSOCIATION_FILE = TAG_MANAGER_DIRECTORY / "associations.jsonl"
+
+# Lowest thefuzz partial ratio of a tool name matching a search query
+FUZZY_RATIO_THRESHOLD = 60
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4096)
+def _fuzzy_ratio(tool_name: str, query: str) -> int:
+    """Return thefuzz's partial ratio of a tool name and a query (cached)."""
+    return fuzz.partial_ratio(tool_name, query)
+
+
+class ToolCatalogue:
+    """The tools, indexed for filtering, kept up to date with the files on disk.
+
+    Attributes
+    ----------
+    tools : list[ToolMetadata]
+        All tools, sorted by name.
+    tag_names : list[str]
+        The names of all tags.
+
+    Methods
+    -------
+    refresh()
+        Rebuild the catalogue if one of its files changed on disk.
+    tools_in_category(category_name)
+        Return the tools of a category.
+    tools_accepting(file_type)
+        Return the tools accepting a file type.
+    tools_tagged(tag_names)
+        Return the tools with one of the tags.
+    search(query)
+        Return the tools whose name fuzzily matches the query, or with it as a tag.
+
+    """
+
+    def __init__(self, tools: list[ToolMetadata],  # noqa: PLR0913
+                 tag_manager: TagManager, coordinator: Coordinator,
+                 tag_file: Path, association_file: Path,
+                 visibility_file: Path | None = None,
+                 reload_visibility: Callable[[], None] | None = None):
+        """Create a catalogue; it is built by the first refresh().
+
+        Parameters
+        ----------
+        tools : list[ToolMetadata]
+            The tools to catalogue.
+        tag_manager : TagManager
+            Loads the tags from tag_file.
+        coordinator : Coordinator
+            Loads the project-tag associations from association_file.
+        tag_file : Path
+            The tags json lines file.
+        association_file : Path
+            The associations json lines file.
+        visibility_file : Path
+            The tool visibility config, optional.
+        reload_visibility : Callable[[], None]
+            Reapplies visibility_file to the tools when it changed, optional.
+
+        """
+        self.__tools = sorted(tools, key=lambda tool: tool.get_tool_name())
+        self.__tag_manager = tag_manager
+        self.__coordinator = coordinator
+        self.__tag_file = tag_file
+        self.__association_file = association_file
+        self.__visibility_file = visibility_file
+        self.__reload_visibility = reload_visibility
+        self.__lock = threading.Lock()
+        self.__signature = None
+        self.__by_category = {}
+        self.__by_file_type = {}
+        self.__by_tag = {}
+        self.__tag_names = []
+
+    @property
+    def tools(self) -> list:
+        """Return all tools, sorted by name."""
+        return self.__tools
+
+    @property
+    def tag_names(self) -> list:
+        """Return the names of all tags."""
+        return self.__tag_names
+
+    def refresh(self) -> bool:
+        """Rebuild the catalogue if one of its files changed on disk since the last refresh.
+
+        Files are compared by modification time and size, so an unchanged
+        catalogue costs a few stat calls.
+
+        Returns
+        -------
+        bool
+            True if the catalogue was rebuilt.
+
+        """
+        with self.__lock:
+            signature = self.__file_signature()
+            if signature == self.__signature:
+                return False
+            tags, associations, visibility = signature
+            previous = self.__signature or (None, None, None)
+            if tags is not None and tags != previous[0]:
+                self.__tag_manager.import_tags(self.__tag_file)
+            if associations is not None and associations != previous[1]:
+                self.__coordinator.import_associations(self.__association_file)
+            if visibility != previous[2] and self.__reload_visibility is not None:
+                self.__reload_visibility()
+            self.__build_indices()
+            self.__signature = signature
+            return True
+
+    def tools_in_category(self, category_name: str) -> list:
+        """Return the tools of a category, sorted by name."""
+        return self.__by_category.get(category_name, [])
+
+    def tools_accepting(self, file_type: str) -> list:
+        """Return the tools accepting a file type (any case), sorted by name."""
+        return self.__by_file_type.get(file_type.lower(), [])
+
+    def tools_tagged(self, tag_names: list[str]) -> list:
+        """Return the tools with any of the tags, sorted by name."""
+        tagged = {tool for tag_name in tag_names for tool in self.__by_tag.get(tag_name, [])}
+        return [tool for tool in self.__tools if tool in tagged]
+
+    def search(self, query: str) -> list:
+        """Return the tools whose name fuzzily matches the query, or tagged with it.
+
+        Ratios are cached per tool name and query, so retyping a query (or
+        rerunning the page with it) does not recompute them.
+        """
+        tagged = set(self.__by_tag.get(query, []))
+        return [tool for tool in self.__tools
+                if tool in tagged
+                or _fuzzy_ratio(tool.get_tool_name(), query) >= FUZZY_RATIO_THRESHOLD]
+
+    def __file_signature(self) -> tuple:
+        """Return the modification time and size of each file, None if it is missing."""
+        signature = []
+        for path in (self.__tag_file, self.__association_file, self.__visibility_file):
+            try:
+                stat = os.stat(path) if path is not None else None  # noqa: PTH116
+            except FileNotFoundError:
+                stat = None
+            signature.append((stat.st_mtime_ns, stat.st_size) if stat else None)
+        return tuple(signature)
+
+    def __build_indices(self) -> None:
+        """Index the tools by category, lower case file type and tag name."""
+        by_category, by_file_type, by_tag = {}, {}, {}
+        for tool in self.__tools:
+            by_category.setdefault(tool.get_category(), []).append(tool)
+            for file_type in {file_type.lower()
+                              for file_type in tool.get_accepted_file_types_list()}:
+                by_file_type.setdefault(file_type, []).append(tool)
+        tools_by_name = {tool.get_tool_name(): tool for tool in self.__tools}
+        for tag in self.__tag_manager.tags:
+            tagged = by_tag.setdefault(tag.name, [])
+            tagged.extend(tools_by_name[project_name] for project_name
+                          in self.__coordinator.projects_with_tag(tag.id)
+                          if project_name in tools_by_name)
+        for tag_name, tagged in by_tag.items():
+            # Sorted by name and once per tool, also when several tags share the name
+            by_tag[tag_name] = sorted(set(tagged), key=lambda tool: tool.get_tool_name())
+        self.__by_category = by_category
+        self.__by_file_type = by_file_type
+        self.__by_tag = by_tag
+        self.__tag_names = [tag.name for tag in self.__tag_manager.tags]
+
+
+def get_catalogue() -> ToolCatalogue:
+    """Return the catalogue of the tools in tool_dictionary (one per process), refreshed."""
+    global _catalogue  # noqa: PLW0603
+    with _catalogue_lock:
+        if _catalogue is None:
+            _catalogue = ToolCatalogue(
+                tool_dictionary.tool_list(), manager, coordinator,
+                tag_file=TAG_FILE,
+                association_file=ASSOCIATION_FILE,
+                visibility_file=Path(tool_dictionary.VISIBILITY_CONFIG_PATH),
+                reload_visibility=tool_dictionary.reload_visibility_config,
+            )
+    _catalogue.refresh()
+    return _catalogue
@@ -0,0 +1,106 @@
+import os
+from collections import Counter
+from uuid import uuid4
+
+from data_toolbox.tag_manager import Coordinator, TagManager
+from tool_catalogue import ToolCatalogue
+from tool_metadata import ToolMetadata
+
+TAGS = """\
+{"id": "c26560b2-a2d1-4019-a1c4-45ccc25dcaad", "name": "Admin", "color": "#bc00ff"}
+{"id": "1442c510-e101-4121-9cb3-9f461c305067", "name": "Crypto", "color": "#08e8e4"}
+"""
+ASSOCIATIONS = """\
+{"project_name": "Wallet Finder", "tags": ["1442c510-e101-4121-9cb3-9f461c305067"]}
+{"project_name": "Multi File Search", "tags": []}
+"""
+
+
+def make_catalogue(tmp_path, reload_visibility=None):
+    """Return a catalogue of two tools over tag files in tmp_path."""
+    (tmp_path / "tags.jsonl").write_text(TAGS)
+    (tmp_path / "associations.jsonl").write_text(ASSOCIATIONS)
+    (tmp_path / "visibility.json").write_text("{}")
+    tools = [
+        ToolMetadata("Wallet Finder", print, ["TXT"], [], category="Crypto"),
+        ToolMetadata("Multi File Search", print, ["txt", "PDF"], [], category="Data"),
+    ]
+    return ToolCatalogue(tools, TagManager(), Coordinator(),
+                         tag_file=tmp_path / "tags.jsonl",
+                         association_file=tmp_path / "associations.jsonl",
+                         visibility_file=tmp_path / "visibility.json",
+                         reload_visibility=reload_visibility)
+
+def names(tools):
+    return [tool.get_tool_name() for tool in tools]
+
+def test_catalogue_indexes_tools_by_category_file_type_and_tag(tmp_path):
+    # Arrange
+    catalogue = make_catalogue(tmp_path)
+    # Act
+    catalogue.refresh()
+    # Assert
+    assert names(catalogue.tools) == ["Multi File Search", "Wallet Finder"]
+    assert names(catalogue.tools_in_category("Crypto")) == ["Wallet Finder"]
+    assert names(catalogue.tools_accepting("Txt")) == ["Multi File Search", "Wallet Finder"]
+    assert names(catalogue.tools_accepting("pdf")) == ["Multi File Search"]
+    assert names(catalogue.tools_tagged(["Crypto", "Admin"])) == ["Wallet Finder"]
+    assert catalogue.tag_names == ["Admin", "Crypto"]
+
+def test_search_matches_names_fuzzily_and_tags_exactly(tmp_path):
+    # Arrange
+    catalogue = make_catalogue(tmp_path)
+    catalogue.refresh()
+    # Act / Assert
+    assert names(catalogue.search("multi fil")) == ["Multi File Search"]
+    assert names(catalogue.search("Crypto")) == ["Wallet Finder"]
+
+def test_refresh_rebuilds_only_when_a_file_changed(tmp_path):
+    # Arrange
+    reloads = []
+    catalogue = make_catalogue(tmp_path, reload_visibility=lambda: reloads.append(1))
+    # Act
+    rebuilt = [catalogue.refresh(), catalogue.refresh()]
+    association_file = tmp_path / "associations.jsonl"
+    association_file.write_text(ASSOCIATIONS.replace(
+        '"Multi File Search", "tags": []',
+        '"Multi File Search", "tags": ["c26560b2-a2d1-4019-a1c4-45ccc25dcaad"]'))
+    # (make the change visible even on file systems with coarse modification times)
+    stat = os.stat(association_file)
+    os.utime(association_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    rebuilt.append(catalogue.refresh())
+    # Assert
+    assert rebuilt == [True, False, True]
+    assert reloads == [1]
+    assert names(catalogue.tools_tagged(["Admin"])) == ["Multi File Search"]
+
+def test_catalogue_of_thousands_of_tools_and_tags(tmp_path, monkeypatch):
+    # Arrange
+    tag_ids = [uuid4() for _ in range(1000)]
+    (tmp_path / "tags.jsonl").write_text("\n".join(
+        f'{{"id": "{tag_id}", "name": "tag {number}", "color": "#ffffff"}}'
+        for number, tag_id in enumerate(tag_ids)))
+    (tmp_path / "associations.jsonl").write_text("\n".join(
+        f'{{"project_name": "tool {number}", "tags": ["{tag_ids[number % 1000]}"]}}'
+        for number in range(3000)))
+    tools = [ToolMetadata(f"tool {number}", print, ["txt"], [], category=f"{number % 7}")
+             for number in range(3000)]
+    catalogue = ToolCatalogue(tools, TagManager(), Coordinator(),
+                              tag_file=tmp_path / "tags.jsonl",
+                              association_file=tmp_path / "associations.jsonl")
+    calls = Counter()
+    get_tool_name = ToolMetadata.get_tool_name
+    def counting_get_tool_name(tool):
+        calls[tool] += 1
+        return get_tool_name(tool)
+    monkeypatch.setattr(ToolMetadata, "get_tool_name", counting_get_tool_name)
+    # Act
+    catalogue.refresh()
+    tagged = catalogue.tools_tagged(["tag 7"])
+    most_calls = max(calls.values())
+    # Assert
+    assert names(tagged) == ["tool 1007", "tool 2007", "tool 7"]
+    assert len(catalogue.tools_in_category("0")) == 429
+    assert len(catalogue.tag_names) == 1000
+    # (a few names per tool; matching every tool against every tag reads thousands)
+    assert most_calls <= 5
@@ -7,7 +7,6 @@ import json
 import os
 
 from config import styles_config
-from data_toolbox.multi_file_search import multi_file_search
 from data_toolbox.tag_manager.singletons import coordinator, manager
 
 from tool_metadata import ToolMetadata
@@ -32,7 +31,7 @@ styles = styles_config.load_styles_config()
 tools = {
     "Multi File Search": ToolMetadata(
         "Multi File Search",
-        multi_file_search,
+        "data_toolbox.multi_file_search.multi_file_search:multi_file_search",
         accepted_file_types=["xls", "xlsx", "csv", "docx", "pdf", "pptx", "txt"],
         uses=["Ctrl+F through multiple files"],
         category=tool_categories["data_manipulation"],
@@ -78,6 +77,15 @@ def update_visibility_config(tool_metadata):
         json.dump(visibility_config, f, indent=2)
 
 
+def reload_visibility_config():
+    """Reapply the visibility config file to the tools, e.g. after another process changed it."""
+    with open(VISIBILITY_CONFIG_PATH) as f:  # noqa: PTH123
+        visibility_config.update(json.loads(f.read()))
+    for name, tool_metadata in tools.items():
+        if name in visibility_config:
+            tool_metadata.set_visibility(visibility_config[name])
+
+
 def get_tool(name):
     """Return the tools metadata class.
 
@@ -1,5 +1,8 @@
 # noqa: INP001 Don't want __init__.py in the top level for pytest
 """Data storage class for information about tools."""
+import importlib
+
+
 class ToolMetadata:
     """A class representing a tool's metadata.
 
@@ -7,8 +10,9 @@ class ToolMetadata:
     ----------
     __tool_name : str
         The name of the tool.
-    __tool : function
-        Function entry point into the tool.
+    __tool : function | str
+        Function entry point into the tool, or its "package.module:function"
+        path, imported the first time the tool is opened (see get_tool()).
     __accepted_file_types : list[str]
         The types of files the tool handles.
     __uses : list[str]
@@ -35,7 +39,8 @@ class ToolMetadata:
     get_tool_name():
         Returns the name of the tool.
     get_tool():
-        Returns the functional entry point for the tool.
+        Returns the functional entry point for the tool, importing it if
+        needed.
     get_accepted_file_types():
         Returns the list of file types the tool is expected to handle.
     get_accepted_file_types_list():
@@ -91,7 +96,15 @@ class ToolMetadata:
         return self.__tool_name
 
     def get_tool(self):
-        """Return the tool."""
+        """Return the tool.
+
+        A tool given as a "package.module:function" path is imported here, so
+        listing tools (home page, tool gallery) does not import every tool and
+        its dependencies.
+        """
+        if isinstance(self.__tool, str):
+            module_name, function_name = self.__tool.split(":")
+            self.__tool = getattr(importlib.import_module(module_name), function_name)
         return self.__tool
 
     def get_accepted_file_types(self):
@@ -0,0 +1,23 @@
+import sys
+
+from tool_metadata import ToolMetadata
+
+
+def test_tool_given_by_path_is_imported_when_first_requested():
+    # Arrange
+    sys.modules.pop("colorsys", None)
+    tool = ToolMetadata("Colors", "colorsys:rgb_to_hsv", accepted_file_types=[], uses=[],
+                        category="Other")
+    # Act
+    imported_before_opening = "colorsys" in sys.modules
+    entry_point = tool.get_tool()
+    # Assert
+    assert not imported_before_opening
+    assert entry_point is sys.modules["colorsys"].rgb_to_hsv
+    assert tool.get_tool() is entry_point
+
+def test_tool_given_as_function_is_returned_as_is():
+    # Arrange
+    tool = ToolMetadata("Print", print, accepted_file_types=[], uses=[], category="Other")
+    # Act / Assert
+    assert tool.get_tool() is print